@@ -5,15 +5,10 @@ import warnings
 import logging
 from typing import Dict, Any, Optional, Tuple, List
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('tiktok_dashboard.log'),
-        logging.StreamHandler()
-    ]
-)
+from utils.logging_setup import setup_logging
+
+# Setup logging (queue + listener thread, sekali per proses)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 warnings.filterwarnings('ignore')
@@ -21,18 +16,119 @@ warnings.filterwarnings('ignore')
 # Import custom modules
 from utils.css_loader import load_css
 from utils.data_loader import load_data
-from utils.clustering import perform_clustering
-from utils.validators import validate_data_for_clustering, suggest_optimal_clusters
+from utils.derived_features import available_derived_features, add_derived_features
+from utils.clustering import perform_clustering, get_cached_result
+from utils.progressive import progressive_clustering, refinement_status, PREVIEW_SAMPLE_ROWS
+from utils.engines import CLUSTERING_ENGINES, DEFAULT_ENGINE
+from utils.reduction import REDUCTION_METHODS, DEFAULT_REDUCTION
+from utils.validators import (
+    validate_data_for_clustering, suggest_optimal_clusters, prune_redundant_features,
+    DEFAULT_FEATURES, MAX_DASHBOARD_K, REDUNDANCY_MODES, DEFAULT_REDUNDANCY_MODE, REDUNDANCY_THRESHOLD
+)
+from utils.warmup import start_warmup, wait_for_warmup
+from utils.cache import get_dataset_key
+from utils.snapshot import QUERY_PARAM as SNAPSHOT_PARAM, restore_snapshot, save_snapshot
 from utils.diagnostics import display_clustering_diagnostics
+from utils.memory import track_stage, log_memory_report, session_stages
+from utils.export import EXPORT_FORMATS, available_formats, cached_export_file, export_file, export_filename
+
+# Modul tab di-import di main_dashboard saat tab dirender (plotly ikut dimuat di sana)
+
+# Interval cek hasil refinement (detik) selama menampilkan preview
+REFINEMENT_POLL_SECONDS = 2
+
+
+def _poll_refinement(final_key: str):
+    """Rerun seluruh app begitu hasil final ada di cache (atau perlu refinement ulang)"""
+    if get_cached_result(final_key) is not None:
+        st.rerun()
+    status = refinement_status(final_key)
+    if status and status['state'] == 'done':
+        # Hasil final sudah ter-evict dari cache: rerun memulai refinement lagi
+        st.rerun()
+    if status and status['state'] == 'failed':
+        st.error(f"Refinement gagal: {status.get('error')}. Hasil preview tetap ditampilkan.")
+
+
+def display_stage_banner(result: Dict[str, Any]):
+    """Tandai apakah yang tampil hasil preview (sampel) atau final (data penuh)"""
+    if result.get('stage') != 'preview':
+        return
+    st.info(
+        f"**Preview** — centroid dari sampel terstratifikasi {result.get('fit_rows', PREVIEW_SAMPLE_ROWS):,} baris, "
+        f"semua {len(result['clusters']):,} baris sudah di-assign. Fit penuh berjalan di background; "
+        f"hasil **final** otomatis menggantikan preview."
+    )
+    fragment = getattr(st, 'fragment', None)
+    if fragment is not None:
+        fragment(run_every=REFINEMENT_POLL_SECONDS)(_poll_refinement)(result['final_key'])
+    elif st.button("Muat Hasil Final"):
+        st.rerun()
+
+
+def _deferred_download_supported() -> bool:
+    """Streamlit versi baru menerima callable sebagai data st.download_button; versi lama menolaknya"""
+    try:
+        from streamlit.runtime.media_file_manager import MediaFileManager
+    except ImportError:
+        return False
+    return hasattr(MediaFileManager, 'add_deferred')
+
+
+def display_export(df_clustered: pd.DataFrame, result: Dict[str, Any], features_cols: List[str]):
+    """
+    Download dataset berlabel cluster. File ditulis (per chunk, ke disk) saat diklik,
+    bukan di setiap rerun. Handle file yang dikembalikan ke Streamlit ditutup oleh
+    garbage collector, bukan oleh kita, dan Streamlit membaca seluruh isinya ke memori
+    saat menyajikan download, jadi ukuran file tetap terbatas RAM server. Streamlit
+    lama tanpa data callable: tombol terpisah menulis file dulu, lalu file disajikan.
+    """
+    with st.expander("📦 Export Data Berlabel", expanded=False):
+        formats = available_formats()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            fmt = st.selectbox("Format", options=formats, format_func=lambda f: EXPORT_FORMATS[f]['label'],
+                               key="export_format")
+        with col2:
+            include_distances = st.checkbox("Jarak ke centroid", key="export_distances",
+                                            help="Satu kolom Distance_C<k> per cluster (float32)")
+        with col3:
+            include_pca = st.checkbox("Koordinat PCA", key="export_pca",
+                                      disabled=result.get('pca_components') is None,
+                                      help="Kolom PC1/PC2 dari proyeksi PCA hasil clustering")
+
+        if 'parquet' not in formats:
+            st.caption("Parquet butuh pyarrow; yang tersedia hanya CSV gzip.")
+
+        def write_file():
+            return export_file(df_clustered, result, features_cols, fmt,
+                               include_distances=include_distances, include_pca=include_pca)
+
+        def open_export():
+            return open(write_file()['path'], 'rb')
+
+        written = cached_export_file(result, fmt, include_distances, include_pca)
+        size = f" ({written['size'] / 1024 ** 2:.1f} MB)" if written is not None else ""
+        download = {
+            'file_name': export_filename(result, fmt),
+            'mime': EXPORT_FORMATS[fmt]['mime'],
+            'key': "download_export",
+        }
+        label = f"Download {EXPORT_FORMATS[fmt]['extension']}{size}"
+
+        if _deferred_download_supported():
+            st.download_button(label, data=open_export, help=f"{len(df_clustered):,} baris; file dibuat saat diklik",
+                               **download)
+        elif written is None:
+            if st.button(f"Buat File {EXPORT_FORMATS[fmt]['extension']}", key="prepare_export",
+                         help=f"{len(df_clustered):,} baris ditulis ke disk, lalu tombol download muncul"):
+                write_file()
+                st.rerun()
+        else:
+            # Data non-callable dibaca Streamlit saat dipanggil, jadi file bisa langsung ditutup
+            with open(written['path'], 'rb') as f:
+                st.download_button(label, data=f, help=f"{written['rows']:,} baris", **download)
 
-# Import tab modules
-from tabs import (
-    overview_tab, 
-    visualization_tab, 
-    data_tab, 
-    categorical_tab, 
-    analysis_tab
-)
 
 # ==================== KONFIGURASI ====================
 st.set_page_config(
@@ -52,9 +148,17 @@ def main_dashboard():
     if 'result' not in st.session_state:
         st.session_state.result = None
         
+    # Catatan memori per stage milik session ini
+    stages = session_stages(st.session_state)
+    
     # Load CSS
     load_css()
     
+    # Warm-up sekali per proses, juga untuk `streamlit run app.py` (no-op jika sudah
+    # dimulai oleh `python -m utils.warmup serve`); tunggu daripada menghitung ulang
+    start_warmup()
+    wait_for_warmup()
+    
     # ==================== HEADER ====================
     st.markdown("""
     <div class='header-card'>
@@ -82,14 +186,15 @@ def main_dashboard():
             
             # Load data untuk mendapatkan available features
             df_loaded = False
+            snapshot_meta = None
             try:
-                df = load_data()
+                with track_stage('load_data', stages):
+                    df = load_data()
                 df_loaded = True
                 
                 # Deteksi kolom numerik yang tersedia
                 numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-                default_features = ['Likes', 'Shares', 'Comments', 'Views', 
-                                   'TimeSpentOnContent', 'Engagement_Rate']
+                default_features = DEFAULT_FEATURES
                 
                 # Filter hanya yang ada di dataset
                 available_features = [col for col in default_features if col in df.columns and col in numeric_cols]
@@ -100,13 +205,24 @@ def main_dashboard():
                                      and col != 'Cluster'
                                      and pd.api.types.is_numeric_dtype(df[col])]
                 
-                all_possible_features = available_features + additional_numeric[:10]
+                # Fitur turunan (log1p, rasio) hanya dihitung jika dipilih
+                derived_features = available_derived_features(df)
+                
+                # Semua kolom numerik bisa dipilih; features yang banyak direduksi dimensinya sebelum fit
+                all_possible_features = available_features + additional_numeric + derived_features
+                
+                # Snapshot dari URL (?snapshot=<key>): isi cache dan pakai konfigurasinya
+                if SNAPSHOT_PARAM in st.query_params:
+                    snapshot_meta = restore_snapshot(st.query_params[SNAPSHOT_PARAM], get_dataset_key(df))
+                    if snapshot_meta is None:
+                        st.warning("Snapshot tidak ditemukan, menggunakan konfigurasi default.")
+                    elif not snapshot_meta['matched']:
+                        st.warning("Snapshot dibuat dari versi dataset lain; clustering dihitung ulang.")
                 
             except Exception as e:
                 logger.error(f"Error loading data: {str(e)}")
                 df_loaded = False
-                all_possible_features = ['Likes', 'Shares', 'Comments', 'Views', 
-                                        'TimeSpentOnContent', 'Engagement_Rate']
+                all_possible_features = DEFAULT_FEATURES
                 default_features = all_possible_features
             
             # FEATURE SELECTION MULTI-SELECT
@@ -114,13 +230,18 @@ def main_dashboard():
             selected_features = st.multiselect(
                 "Features:",
                 options=all_possible_features,
-                default=default_features[:4] if len(default_features) >= 4 else default_features,
+                default=(
+                    [col for col in snapshot_meta['features_cols'] if col in all_possible_features]
+                    if snapshot_meta else
+                    [col for col in default_features if col in all_possible_features][:4]
+                ),
                 help="Pilih minimal 2 features untuk clustering"
             )
             
             # Validasi features yang dipilih
             valid_features = []
             if df_loaded:
+                add_derived_features(df, selected_features)
                 for feature in selected_features:
                     if feature in df.columns:
                         if pd.api.types.is_numeric_dtype(df[feature]):
@@ -142,29 +263,69 @@ def main_dashboard():
             
             features_cols = valid_features
             
+            # Reduksi fitur redundan (|r| tinggi) sebelum scaling
+            redundancy_options = list(REDUNDANCY_MODES)
+            redundancy_mode = st.selectbox(
+                "Fitur Redundan:",
+                options=redundancy_options,
+                index=redundancy_options.index(DEFAULT_REDUNDANCY_MODE),
+                format_func=REDUNDANCY_MODES.get,
+                help=f"Grup fitur dengan |korelasi| > {REDUNDANCY_THRESHOLD} mendistorsi jarak dan memperlambat fit"
+            )
+            if df_loaded:
+                features_cols, redundant_groups = prune_redundant_features(df, valid_features, redundancy_mode)
+                for group in redundant_groups:
+                    action = {
+                        'drop': f"dipakai: {group['keep']}",
+                        'keep': "semua tetap dipakai",
+                    }[redundancy_mode]
+                    st.caption(f"Redundan (min |r| {group['min_corr']:.2f}): {', '.join(group['features'])} — {action}")
+            
             # K value slider
             if df_loaded:
                 suggestions = suggest_optimal_clusters(df, features_cols)
             else:
                 suggestions = {'recommended': 4, 'recommended_range': '2-5'}
             
-            default_k = min(suggestions.get('recommended', 4), 5)
+            default_k = min(suggestions.get('recommended', 4), MAX_DASHBOARD_K)
+            if snapshot_meta and 2 <= snapshot_meta['k_value'] <= MAX_DASHBOARD_K:
+                default_k = snapshot_meta['k_value']
             
             k_value = st.slider(
                 "Jumlah Cluster (K):",
                 min_value=2,
-                max_value=5,
+                max_value=MAX_DASHBOARD_K,
                 value=default_k,
                 help=f"Disarankan: {suggestions.get('recommended_range', '2-5')}. K={default_k} berdasarkan data"
             )
+            
+            engine_options = list(CLUSTERING_ENGINES)
+            default_engine = snapshot_meta.get('engine', DEFAULT_ENGINE) if snapshot_meta else DEFAULT_ENGINE
+            engine = st.selectbox(
+                "Engine Clustering:",
+                options=engine_options,
+                index=engine_options.index(default_engine) if default_engine in engine_options else 0,
+                format_func=lambda name: CLUSTERING_ENGINES[name]['label'],
+                help=" | ".join(f"{spec['label']}: {spec['description']}" for spec in CLUSTERING_ENGINES.values())
+            )
+            
+            reduction_options = list(REDUCTION_METHODS)
+            default_reduction = DEFAULT_REDUCTION
+            if snapshot_meta and snapshot_meta.get('reduction'):
+                default_reduction = snapshot_meta['reduction']['method']
+            reduction = st.selectbox(
+                "Reduksi Dimensi:",
+                options=reduction_options,
+                index=reduction_options.index(default_reduction) if default_reduction in reduction_options else 0,
+                format_func=lambda name: REDUCTION_METHODS[name]['label'],
+                help=" | ".join(f"{spec['label']}: {spec['description']}" for spec in REDUCTION_METHODS.values())
+            )
         
         with col2:
             if not df_loaded:
                 st.error("Tidak dapat memuat data. Cek file dataset.")
                 st.stop()
             
-            df = load_data()
-            
             missing_values = df[features_cols].isna().sum().sum()
             
             st.markdown(f"""
@@ -231,8 +392,9 @@ def main_dashboard():
                 
                 progress_bar.progress(40)
                 
-                # Lakukan clustering
-                result = perform_clustering(df, k_value, features_cols)
+                # Lakukan clustering (dataset besar: preview dulu, fit penuh di background)
+                with track_stage('clustering', stages):
+                    result = progressive_clustering(df, k_value, features_cols, engine=engine, reduction=reduction)
                 
                 progress_bar.progress(80)
                 
@@ -241,7 +403,7 @@ def main_dashboard():
                     
                     if k_value > 2:
                         st.warning(f"Mencoba clustering dengan K={k_value-1}...")
-                        result = perform_clustering(df, k_value-1, features_cols)
+                        result = perform_clustering(df, k_value-1, features_cols, engine=engine, reduction=reduction)
                         
                         if not result.get('success', True):
                             st.error("Clustering tetap gagal. Silakan cek data Anda.")
@@ -279,8 +441,12 @@ def main_dashboard():
                 }
         
         # ==================== PREPARE CLUSTERED DATA ====================
-        df_clustered = df.copy()
-        df_clustered['Cluster'] = result['clusters']
+        with track_stage('df_copy', stages):
+            df_clustered = df.copy()
+            df_clustered['Cluster'] = result['clusters']
+        
+        display_stage_banner(result)
+        display_clustering_diagnostics(df, result, features_cols)
         
         # ==================== TABS ====================
         st.session_state['df_clustered'] = df_clustered
@@ -288,24 +454,47 @@ def main_dashboard():
         st.session_state['k_value'] = k_value
         st.session_state['features_cols'] = features_cols
         
-        tab1, tab2, tab3, tab4 = st.tabs([
+        from tabs import overview_tab, visualization_tab, categorical_tab, analysis_tab, segment_tab, window_tab
+        
+        tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
             "Overview", 
             "Visualisasi", 
             "Profiling Kategorikal",
-            "Analisis"
+            "Analisis",
+            "Per Segmen",
+            "Tren Waktu"
         ])
         
-        with tab1:
+        with tab1, track_stage('tab:overview', stages):
             overview_tab.render(df_clustered, result, k_value, features_cols)
         
-        with tab2:
+        with tab2, track_stage('tab:visualisasi', stages):
             visualization_tab.render(df_clustered, result, k_value, features_cols)
         
-        with tab3:
+        with tab3, track_stage('tab:kategorikal', stages):
             categorical_tab.render(df_clustered, result, k_value, features_cols)
         
-        with tab4:
+        with tab4, track_stage('tab:analisis', stages):
             analysis_tab.render(df_clustered, result, k_value, features_cols)
+        
+        with tab5, track_stage('tab:segmen', stages):
+            segment_tab.render(df_clustered, result, k_value, features_cols)
+        
+        with tab6, track_stage('tab:tren_waktu', stages):
+            window_tab.render(df_clustered, result, k_value, features_cols)
+        
+        # Angka memori per stage ke log (dasar untuk budget memori); laporan lengkap
+        # hanya dengan TIKTOK_MEMORY_TRACE=1
+        log_memory_report(stages, st.session_state)
+        
+        # ==================== SNAPSHOT ====================
+        if result.get('success', True) and not result.get('fallback', False) and result.get('stage') != 'preview':
+            if st.button("Simpan Snapshot", help="Simpan hasil ini supaya bisa dibuka ulang instan lewat link"):
+                snapshot_key = save_snapshot(result, df, features_cols, k_value)
+                st.query_params[SNAPSHOT_PARAM] = snapshot_key
+                st.success(f"Snapshot tersimpan. Bagikan URL halaman ini (?{SNAPSHOT_PARAM}={snapshot_key}).")
+            
+            display_export(df_clustered, result, features_cols)
     
     except Exception as e:
         logger.critical(f"Critical error in main_dashboard: {str(e)}", exc_info=True)
@@ -1,7 +1,22 @@
-from .overview_tab import render as render_overview
-from .visualization_tab import render as render_visualization
-from .data_tab import render as render_data
-from .analysis_tab import render as render_analysis
-from .categorical_tab import render as render_categorical
+import importlib
 
-__all__ = ['render_overview', 'render_visualization', 'render_data', 'render_analysis', 'render_categorical']
\ No newline at end of file
+# Modul tab di-import saat dipakai (PEP 562), bukan saat paket `tabs` di-import
+_RENDER_ALIASES = {
+    'render_overview': 'overview_tab',
+    'render_visualization': 'visualization_tab',
+    'render_data': 'data_tab',
+    'render_analysis': 'analysis_tab',
+    'render_categorical': 'categorical_tab',
+    'render_segments': 'segment_tab',
+    'render_windows': 'window_tab',
+}
+
+__all__ = ['render_overview', 'render_visualization', 'render_data', 'render_analysis', 'render_categorical',
+           'render_segments', 'render_windows']
+
+
+def __getattr__(name):
+    if name in _RENDER_ALIASES:
+        module = importlib.import_module(f"{__name__}.{_RENDER_ALIASES[name]}")
+        return module.render
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,161 @@
 import streamlit as st
-import streamlit.components.v1 as components
 import pandas as pd
-import json
+import numpy as np
+
+from utils.cache import get_dataset_key, get_result_key, payload_cache
+from utils.templates import render_component
+
+MAX_BOX_FEATURES = 8
+MAX_OUTLIERS_PER_CLUSTER = 50
+N_EXAMPLES = 10
+
+def compute_box_stats(df, cluster_col, features, max_outliers=MAX_OUTLIERS_PER_CLUSTER):
+    """
+    Statistik box plot exact dari seluruh data, satu pass groupby per cluster:
+    kuartil, mean, whisker (1.5 IQR) dan outlier paling ekstrem (maks max_outliers).
+    """
+    grouped = df.groupby(cluster_col)
+    quartiles = grouped[features].quantile([0.25, 0.5, 0.75]).unstack()
+    means = grouped[features].mean()
+    sizes = grouped.size()
+    clusters = means.index
+    
+    box_stats = {}
+    for feature in features:
+        q1 = quartiles[(feature, 0.25)]
+        median = quartiles[(feature, 0.5)]
+        q3 = quartiles[(feature, 0.75)]
+        iqr = q3 - q1
+        
+        values = df[feature]
+        lower_limit = df[cluster_col].map(q1 - 1.5 * iqr)
+        upper_limit = df[cluster_col].map(q3 + 1.5 * iqr)
+        inside = (values >= lower_limit) & (values <= upper_limit)
+        
+        # Whisker = nilai terjauh yang masih di dalam batas 1.5 IQR
+        lower_fence = values.where(inside).groupby(df[cluster_col]).min().reindex(clusters)
+        upper_fence = values.where(inside).groupby(df[cluster_col]).max().reindex(clusters)
+        
+        outlier_mask = ~inside & values.notna()
+        outliers = pd.DataFrame({
+            'cluster': df[cluster_col][outlier_mask],
+            'value': values[outlier_mask],
+            'distance': np.maximum(lower_limit[outlier_mask] - values[outlier_mask],
+                                   values[outlier_mask] - upper_limit[outlier_mask]),
+        })
+        n_outliers = outliers.groupby('cluster').size().reindex(clusters, fill_value=0)
+        top_outliers = (outliers.sort_values('distance', ascending=False)
+                        .groupby('cluster').head(max_outliers)
+                        .groupby('cluster')['value'].apply(list))
+        
+        box_stats[feature] = {
+            'q1': q1.tolist(),
+            'median': median.tolist(),
+            'q3': q3.tolist(),
+            'mean': means[feature].tolist(),
+            'lowerfence': lower_fence.tolist(),
+            'upperfence': upper_fence.tolist(),
+            'outliers': [top_outliers.get(c, []) for c in clusters],
+            'n_outliers': n_outliers.astype(int).tolist(),
+        }
+    
+    return {
+        'clusters': [int(c) for c in clusters],
+        'sizes': sizes.astype(int).tolist(),
+        'stats': box_stats,
+    }
+
+def get_cluster_centers(df_clustered, result, available_features):
+    """Centroid dalam skala asli (dari hasil clustering); fallback ke mean per cluster"""
+    centers = result.get('centers_original')
+    if centers is not None and np.shape(centers)[1] == len(available_features):
+        return [{'cluster': i, **{col: float(centers[i][j]) for j, col in enumerate(available_features)}}
+                for i in range(len(centers))]
+    
+    cluster_means = df_clustered.groupby('Cluster')[available_features].mean()
+    return [{'cluster': int(cluster_num), **{col: float(row[col]) for col in available_features}}
+            for cluster_num, row in cluster_means.iterrows()]
+
+def rank_examples(result, n_examples=N_EXAMPLES):
+    """
+    Per cluster: index baris paling tipikal (jarak ke centroid terkecil) dan paling
+    borderline (margin ke centroid kedua terkecil), dari jarak yang sudah dihitung
+    saat clustering. None jika hasil tidak membawa jarak (mis. snapshot lama).
+    """
+    distance, margin = result.get('center_distance'), result.get('center_margin')
+    if distance is None or margin is None:
+        return None
+    
+    clusters = np.asarray(result['clusters'])
+    order = np.argsort(clusters, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(clusters))])
+    examples = []
+    for cluster in range(len(bounds) - 1):
+        rows = order[bounds[cluster]:bounds[cluster + 1]]
+        if len(rows) == 0:
+            continue
+        n = min(n_examples, len(rows))
+        examples.append({
+            'cluster': cluster,
+            'typical': rows[np.argsort(distance[rows], kind='stable')[:n]].tolist(),
+            'borderline': rows[np.argsort(margin[rows], kind='stable')[:n]].tolist(),
+        })
+    return examples
+
+def get_examples(df_clustered, result):
+    return payload_cache.get_or_compute(
+        ('analysis_examples', get_result_key(result), get_dataset_key(df_clustered)),
+        lambda: rank_examples(result)
+    )
+
+def render_examples(df_clustered, result, features_cols):
+    """Tabel konten paling tipikal dan paling borderline per cluster"""
+    examples = get_examples(df_clustered, result)
+    if not examples:
+        return
+    
+    st.markdown("#### Konten Tipikal & Borderline")
+    examples = {record['cluster']: record for record in examples}
+    cluster = st.selectbox("Cluster:", options=list(examples), format_func=lambda c: f"Cluster {c}",
+                           key="examples_cluster")
+    
+    # Kolom identitas (mis. VideoID) + features, ditambah skor dari hasil clustering
+    id_cols = [col for col in df_clustered.select_dtypes(include=['object', 'category']).columns][:3]
+    columns = id_cols + [col for col in features_cols if col in df_clustered.columns]
+    membership = result.get('membership')
+    
+    def table(rows):
+        frame = df_clustered.iloc[rows][columns].copy()
+        frame['Jarak'] = result['center_distance'][rows]
+        frame['Margin'] = result['center_margin'][rows]
+        if membership is not None:
+            frame['Membership'] = membership[rows, cluster]
+        return frame.round(3)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.caption("Paling tipikal — terdekat ke centroid")
+        st.dataframe(table(examples[cluster]['typical']), use_container_width=True, hide_index=True)
+    with col2:
+        st.caption("Paling borderline — hampir sama dekat ke cluster lain")
+        st.dataframe(table(examples[cluster]['borderline']), use_container_width=True, hide_index=True)
+
+def build_payload(df_clustered, result, features_cols):
+    available_features = [col for col in features_cols if col in df_clustered.columns]
+    box_features = features_cols[:MAX_BOX_FEATURES]  # Batasi max 8 features untuk performance
+    
+    return {
+        'centers': get_cluster_centers(df_clustered, result, available_features),
+        'box_data': compute_box_stats(df_clustered, 'Cluster', box_features),
+        'features': box_features,
+    }
+
+def get_payload(df_clustered, result, features_cols):
+    """Payload O(K·F) di-memoize per hasil clustering"""
+    return payload_cache.get_or_compute(
+        ('analysis', get_result_key(result), get_dataset_key(df_clustered), tuple(features_cols)),
+        lambda: build_payload(df_clustered, result, features_cols)
+    )
 
 def render(df_clustered, result, k_value, features_cols):
     """Render Analysis tab - Hybrid Streamlit + HTML dengan dynamic features"""
@@ -14,361 +168,9 @@ def render(df_clustered, result, k_value, features_cols):
         st.error("Tidak ada features yang valid untuk analisis")
         return
     
-    # Get cluster centers (hanya untuk features yang ada)
-    centers_data = []
-    
-    if result.get('kmeans') is not None and result.get('scaler') is not None:
-        try:
-            # Hanya inverse transform untuk features yang ada
-            centers = result['scaler'].inverse_transform(result['kmeans'].cluster_centers_)
-            
-            for i in range(k_value):
-                center_dict = {'cluster': i}
-                for j, col in enumerate(available_features):
-                    if j < centers.shape[1]:  # Pastikan index valid
-                        center_dict[col] = float(centers[i][j])
-                centers_data.append(center_dict)
-        except Exception as e:
-            st.warning(f"Tidak dapat mendapatkan cluster centers: {e}")
-            # Fallback ke mean per cluster
-            for cluster_num in range(k_value):
-                cluster_df = df_clustered[df_clustered['Cluster'] == cluster_num]
-                center_dict = {'cluster': cluster_num}
-                for col in available_features:
-                    center_dict[col] = float(cluster_df[col].mean())
-                centers_data.append(center_dict)
-    else:
-        # Fallback ke mean per cluster
-        for cluster_num in range(k_value):
-            cluster_df = df_clustered[df_clustered['Cluster'] == cluster_num]
-            center_dict = {'cluster': cluster_num}
-            for col in available_features:
-                center_dict[col] = float(cluster_df[col].mean())
-            centers_data.append(center_dict)
-    
-    # Get raw data untuk box plots (sample per cluster)
-    raw_data = {}
-    max_samples_per_cluster = 100  # Kurangi untuk performa
-    
-    for cluster_num in range(k_value):
-        cluster_df = df_clustered[df_clustered['Cluster'] == cluster_num]
-        
-        # Sample untuk performa
-        if len(cluster_df) > max_samples_per_cluster:
-            cluster_df = cluster_df.sample(n=max_samples_per_cluster, random_state=42)
-        
-        raw_data[f'cluster_{cluster_num}'] = {}
-        for col in features_cols[:8]:  # Batasi max 8 features untuk performance
-            raw_data[f'cluster_{cluster_num}'][col] = cluster_df[col].tolist()
-    
-    # Convert to JSON
-    centers_json = json.dumps(centers_data)
-    raw_data_json = json.dumps(raw_data)
-    features_json = json.dumps(features_cols[:8])
-    
-    # ==================== HTML COMPONENT ====================
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <script src="https://cdnjs.cloudflare.com/ajax/libs/plotly.js/2.27.0/plotly.min.js"></script>
-        <style>
-            * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }}
-
-            body {{
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-                background-color: transparent;
-                padding: 0;
-                color: #1E293B;
-            }}
-
-            .container {{
-                max-width: 100%;
-                margin: 0 auto;
-            }}
-
-            .card {{
-                background-color: #FFFFFF;
-                border-radius: 12px;
-                padding: 1.5rem;
-                margin-bottom: 1.5rem;
-                box-shadow: 0 2px 10px rgba(0, 0, 0, 0.05);
-            }}
-
-            h3 {{
-                color: #1E293B;
-                font-size: 1.1rem;
-                margin-bottom: 1rem;
-                font-weight: 600;
-            }}
-
-            .two-column {{
-                display: grid;
-                grid-template-columns: 1fr 1fr;
-                gap: 1.5rem;
-                margin-bottom: 1.5rem;
-            }}
-
-            .table-container {{
-                overflow-x: auto;
-                border-radius: 8px;
-            }}
-
-            table {{
-                width: 100%;
-                border-collapse: collapse;
-                font-size: 0.85rem;
-            }}
-
-            th {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 0.8rem;
-                text-align: left;
-                font-weight: 600;
-                font-size: 0.85rem;
-                white-space: nowrap;
-            }}
-
-            th:first-child {{
-                border-top-left-radius: 8px;
-            }}
-
-            th:last-child {{
-                border-top-right-radius: 8px;
-            }}
-
-            td {{
-                padding: 0.7rem 0.8rem;
-                border-bottom: 1px solid #E2E8F0;
-                font-size: 0.85rem;
-            }}
-
-            tr:last-child td {{
-                border-bottom: none;
-            }}
-
-            tr:hover {{
-                background-color: rgba(102, 126, 234, 0.05);
-            }}
-
-            .cluster-label {{
-                font-weight: 600;
-                color: #1E293B;
-            }}
-
-            .metric-selector {{
-                margin-bottom: 1rem;
-            }}
-
-            select {{
-                padding: 0.6rem 1rem;
-                border: 1px solid #E2E8F0;
-                border-radius: 8px;
-                font-size: 0.9rem;
-                background-color: white;
-                cursor: pointer;
-                width: 100%;
-                max-width: 300px;
-                transition: border-color 0.2s ease;
-            }}
-
-            select:focus {{
-                outline: none;
-                border-color: #3B82F6;
-            }}
-
-            label {{
-                display: block;
-                margin-bottom: 0.5rem;
-                color: #64748B;
-                font-size: 0.9rem;
-                font-weight: 500;
-            }}
-
-            .chart-container {{
-                height: 400px;
-                width: 100%;
-            }}
-
-            @media (max-width: 768px) {{
-                .two-column {{
-                    grid-template-columns: 1fr;
-                }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <!-- Header Card -->
-            <div class="card">
-                <h3>Analisis Mendalam</h3>
-            </div>
-
-            <!-- Main Content -->
-            <div class="two-column">
-                <!-- Left: Cluster Centers Table -->
-                <div class="card">
-                    <h3>Cluster Centers (Centroid)</h3>
-                    <p style="color: #64748B; font-size: 0.85rem; margin-bottom: 1rem;">
-                        Nilai rata-rata untuk setiap feature di masing-masing cluster
-                    </p>
-                    <div class="table-container">
-                        <table id="centroidTable">
-                            <thead>
-                                <tr id="tableHeader">
-                                    <!-- Will be populated by JavaScript -->
-                                </tr>
-                            </thead>
-                            <tbody id="centroidBody">
-                                <!-- Will be populated by JavaScript -->
-                            </tbody>
-                        </table>
-                    </div>
-                </div>
-
-                <!-- Right: Box Plot -->
-                <div class="card">
-                    <h3>Metrik Trend per Cluster</h3>
-                    <p style="color: #64748B; font-size: 0.85rem; margin-bottom: 1rem;">
-                        Distribusi nilai metrik dengan deteksi outliers
-                    </p>
-                    <div class="metric-selector">
-                        <label for="metricSelect">Pilih metrik:</label>
-                        <select id="metricSelect" onchange="updateBoxPlot()">
-                            <!-- Will be populated by JavaScript -->
-                        </select>
-                    </div>
-                    <div id="boxPlot" class="chart-container"></div>
-                </div>
-            </div>
-        </div>
-
-        <script>
-            // Data from Python
-            const clusterCenters = {centers_json};
-            const rawData = {raw_data_json};
-            const features = {features_json};
-
-            // Populate table header
-            function populateTableHeader() {{
-                const thead = document.getElementById('tableHeader');
-                let headerHTML = '<th>Cluster</th>';
-                
-                features.forEach(feature => {{
-                    headerHTML += `<th>${{feature}}</th>`;
-                }});
-                
-                thead.innerHTML = headerHTML;
-            }}
-
-            // Populate centroid table
-            function populateCentroidTable() {{
-                const tbody = document.getElementById('centroidBody');
-                tbody.innerHTML = '';
-
-                clusterCenters.forEach(center => {{
-                    let row = `<tr><td class="cluster-label">Cluster ${{center.cluster}}</td>`;
-                    
-                    features.forEach(feature => {{
-                        const value = center[feature];
-                        const formattedValue = value >= 1 ? value.toLocaleString('id-ID', {{maximumFractionDigits: 2}}) : value.toFixed(4);
-                        row += `<td>${{formattedValue}}</td>`;
-                    }});
-                    
-                    row += '</tr>';
-                    tbody.innerHTML += row;
-                }});
-            }}
-
-            // Populate metric selector
-            function populateMetricSelector() {{
-                const select = document.getElementById('metricSelect');
-                select.innerHTML = '';
-                
-                features.forEach(feature => {{
-                    const option = document.createElement('option');
-                    option.value = feature;
-                    option.textContent = feature;
-                    select.appendChild(option);
-                }});
-            }}
-
-            // Create box plot
-            function updateBoxPlot() {{
-                const metric = document.getElementById('metricSelect').value;
-                const traces = [];
-                const colors = ['#3B82F6', '#10B981', '#F59E0B', '#EF4444', '#8B5CF6', '#EC4899', '#14B8A6', '#F97316'];
-
-                Object.keys(rawData).sort().forEach((clusterKey, index) => {{
-                    const clusterNum = clusterKey.split('_')[1];
-                    const data = rawData[clusterKey][metric];
-                    
-                    if (data && data.length > 0) {{
-                        traces.push({{
-                            y: data,
-                            type: 'box',
-                            name: `Cluster ${{clusterNum}}`,
-                            marker: {{ color: colors[index % colors.length] }},
-                            boxpoints: 'outliers',
-                            boxmean: true
-                        }});
-                    }}
-                }});
-
-                const layout = {{
-                    height: 400,
-                    xaxis: {{ 
-                        title: 'Cluster',
-                        showgrid: false
-                    }},
-                    yaxis: {{ 
-                        title: metric,
-                        showgrid: true,
-                        gridcolor: 'rgba(0,0,0,0.05)'
-                    }},
-                    showlegend: false,
-                    margin: {{ t: 30, b: 50, l: 60, r: 30 }},
-                    plot_bgcolor: 'rgba(0,0,0,0)',
-                    paper_bgcolor: 'rgba(0,0,0,0)',
-                    font: {{ 
-                        family: '-apple-system, BlinkMacSystemFont, "Segoe UI", Roboto',
-                        size: 11
-                    }}
-                }};
-
-                const config = {{
-                    responsive: true,
-                    displayModeBar: false
-                }};
-
-                Plotly.newPlot('boxPlot', traces, layout, config);
-            }}
-
-            // Initialize
-            document.addEventListener('DOMContentLoaded', function() {{
-                populateTableHeader();
-                populateCentroidTable();
-                populateMetricSelector();
-                updateBoxPlot();
-            }});
-
-            // Handle window resize
-            window.addEventListener('resize', function() {{
-                if (document.getElementById('boxPlot')) {{
-                    Plotly.Plots.resize('boxPlot');
-                }}
-            }});
-        </script>
-    </body>
-    </html>
-    """
+    payload = get_payload(df_clustered, result, features_cols)
     
     # ==================== RENDER HTML COMPONENT ====================
-    components.html(html_content, height=850, scrolling=True)
\ No newline at end of file
+    render_component('analysis', payload, height=850)
+    
+    render_examples(df_clustered, result, available_features)
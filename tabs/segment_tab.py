@@ -0,0 +1,63 @@
+import streamlit as st
+import pandas as pd
+
+from utils.engines import DEFAULT_ENGINE
+from utils.segments import get_segmented_clustering, segment_frame, MAX_PARTITIONS, SEGMENT_CLUSTER_COL
+
+def render(df_clustered, result, k_value, features_cols):
+    """Render Segment tab - clustering terpisah di dalam setiap nilai kolom kategorikal"""
+    from tabs.categorical_tab import detect_categorical_columns, get_cardinality
+
+    categorical_cols, _ = detect_categorical_columns(df_clustered)
+    cardinality = get_cardinality(df_clustered, categorical_cols)
+    segment_cols = [col for col in categorical_cols if cardinality[col]['distinct'] <= MAX_PARTITIONS]
+
+    if not segment_cols:
+        st.info(f"Tidak ada kolom kategorikal dengan maksimal {MAX_PARTITIONS} nilai untuk segmentasi.")
+        return
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        segment_col = st.selectbox(
+            "Segmentasi per kolom:",
+            options=segment_cols,
+            help="Satu model K-Means per nilai kolom, dengan features, K dan engine yang sama"
+        )
+
+    # Label di tab ini lokal per segmen (menggantikan kolom Cluster global di frame gabungan)
+    df = df_clustered
+    engine = result.get('engine') or DEFAULT_ENGINE
+    segmented = get_segmented_clustering(df, segment_col, k_value, features_cols, engine, compute=False)
+
+    with col2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        if segmented is None and st.button("Jalankan Segmentasi", key="run_segments"):
+            with st.spinner(f"Clustering per {segment_col}..."):
+                segmented = get_segmented_clustering(df, segment_col, k_value, features_cols, engine)
+
+    if segmented is None:
+        st.caption(f"K={k_value} per segmen, preprocessing memakai statistik global seluruh dataset.")
+        return
+
+    summary = pd.DataFrame(segmented['summary'])
+    skipped = summary[summary['clusters'] == 0]
+    st.caption(
+        f"{len(summary) - len(skipped)} segmen di-cluster dalam {segmented['elapsed']:.1f}s "
+        f"({segmented['n_jobs']} worker)"
+        + (f"; {len(skipped)} segmen terlalu kecil dilewati" if len(skipped) else "")
+    )
+
+    st.markdown("#### Ringkasan per Segmen")
+    st.dataframe(summary.rename(columns={
+        'segment': segment_col, 'rows': 'Baris', 'clusters': 'Cluster',
+        'inertia': 'Inertia', 'silhouette': 'Silhouette',
+    }).round({'Inertia': 1, 'Silhouette': 3}), use_container_width=True, hide_index=True)
+
+    st.markdown("#### Profil Cluster per Segmen")
+    profiles = pd.DataFrame(segmented['profiles'])
+    st.dataframe(profiles.round(2), use_container_width=True, hide_index=True)
+
+    with st.expander("Data dengan label segmen", expanded=False):
+        frame = segment_frame(df, segmented)
+        st.dataframe(frame[[segment_col, SEGMENT_CLUSTER_COL] + list(features_cols)].head(100),
+                     use_container_width=True, hide_index=True)
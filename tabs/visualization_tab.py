@@ -1,10 +1,11 @@
 import streamlit as st
-import plotly.express as px
 import pandas as pd
 
 
 def render(df_clustered, result, k_value, features_cols):
     """Render Visualization tab (HTML Hybrid)"""
+    # plotly hanya dimuat saat tab ini dirender
+    import plotly.express as px
 
     # =======================
     # GLOBAL CSS
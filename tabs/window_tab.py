@@ -0,0 +1,92 @@
+import streamlit as st
+import pandas as pd
+
+from utils.engines import DEFAULT_ENGINE
+from utils.windows import (
+    detect_date_columns, get_windowed_clustering, WINDOW_FREQS, DEFAULT_WINDOW_FREQ, MIN_WINDOW_ROWS
+)
+
+def render(df_clustered, result, k_value, features_cols):
+    """Render Tren Waktu tab - clustering per window waktu dengan ID cluster yang stabil antar window"""
+    date_cols = detect_date_columns(df_clustered)
+    if not date_cols:
+        st.info("Tidak ada kolom tanggal (mis. tanggal posting) untuk segmentasi per window waktu.")
+        return
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        date_col = st.selectbox("Kolom tanggal:", options=date_cols)
+    with col2:
+        freq = st.selectbox(
+            "Window:",
+            options=list(WINDOW_FREQS),
+            index=list(WINDOW_FREQS).index(DEFAULT_WINDOW_FREQ),
+            format_func=lambda f: WINDOW_FREQS[f],
+        )
+
+    df = df_clustered
+    engine = result.get('engine') or DEFAULT_ENGINE
+    windowed = get_windowed_clustering(df, date_col, k_value, features_cols, engine, freq, compute=False)
+
+    with col3:
+        st.markdown("<br>", unsafe_allow_html=True)
+        if windowed is None and st.button("Jalankan per Window", key="run_windows"):
+            with st.spinner(f"Clustering {WINDOW_FREQS[freq].lower()} per {date_col}..."):
+                try:
+                    windowed = get_windowed_clustering(df, date_col, k_value, features_cols, engine, freq)
+                except ValueError as e:
+                    st.error(str(e))
+                    return
+
+    if windowed is None:
+        st.caption(
+            f"K={k_value} per window; window berikutnya melanjutkan dari centroid window sebelumnya "
+            f"dan ID cluster disejajarkan, jadi Cluster yang sama bisa diikuti dari waktu ke waktu."
+        )
+        return
+
+    # plotly hanya dimuat saat ada hasil untuk digambar
+    import plotly.express as px
+
+    windows = pd.DataFrame(windowed['windows'])
+    centers = pd.DataFrame(windowed['centers'])
+    skipped = windows[~windows['fitted']]
+    st.caption(
+        f"{len(windows) - len(skipped)} window di-fit dalam {windowed['elapsed']:.1f}s"
+        + (f"; {len(skipped)} window di bawah {MIN_WINDOW_ROWS} baris memakai centroid sebelumnya"
+           if len(skipped) else "")
+    )
+
+    centers['Cluster'] = centers['Cluster'].astype(str)
+    st.markdown("#### Porsi Cluster per Window")
+    fig_share = px.area(centers, x='window', y='share', color='Cluster',
+                        labels={'window': 'Window', 'share': 'Porsi'})
+    st.plotly_chart(fig_share, use_container_width=True)
+
+    drift = centers.dropna(subset=['drift'])
+    if not drift.empty:
+        st.markdown("#### Drift Centroid")
+        fig_drift = px.line(drift, x='window', y='drift', color='Cluster', markers=True,
+                            labels={'window': 'Window', 'drift': 'Pergeseran (ruang ter-scale)'})
+        st.plotly_chart(fig_drift, use_container_width=True)
+
+    st.markdown("#### Ringkasan per Window")
+    st.dataframe(windows.rename(columns={
+        'window': 'Window', 'rows': 'Baris', 'fitted': 'Di-fit', 'iterations': 'Iterasi',
+        'inertia': 'Inertia', 'mean_drift': 'Drift Rata-rata', 'moved': 'Pindah Cluster',
+    }).round({'Inertia': 1, 'Drift Rata-rata': 3}), use_container_width=True, hide_index=True)
+
+    migrations = pd.DataFrame(windowed['migrations'])
+    if not migrations.empty:
+        with st.expander("Migrasi antar cluster", expanded=False):
+            st.caption("Baris window ini yang labelnya berubah antara centroid window sebelumnya dan centroid baru.")
+            selected = st.selectbox("Window:", options=migrations['window'].unique().tolist(),
+                                    key="migration_window")
+            matrix = migrations[migrations['window'] == selected].pivot_table(
+                index='from', columns='to', values='count', fill_value=0
+            )
+            st.dataframe(matrix.rename_axis(index='Dari', columns='Ke'), use_container_width=True)
+
+    with st.expander("Centroid per window", expanded=False):
+        st.dataframe(centers[['window', 'Cluster', 'size'] + list(features_cols)].round(2),
+                     use_container_width=True, hide_index=True)
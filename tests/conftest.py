@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Test dijalankan dari root repo maupun dari direktori lain
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FEATURES = ['Likes', 'Shares', 'Comments', 'Views']
+
+
+def make_frame(n_rows: int = 600, seed: int = 0, key: str = 'test-dataset') -> pd.DataFrame:
+    """Dataset sintetis mirip export TikTok, dengan tiga kelompok yang jelas terpisah"""
+    from utils.cache import set_dataset_key
+
+    rng = np.random.default_rng(seed)
+    group = rng.integers(0, 3, n_rows)
+    base = np.array([[500, 50, 20, 10_000], [5_000, 400, 150, 80_000], [20_000, 2_000, 900, 300_000]])
+    values = base[group] * rng.uniform(0.8, 1.2, (n_rows, len(FEATURES)))
+    df = pd.DataFrame(values, columns=FEATURES)
+    df['VideoID'] = [f"v{i}" for i in range(n_rows)]
+    df['ContentType'] = rng.choice(['Video', 'Image', 'Text'], n_rows)
+    df['PostDate'] = pd.date_range('2024-01-01', periods=n_rows, freq='h').strftime('%Y-%m-%d')
+    return set_dataset_key(df, key)
+
+
+@pytest.fixture
+def frame():
+    return make_frame()
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'import_budget: cold-import budget per modul (lambat, subprocess)')
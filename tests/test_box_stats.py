@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tabs.analysis_tab import compute_box_stats
+
+
+@pytest.fixture
+def skewed():
+    rng = np.random.default_rng(11)
+    frames = [pd.DataFrame({'Cluster': cluster, 'Views': rng.lognormal(mean=cluster + 5, sigma=1.0, size=size)})
+              for cluster, size in enumerate([5000, 300, 40])]
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_box_stats_are_exact_over_all_rows(skewed):
+    box = compute_box_stats(skewed, 'Cluster', ['Views'], max_outliers=5)
+    stats = box['stats']['Views']
+    assert box['sizes'] == [5000, 300, 40]
+
+    for pos, (cluster, group) in enumerate(skewed.groupby('Cluster')):
+        values = group['Views'].to_numpy()
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        inside = values[(values >= low) & (values <= high)]
+        outside = values[(values < low) | (values > high)]
+
+        assert stats['median'][pos] == pytest.approx(median)
+        assert stats['q1'][pos] == pytest.approx(q1) and stats['q3'][pos] == pytest.approx(q3)
+        assert stats['lowerfence'][pos] == inside.min() and stats['upperfence'][pos] == inside.max()
+        assert stats['n_outliers'][pos] == len(outside)
+        # Hanya outlier paling ekstrem yang dikirim
+        assert len(stats['outliers'][pos]) == min(5, len(outside))
+        assert max(stats['outliers'][pos], default=0) == max(outside, default=0)
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from utils.cardinality import estimate_distinct, profile_cardinality
+
+
+def test_small_column_is_exact():
+    series = pd.Series(['a', 'b', 'a', None, 'c'])
+    assert estimate_distinct(series) == (3, True)
+
+
+def test_large_column_estimate_close_to_true_distinct():
+    rng = np.random.default_rng(1)
+    series = pd.Series(rng.integers(0, 250_000, 300_000).astype(str))
+    true_distinct = series.nunique()
+
+    distinct, exact = estimate_distinct(series, exact_limit=50_000)
+
+    assert not exact
+    assert abs(distinct - true_distinct) / true_distinct < 0.05
+
+
+def test_estimate_clamped_to_non_null_count():
+    series = pd.Series([f"id{i}" for i in range(60_000)] + [None] * 40_000)
+    distinct, _ = estimate_distinct(series, exact_limit=50_000)
+    assert distinct <= 60_000
+
+
+def test_unique_column_is_id_like():
+    df = pd.DataFrame({'VideoID': [f"v{i}" for i in range(60_000)],
+                       'ContentType': np.resize(['Video', 'Image', 'Text'], 60_000)})
+    profiles = profile_cardinality(df, ['VideoID', 'ContentType'])
+    assert profiles['VideoID']['id_like']
+    assert not profiles['ContentType']['id_like']
+    assert profiles['ContentType']['distinct'] == 3
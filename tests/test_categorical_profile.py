@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tabs.categorical_tab import build_column_profile, get_cardinality, get_column_profile
+from utils.cache import set_dataset_key
+
+
+@pytest.fixture
+def hashtags():
+    rng = np.random.default_rng(3)
+    # 4 hashtag populer + ekor panjang 40 hashtag jarang
+    popular = rng.choice(['#fyp', '#viral', '#promo', '#diskon'], 900)
+    tail = [f"#tag{i}" for i in rng.integers(0, 40, 100)]
+    df = pd.DataFrame({'Hashtag': np.concatenate([popular, tail]), 'Cluster': rng.integers(0, 3, 1000)})
+    return set_dataset_key(df, 'hashtags')
+
+
+def test_long_tail_is_bucketed_into_other(hashtags):
+    profile = build_column_profile(hashtags, 'Hashtag', top_n=5)
+
+    assert len(profile['categories']) == 6 and 'Other' in profile['categories']
+    assert sum(row['count'] for row in profile['summary_stats']) == len(hashtags)
+    for row in profile['heatmap_data']['z']:
+        assert sum(row) == pytest.approx(100.0)
+
+
+def test_profile_uses_cached_cardinality(hashtags, monkeypatch):
+    def no_nunique(self, *args, **kwargs):
+        raise AssertionError("nunique dihitung ulang")
+
+    # Kardinalitas sudah dihitung saat daftar kolom dibuat
+    assert get_cardinality(hashtags, ['Hashtag'])['Hashtag']['distinct'] == hashtags['Hashtag'].nunique()
+
+    monkeypatch.setattr(pd.Series, 'nunique', no_nunique)
+    profile = get_column_profile(hashtags, 'Hashtag', {'result_key': 'cardinality-test'}, top_n=5)
+    assert 'Other' in profile['categories']
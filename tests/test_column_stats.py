@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from utils.cache import get_dataset_key, set_dataset_key
+from utils.clustering import get_column_stats, scale_features
+
+
+def _views(n_rows=1000):
+    df = pd.DataFrame({'Views': np.arange(n_rows, dtype=float), 'Likes': np.arange(n_rows, dtype=float) % 7})
+    df.loc[::10, 'Views'] = np.nan
+    return set_dataset_key(df, 'column-stats')
+
+
+def test_copy_and_column_selection_keep_the_dataset_key():
+    df = _views()
+    assert get_dataset_key(df.copy()) == 'column-stats'
+    assert get_dataset_key(df[['Views']]) == 'column-stats'
+
+
+def test_subsets_get_their_own_key_and_stats():
+    df = _views()
+    full = get_column_stats(df, 'Views')
+
+    for subset in (df.head(200), df[df['Likes'] > 3], df.sample(300, random_state=0)):
+        key = get_dataset_key(subset)
+        assert key != 'column-stats' and key.startswith('column-stats[')
+        stats = get_column_stats(subset, 'Views')
+        assert len(stats['imputed']) == len(subset)
+        assert stats['median'] == np.nanmedian(subset['Views'])
+    assert full['median'] == np.nanmedian(df['Views'])
+
+
+def test_same_subset_reuses_its_key():
+    df = _views()
+    assert get_dataset_key(df.iloc[100:400]) == get_dataset_key(df.iloc[100:400].copy())
+    assert get_dataset_key(df.iloc[100:400]) != get_dataset_key(df.iloc[100:401])
+
+
+def test_scaler_of_a_subset_uses_subset_statistics():
+    df = _views()
+    get_column_stats(df, 'Views')
+    subset = df[df['Views'] > 500]
+
+    scaler, scaled = scale_features(subset, ['Views', 'Likes'])
+
+    assert scaled.shape == (len(subset), 2)
+    np.testing.assert_allclose(scaler.mean_[0], subset['Views'].mean())
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tabs.overview_tab import aggregate_groups, get_content_type_distribution
+
+
+@pytest.fixture
+def posts():
+    rng = np.random.default_rng(7)
+    n_rows = 2000
+    df = pd.DataFrame({
+        'ContentType': rng.choice(['Video', 'Image', 'Text', None], n_rows, p=[0.5, 0.3, 0.15, 0.05]),
+        'AgeGroup': rng.choice(['18-24', '25-34', '35+'], n_rows),
+        'Cluster': rng.integers(0, 4, n_rows),
+        'Likes': rng.integers(0, 1000, n_rows).astype(float),
+        'Views': rng.integers(1, 50_000, n_rows).astype(float),
+    })
+    df.loc[rng.choice(n_rows, 100, replace=False), 'Likes'] = np.nan
+    return df
+
+
+def test_one_pass_aggregation_matches_groupby(posts):
+    summary = aggregate_groups(posts, 'ContentType', ['Likes', 'Views'], mode_col='AgeGroup')
+    grouped = posts.groupby('ContentType')
+
+    expected_counts = grouped.size()
+    pd.testing.assert_series_equal(summary['count'].sort_index(), expected_counts, check_names=False)
+    np.testing.assert_allclose(summary['Likes'].sort_index(), grouped['Likes'].mean())
+    for content_type, group in grouped:
+        clusters = group['Cluster'].value_counts()
+        assert summary.loc[content_type, 'dominant_cluster'] == clusters.sort_index().idxmax()
+        assert summary.loc[content_type, 'dominant_cluster_pct'] == pytest.approx(clusters.max() / len(group) * 100)
+        assert summary.loc[content_type, 'mode'] == group['AgeGroup'].value_counts().sort_index().idxmax()
+
+
+def test_distribution_records_sorted_by_count(posts):
+    records = get_content_type_distribution(posts)
+    counts = [record['count'] for record in records]
+    assert counts == sorted(counts, reverse=True)
+    assert {record['content_type'] for record in records} == {'Video', 'Image', 'Text'}
+    assert all(record['performance'] in ('Tinggi', 'Menengah', 'Rendah') for record in records)
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+import utils.ingest as ingest
+from utils.dataset_catalog import PARTITION_COL, apply_filters, load_catalog, parse_filters
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    ingest._ingest_state.clear()
+    yield
+    ingest._ingest_state.clear()
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    pd.DataFrame({'Views': [100, 200], 'Likes': [1, 2]}).to_csv(tmp_path / '2024-01.csv', index=False)
+    pd.DataFrame({'Views': [5000, 6000], 'Likes': [3.5, 4.5]}).to_csv(tmp_path / '2024-02.csv', index=False)
+    return str(tmp_path)
+
+
+def test_parse_filters():
+    assert parse_filters('Views=1000:, Likes=:50') == (('Likes', None, 50.0), ('Views', 1000.0, None))
+    assert parse_filters('') == ()
+    with pytest.raises(ValueError):
+        parse_filters('Views>1000')
+
+
+def test_catalog_unifies_partitions(catalog):
+    df = load_catalog(catalog)
+    assert len(df) == 4
+    assert df['Likes'].dtype == 'float64'
+    assert set(df[PARTITION_COL]) == {'2024-01', '2024-02'}
+
+
+def test_filters_prune_partitions_and_rows(catalog, caplog):
+    # Pembacaan pertama mengisi metadata partisi, berikutnya file bisa dilewati
+    load_catalog(catalog)
+    with caplog.at_level('INFO', logger='utils.dataset_catalog'):
+        df = load_catalog(catalog, parse_filters('Views=5500:'))
+
+    assert df['Views'].tolist() == [6000]
+    assert 'Partition pruning: 1 dari 2 file dilewati' in caplog.text
+
+
+def test_apply_filters_ignores_unknown_columns():
+    df = pd.DataFrame({'Views': [1, 2, 3]})
+    assert apply_filters(df, (('Missing', 0.0, 1.0), ('Views', 2.0, None)))['Views'].tolist() == [2, 3]
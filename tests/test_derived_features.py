@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cache import set_dataset_key
+from utils.derived_features import add_derived_features, available_derived_features, compute_derived_feature
+
+
+@pytest.fixture
+def counts():
+    df = pd.DataFrame({'Views': [0, 10, 100, -5], 'Likes': [0, 5, 20, 3], 'Shares': [1, 2, 3, 4]})
+    return set_dataset_key(df, 'derived-counts')
+
+
+def test_ratio_clips_denominator_and_log_clips_negatives(counts):
+    np.testing.assert_allclose(compute_derived_feature(counts, 'Likes_per_View'), [0.0, 0.5, 0.2, 3.0])
+    np.testing.assert_allclose(compute_derived_feature(counts, 'Log_Views'), np.log1p([0, 10, 100, 0]))
+
+
+def test_cached_column_is_shared_and_read_only(counts):
+    first = compute_derived_feature(counts, 'Log_Likes')
+    assert compute_derived_feature(counts.copy(), 'Log_Likes') is first
+    with pytest.raises(ValueError):
+        first[0] = 1.0
+
+
+def test_only_selected_features_are_added(counts):
+    add_derived_features(counts, ['Log_Views', 'Views', 'Unknown'])
+    assert [col for col in counts.columns if col not in ('Views', 'Likes', 'Shares')] == ['Log_Views']
+    assert 'Log_Views' not in available_derived_features(counts)
+    assert 'Comments_per_Like' not in available_derived_features(counts)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from utils.engines import CLUSTERING_ENGINES, _leaf_weights, assignment_scores, fit_engine, nearest_centers
+
+
+@pytest.fixture
+def blobs():
+    rng = np.random.default_rng(0)
+    centers = np.array([[0.0, 0.0], [6.0, 6.0], [-6.0, 6.0]])
+    return np.concatenate([center + rng.normal(scale=0.5, size=(300, 2)) for center in centers])
+
+
+def test_nearest_centers_matches_brute_force(blobs):
+    centers = blobs[[0, 400, 800]]
+    labels, sq = nearest_centers(blobs, centers, chunk_size=128)
+    brute = ((blobs[:, None, :] - centers[None]) ** 2).sum(axis=2)
+    np.testing.assert_array_equal(labels, brute.argmin(axis=1))
+    np.testing.assert_allclose(sq, brute.min(axis=1), atol=1e-9)
+
+
+def test_leaf_weights_are_exact_cf_tree_counts(blobs):
+    from sklearn.cluster import Birch
+
+    birch = Birch(threshold=0.3, n_clusters=None)
+    for start in range(0, len(blobs), 200):
+        birch.partial_fit(blobs[start:start + 200])
+    weights = _leaf_weights(birch)
+
+    assert weights.shape == (len(birch.subcluster_centers_),)
+    assert weights.sum() == len(blobs)
+    # CF additivity: rata-rata centroid leaf berbobot = rata-rata seluruh data
+    np.testing.assert_allclose(np.average(birch.subcluster_centers_, weights=weights, axis=0),
+                               blobs.mean(axis=0), atol=1e-9)
+
+
+def test_birch_reads_the_data_once_before_labelling(blobs, monkeypatch):
+    import utils.engines as engines
+
+    calls = []
+    real_nearest = engines.nearest_centers
+
+    def nearest_centers(X, *args, **kwargs):
+        calls.append(len(X))
+        return real_nearest(X, *args, **kwargs)
+
+    monkeypatch.setattr(engines, 'nearest_centers', nearest_centers)
+    engines._fit_birch(blobs, 3)
+    # Hanya pelabelan akhir; bobot leaf tidak memindai ulang data
+    assert calls == [len(blobs)]
+
+
+@pytest.mark.parametrize('engine', list(CLUSTERING_ENGINES))
+def test_engines_recover_separated_groups(blobs, engine):
+    model, labels = fit_engine(engine, blobs, 3)
+    assert model.cluster_centers_.shape == (3, 2)
+    # Setiap kelompok asli jatuh ke satu cluster
+    for start in (0, 300, 600):
+        assert len(np.unique(labels[start:start + 300])) == 1
+    assert len(np.unique(labels)) == 3
+
+
+def test_warm_start_keeps_center_order(blobs):
+    init = np.array([[-6.0, 6.0], [0.0, 0.0], [6.0, 6.0]])
+    model, labels = fit_engine('kmeans', blobs, 3, init=init)
+    np.testing.assert_allclose(model.cluster_centers_, init, atol=0.2)
+
+
+def test_membership_stable_when_labels_are_not_nearest(blobs):
+    X, centers = blobs, np.array([[0.0, 0.0], [50.0, 50.0], [-50.0, 50.0]])
+    sq = ((X[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+    # Label = centroid terjauh, temperatur kecil: pergeseran dengan jarak label akan overflow
+    farthest = sq.argmax(axis=1)
+    temperature = 0.5
+
+    scores = assignment_scores(X, centers, labels=farthest, temperature=temperature, chunk_size=97)
+
+    membership = scores['membership']
+    assert np.isfinite(membership).all()
+    np.testing.assert_allclose(membership.sum(axis=1), 1.0, rtol=1e-5)
+    logits = -(sq - sq.min(axis=1, keepdims=True)) / temperature
+    expected = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+    np.testing.assert_allclose(membership, expected, atol=1e-6)
+    np.testing.assert_array_equal(scores['labels'], farthest)
@@ -0,0 +1,75 @@
+import gzip
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import FEATURES
+from utils import export
+from utils.clustering import perform_clustering
+from utils.export import cached_export_file, export_bytes, export_file, parquet_available
+
+
+@pytest.fixture
+def clustered(frame):
+    result = perform_clustering(frame, 3, FEATURES, enable_caching=False)
+    df_clustered = frame.copy()
+    df_clustered['Cluster'] = result['clusters']
+    return df_clustered, result
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, 'EXPORT_DIR', str(tmp_path))
+    monkeypatch.setattr(export, '_export_files', export.LRUStore(max_entries=2))
+    return tmp_path
+
+
+@pytest.mark.skipif(not parquet_available(), reason="butuh pyarrow")
+def test_parquet_round_trip_one_row_group_per_chunk(clustered):
+    import pyarrow.parquet as pq
+
+    df_clustered, result = clustered
+    data = export_bytes(df_clustered, result, FEATURES, 'parquet', include_distances=True, chunk_rows=250)
+
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.metadata.num_row_groups == 3
+    restored = parquet.read().to_pandas()
+    pd.testing.assert_frame_equal(restored[df_clustered.columns], df_clustered.reset_index(drop=True),
+                                  check_dtype=False)
+    distances = restored[[f'Distance_C{k}' for k in range(3)]].to_numpy()
+    np.testing.assert_array_equal(distances.argmin(axis=1), restored['Cluster'])
+
+
+def test_csv_gz_round_trip(clustered):
+    df_clustered, result = clustered
+    data = export_bytes(df_clustered, result, FEATURES, 'csv.gz', include_pca=True, chunk_rows=250)
+
+    restored = pd.read_csv(io.BytesIO(gzip.decompress(data)))
+    assert len(restored) == len(df_clustered)
+    np.testing.assert_array_equal(restored['Cluster'], df_clustered['Cluster'])
+    assert {'PC1', 'PC2'} <= set(restored.columns)
+
+
+def test_export_file_reuses_file_and_prunes_evicted(clustered, export_dir):
+    df_clustered, result = clustered
+    first = export_file(df_clustered, result, FEATURES, 'csv.gz')
+    assert export_file(df_clustered, result, FEATURES, 'csv.gz') == first
+    assert cached_export_file(result, 'csv.gz') == first
+    assert first['rows'] == len(df_clustered) and first['size'] == os.path.getsize(first['path'])
+
+    # Dua export lain menggusur metadata pertama (max_entries=2) dan filenya ikut dihapus
+    export_file(df_clustered, result, FEATURES, 'csv.gz', include_distances=True)
+    export_file(df_clustered, result, FEATURES, 'csv.gz', include_pca=True)
+    assert not os.path.exists(first['path'])
+    assert cached_export_file(result, 'csv.gz') is None
+    assert len(os.listdir(export_dir)) == 2
+
+
+def test_export_file_cleans_up_on_failure(clustered, export_dir):
+    df_clustered, result = clustered
+    with pytest.raises(ValueError):
+        export_file(df_clustered, result, FEATURES, 'xlsx')
+    assert os.listdir(export_dir) == []
@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+from utils.import_budget import BUDGETS, baseline_scale, check_module
+
+# Subprocess per modul (~1 detik masing-masing); lewati dengan -m "not import_budget"
+pytestmark = pytest.mark.import_budget
+
+
+@pytest.fixture(scope='module')
+def scale():
+    return baseline_scale(repeats=2) * float(os.environ.get('IMPORT_BUDGET_SCALE', 1.0))
+
+
+@pytest.mark.parametrize('module', list(BUDGETS))
+def test_module_within_import_budget(module, scale):
+    elapsed_ms, limit_ms, loaded = check_module(module, scale, repeats=2)
+    assert not loaded, f"{module} memuat dependency berat saat import: {loaded}"
+    assert elapsed_ms <= limit_ms, f"{module}: {elapsed_ms:.0f} ms > budget {limit_ms:.0f} ms"
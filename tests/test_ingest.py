@@ -0,0 +1,109 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils.ingest as ingest
+from utils.ingest import get_ingest_medians, get_ingest_stats, read_incremental
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    ingest._ingest_state.clear()
+    yield
+    ingest._ingest_state.clear()
+
+
+def write_csv(path, rows, mode='w', header=True):
+    pd.DataFrame(rows, columns=['Likes', 'ContentType']).to_csv(path, mode=mode, header=header, index=False)
+
+
+def test_append_parses_only_tail(tmp_path):
+    path = tmp_path / 'data.csv'
+    write_csv(path, [[1, 'Video'], [2, 'Image']])
+    assert len(read_incremental(str(path))) == 2
+
+    write_csv(path, [[3, 'Text']], mode='a', header=False)
+    frame = read_incremental(str(path))
+
+    assert frame['Likes'].tolist() == [1, 2, 3]
+    assert get_ingest_stats(str(path))['Likes']['sum'] == 6
+
+
+def test_rewritten_file_is_read_again(tmp_path):
+    path = tmp_path / 'data.csv'
+    write_csv(path, [[1, 'Video'], [2, 'Image']])
+    read_incremental(str(path))
+
+    write_csv(path, [[10, 'Text'], [20, 'Text'], [30, 'Text']])
+    assert read_incremental(str(path))['Likes'].tolist() == [10, 20, 30]
+
+
+def test_unchanged_file_returns_cached_frame(tmp_path):
+    path = tmp_path / 'data.csv'
+    write_csv(path, [[1, 'Video']])
+    assert read_incremental(str(path)) is read_incremental(str(path))
+
+
+def test_different_files_parse_concurrently(tmp_path, monkeypatch):
+    # Kedua parse harus berjalan bersamaan untuk melewati barrier
+    barrier = threading.Barrier(2, timeout=5)
+    real_read_csv = pd.read_csv
+
+    def read_csv(*args, **kwargs):
+        barrier.wait()
+        return real_read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(ingest.pd, 'read_csv', read_csv)
+    paths = [tmp_path / 'a.csv', tmp_path / 'b.csv']
+    for path in paths:
+        write_csv(path, [[1, 'Video']])
+
+    errors = []
+
+    def load(path):
+        try:
+            read_incremental(str(path))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=load, args=(path,)) for path in paths]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+
+
+def test_medians_stay_exact_across_appends(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, 'MAX_SORTED_CHUNKS', 3)
+    rng = np.random.default_rng(5)
+    path = tmp_path / 'data.csv'
+    write_csv(path, [[value, 'Video'] for value in rng.integers(0, 100, 50)] + [[None, 'Image']])
+    read_incremental(str(path))
+    get_ingest_medians(str(path))
+
+    for n_rows in (1, 7, 20, 3, 11, 2):
+        rows = [[value, 'Text'] for value in rng.integers(0, 100, n_rows)] + [[None, 'Text']]
+        write_csv(path, rows, mode='a', header=False)
+        frame = read_incremental(str(path))
+        median = get_ingest_medians(str(path))['Likes']
+        assert median == np.nanmedian(frame['Likes'].to_numpy(dtype='float64'))
+        assert len(ingest._ingest_state.get(str(path))['sorted']['Likes']) <= 3
+
+
+def test_kth_smallest_matches_sorted_union():
+    rng = np.random.default_rng(1)
+    chunks = [np.sort(rng.integers(0, 20, size).astype(float)) for size in (1, 9, 30, 4)]
+    union = np.sort(np.concatenate(chunks))
+    assert [ingest._kth_smallest(chunks, k) for k in range(len(union))] == union.tolist()
+
+
+def test_state_kept_for_a_few_files_only(tmp_path):
+    paths = [tmp_path / f"day{i}.csv" for i in range(ingest._ingest_state.max_entries + 2)]
+    for path in paths:
+        write_csv(path, [[1, 'Video']])
+        read_incremental(str(path))
+    assert len(ingest._ingest_state) == ingest._ingest_state.max_entries
+    assert str(paths[0]) not in ingest._ingest_state
@@ -0,0 +1,57 @@
+import json
+import logging
+
+import pytest
+
+from utils import logging_setup
+from utils.logging_setup import JsonFormatter, RateLimitFilter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(logging_setup.time, 'monotonic', clock)
+    return clock
+
+
+def record(msg='Menghitung fitur turunan %s', args=('Log_Views',), level=logging.INFO, lineno=42):
+    return logging.LogRecord('utils.derived_features', level, 'derived_features.py', lineno, msg, args, None)
+
+
+def test_repeats_beyond_burst_are_dropped_within_window(clock):
+    limiter = RateLimitFilter(interval=60, burst=3)
+    passed = [limiter.filter(record()) for _ in range(10)]
+    assert passed == [True] * 3 + [False] * 7
+
+    # Call site lain punya jendela sendiri
+    assert limiter.filter(record(lineno=43))
+    # WARNING ke atas tidak pernah dibatasi
+    assert limiter.filter(record(level=logging.WARNING))
+
+
+def test_next_window_reports_suppressed_count(clock):
+    limiter = RateLimitFilter(interval=60, burst=2)
+    for _ in range(5):
+        limiter.filter(record())
+
+    clock.now += 61
+    summary = record()
+    assert limiter.filter(summary)
+    assert summary.getMessage() == 'Menghitung fitur turunan Log_Views (3 pesan serupa dilewati)'
+    assert limiter.filter(record())
+    assert not limiter.filter(record())
+
+
+def test_json_formatter_writes_one_object_per_line():
+    line = JsonFormatter().format(record(msg='baris\nkedua %d', args=(1,)))
+    entry = json.loads(line)
+    assert '\n' not in line
+    assert entry['message'] == 'baris\nkedua 1' and entry['level'] == 'INFO'
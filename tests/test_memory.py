@@ -0,0 +1,93 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import utils.memory as memory
+from utils.memory import estimate_size, memory_report, session_stages, track_stage
+
+
+def test_stage_records_are_kept_per_session():
+    session_a, session_b = {}, {}
+    with track_stage('clustering', session_stages(session_a)):
+        pass
+    with track_stage('tab:overview', session_stages(session_b)):
+        pass
+
+    assert list(session_stages(session_a)) == ['clustering']
+    assert list(session_stages(session_b)) == ['tab:overview']
+
+
+def test_concurrent_stages_record_independently():
+    sessions = [{} for _ in range(4)]
+    barrier = threading.Barrier(len(sessions))
+
+    def run(state, n_bytes):
+        with track_stage('clustering', session_stages(state)):
+            barrier.wait(5)
+            block = np.ones(n_bytes // 8)
+            block.sum()
+
+    threads = [threading.Thread(target=run, args=(state, (i + 1) * 1_000_000)) for i, state in enumerate(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for state in sessions:
+        record = session_stages(state)['clustering']
+        assert record['peak'] >= 0 and record['elapsed'] >= 0
+
+
+def test_track_stage_does_not_reset_global_tracemalloc_peak(monkeypatch):
+    calls = []
+    monkeypatch.setattr(memory.tracemalloc, 'reset_peak', lambda: calls.append(1))
+    monkeypatch.setenv(memory.MEMORY_TRACE_ENV, '1')
+    try:
+        with track_stage('load_data', {}):
+            pass
+    finally:
+        memory.tracemalloc.stop()
+    assert calls == []
+
+
+def test_report_skips_deep_walk_unless_requested(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("deep walk saat rerun biasa")
+
+    monkeypatch.setattr(memory, 'payload_sizes', fail)
+    monkeypatch.setattr(memory, 'session_state_sizes', fail)
+    report = memory_report({}, {'df_clustered': pd.DataFrame({'a': range(10)})})
+    assert report['session_state'] == {} and report['payloads'] == {}
+
+
+def test_deep_report_sizes_session_state():
+    frame = pd.DataFrame({'text': ['x' * 100] * 1000})
+    report = memory_report({}, {'df_clustered': frame, 'k': 3}, deep=True)
+    assert report['session_state']['df_clustered'] >= 100_000
+    assert list(report['session_state'])[0] == 'df_clustered'
+
+
+def test_estimate_size_counts_shared_arrays_once():
+    array = np.zeros(10_000)
+    assert estimate_size([array, array]) < 2 * array.nbytes
+
+
+def test_stage_summary_is_logged_at_info_without_trace(monkeypatch, caplog):
+    monkeypatch.delenv(memory.MEMORY_TRACE_ENV, raising=False)
+    stages = {}
+    with caplog.at_level('INFO', logger='utils.memory'):
+        with track_stage('clustering', stages):
+            pass
+        memory.log_memory_report(stages)
+
+    info = [record.getMessage() for record in caplog.records if record.levelname == 'INFO']
+    assert len(info) == 1
+    assert 'clustering peak +' in info[0] and 'retained' in info[0]
+
+
+def test_stage_outside_session_logs_its_own_summary(caplog):
+    with caplog.at_level('INFO', logger='utils.memory'):
+        with track_stage('warmup'):
+            pass
+    assert any('Memori stage warmup' in record.getMessage() for record in caplog.records)
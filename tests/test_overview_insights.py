@@ -0,0 +1,37 @@
+import pandas as pd
+
+from tabs.overview_tab import get_cluster_insights, insights_from_summary, summarize_clusters
+
+FEATURES = ['Engagement_Rate', 'Views']
+
+
+def _posts(repeat=1):
+    # Cluster 2: engagement & views tertinggi, cluster 0: engagement tinggi, cluster 1: views tinggi
+    rows = [(0, 0.09, 1_000), (0, 0.07, 1_200), (1, 0.01, 50_000), (2, 0.12, 90_000), (3, 0.001, 10)]
+    return pd.DataFrame(rows * repeat, columns=['Cluster'] + FEATURES)
+
+
+def test_categories_follow_ranks():
+    insights = {item['cluster']: item for item in get_cluster_insights(_posts(), 'Cluster', FEATURES)}
+
+    assert insights[2]['category'] == 'Performa Terbaik'
+    assert insights[0]['engagement_rank'] == 2 and insights[1]['views_rank'] == 2
+    assert (insights[3]['engagement_rank'], insights[3]['views_rank']) == (4, 4)
+    assert insights[3]['category'] == 'Rata-rata'
+    assert insights[0]['count'] == 2 and insights[0]['percentage'] == 40.0
+
+
+def test_insights_depend_only_on_the_summary_table():
+    means, counts = summarize_clusters(_posts(), 'Cluster', FEATURES)
+    assert means.shape == (4, 2)
+
+    small = get_cluster_insights(_posts(), 'Cluster', FEATURES)
+    large = get_cluster_insights(_posts(repeat=500), 'Cluster', FEATURES)
+    for a, b in zip(small, large):
+        assert {**a, 'count': 0} == {**b, 'count': 0}
+
+
+def test_single_cluster_gets_top_rank():
+    means = pd.DataFrame({'Engagement_Rate': [0.05], 'Views': [100.0]}, index=[0])
+    insight, = insights_from_summary(means, pd.Series([10], index=[0]), FEATURES)
+    assert insight['engagement_rank'] == insight['views_rank'] == 1
@@ -0,0 +1,90 @@
+import time
+
+import numpy as np
+import pytest
+
+import utils.progressive as progressive
+from conftest import FEATURES, make_frame
+from utils.clustering import _result_cache, get_cached_result, seed_result_cache
+from utils.progressive import progressive_clustering, refinement_status, start_refinement, stratified_sample
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    progressive._refinements.clear()
+    _result_cache.clear()
+    yield
+    progressive._refinements.clear()
+    _result_cache.clear()
+
+
+def wait_done(final_key, timeout=30):
+    deadline = time.monotonic() + timeout
+    while refinement_status(final_key)['state'] == 'running':
+        assert time.monotonic() < deadline, "refinement tidak selesai"
+        time.sleep(0.05)
+    return refinement_status(final_key)
+
+
+def evict_all_results():
+    for i in range(_result_cache.max_entries):
+        seed_result_cache({'result_key': f"filler-{i}"})
+
+
+def test_stratified_sample_keeps_every_stratum(frame):
+    idx = stratified_sample(frame, FEATURES, n_rows=60)
+    assert np.all(np.diff(idx) > 0)
+    assert set(frame['ContentType'].iloc[idx]) == {'Video', 'Image', 'Text'}
+    assert 50 <= len(idx) <= 70
+
+
+def test_refinement_restarts_after_final_result_is_evicted(frame):
+    init = np.zeros((3, len(FEATURES)))
+    final_key = start_refinement(frame, 3, FEATURES, 'kmeans', init)
+    assert wait_done(final_key)['state'] == 'done'
+    assert get_cached_result(final_key) is not None
+
+    evict_all_results()
+    assert get_cached_result(final_key) is None
+
+    start_refinement(frame, 3, FEATURES, 'kmeans', init)
+    assert wait_done(final_key)['state'] == 'done'
+    assert get_cached_result(final_key) is not None
+
+
+def test_done_refinement_with_cached_result_is_not_restarted(frame, monkeypatch):
+    init = np.zeros((3, len(FEATURES)))
+    final_key = start_refinement(frame, 3, FEATURES, 'kmeans', init)
+    wait_done(final_key)
+
+    monkeypatch.setattr(progressive.threading, 'Thread', None)  # gagal jika thread baru dibuat
+    assert start_refinement(frame, 3, FEATURES, 'kmeans', init) == final_key
+
+
+def test_failed_refinement_is_restarted(frame):
+    init = np.zeros((3, len(FEATURES)))
+    final_key = start_refinement(frame, 3, FEATURES, 'kmeans', init)
+    wait_done(final_key)
+    refinement_status(final_key)['state'] = 'failed'
+    evict_all_results()
+
+    start_refinement(frame, 3, FEATURES, 'kmeans', init)
+    assert wait_done(final_key)['state'] == 'done'
+
+
+def test_progressive_preview_then_final(monkeypatch):
+    df = make_frame(n_rows=3000, key='progressive-dataset')
+    monkeypatch.setattr(progressive, 'PROGRESSIVE_MIN_ROWS', 1000)
+    monkeypatch.setattr(progressive.stratified_sample, '__defaults__', (500, 42))
+
+    preview = progressive_clustering(df, 3, FEATURES, engine='kmeans')
+    assert preview['stage'] == 'preview'
+    assert preview['fit_rows'] == pytest.approx(500, abs=10)
+    assert len(preview['clusters']) == len(df)
+    # Preview di cache bersama tidak ikut diberi final_key milik session ini
+    assert 'final_key' not in get_cached_result(preview['result_key'])
+
+    wait_done(preview['final_key'])
+    final = progressive_clustering(df, 3, FEATURES, engine='kmeans')
+    assert final['stage'] == 'final'
+    assert final['result_key'] == preview['final_key']
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from utils.reduction import (
+    REDUCTION_METHODS, VARIANCE_TARGET, apply_reduction, reduce_features, resolve_reduction,
+)
+
+
+@pytest.fixture
+def low_rank():
+    """12 features yang sebagian besar variansnya ada di 3 arah laten"""
+    rng = np.random.default_rng(0)
+    latent = rng.normal(size=(3000, 3)) * [5.0, 3.0, 2.0]
+    X = latent @ rng.normal(size=(3, 12)) + rng.normal(scale=0.1, size=(3000, 12))
+    return X
+
+
+def _same_up_to_sign(actual, expected):
+    signs = np.sign(np.sum(actual * expected, axis=0))
+    np.testing.assert_allclose(actual * signs, expected, atol=1e-6)
+
+
+@pytest.mark.parametrize('method', ['pca', 'randomized_svd'])
+def test_components_match_sklearn_pca_up_to_sign(low_rank, method):
+    from sklearn.decomposition import PCA
+
+    reducer = REDUCTION_METHODS[method]['fit'](low_rank)
+    n = reducer['n_components']
+    pca = PCA(n_components=n).fit(low_rank)
+
+    _same_up_to_sign(reducer['components'], pca.components_.T)
+    _same_up_to_sign(apply_reduction(low_rank, reducer), pca.transform(low_rank))
+    assert reducer['retained_variance'] == pytest.approx(pca.explained_variance_ratio_.sum())
+
+
+@pytest.mark.parametrize('method', ['pca', 'randomized_svd'])
+def test_fewest_components_reaching_the_variance_target(low_rank, method):
+    from sklearn.decomposition import PCA
+
+    reducer = REDUCTION_METHODS[method]['fit'](low_rank)
+    cumulative = np.cumsum(PCA().fit(low_rank).explained_variance_ratio_)
+    expected = int(np.argmax(cumulative >= VARIANCE_TARGET)) + 1
+
+    assert reducer['n_components'] == expected
+    assert reducer['retained_variance'] >= VARIANCE_TARGET
+
+
+def test_random_projection_keeps_pairwise_distances_roughly(low_rank):
+    reducer = REDUCTION_METHODS['random_projection']['fit'](low_rank)
+    reduced = apply_reduction(low_rank[:200], reducer)
+
+    original = np.linalg.norm(low_rank[:100] - low_rank[100:200], axis=1)
+    projected = np.linalg.norm(reduced[:100] - reduced[100:200], axis=1)
+    assert reducer['retained_variance'] is None
+    assert np.median(projected / original) == pytest.approx(1.0, abs=0.35)
+
+
+def test_reduction_is_cached_per_key_and_read_only(low_rank):
+    first = reduce_features(('reduction-test', 'features'), low_rank, 'pca')
+    again = reduce_features(('reduction-test', 'features'), low_rank, 'pca')
+
+    assert again is first
+    with pytest.raises(ValueError):
+        first[1][0, 0] = 1.0
+
+
+@pytest.mark.parametrize('method, n_features, expected', [
+    ('auto', 11, 'pca'),
+    ('auto', 10, 'none'),
+    ('randomized_svd', 2, 'none'),
+    ('random_projection', 5, 'random_projection'),
+])
+def test_resolve_reduction(method, n_features, expected):
+    assert resolve_reduction(method, n_features) == expected
+
+
+def test_unknown_reduction_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_reduction('umap', 12)
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cache import set_dataset_key
+from utils.validators import (
+    DEFAULT_REDUNDANCY_MODE, REDUNDANCY_THRESHOLD, default_clustering_config, find_redundant_groups,
+    prune_redundant_features,
+)
+
+
+def _chained(seed):
+    """Rantai a~b~c (a dan c lebih lemah), pasangan d~e yang berlawanan arah, f bebas"""
+    rng = np.random.default_rng(seed)
+    base, other = rng.normal(size=(2, 2000))
+    noise = rng.normal(scale=0.28, size=(3, 2000))
+    df = pd.DataFrame({
+        'a': base,
+        'b': base + noise[0],
+        'c': base + noise[0] + noise[1],
+        'd': other,
+        'e': -other + noise[2] * 0.1,
+        'f': rng.normal(size=2000),
+    })
+    return set_dataset_key(df, f'redundancy-{seed}')
+
+
+def _brute_force_groups(df, features, threshold=REDUNDANCY_THRESHOLD):
+    """Union-find atas semua pasangan (i, j) dengan |r| > threshold"""
+    parent = {feature: feature for feature in features}
+
+    def root(feature):
+        while parent[feature] != feature:
+            feature = parent[feature]
+        return feature
+
+    for i, left in enumerate(features):
+        for right in features[i + 1:]:
+            if abs(df[left].corr(df[right])) > threshold:
+                parent[root(right)] = root(left)
+
+    members = {}
+    for feature in features:
+        members.setdefault(root(feature), []).append(feature)
+    return sorted(group for group in members.values() if len(group) > 1)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_groups_match_pairwise_union_find(seed):
+    df = _chained(seed)
+    features = ['f', 'c', 'a', 'e', 'b', 'd']
+
+    groups = find_redundant_groups(df, features)
+
+    assert sorted(group['features'] for group in groups) == _brute_force_groups(df, features)
+
+
+def test_chain_forms_one_group_in_selection_order():
+    df = _chained(0)
+    # a~c di bawah ambang, tapi tersambung lewat b
+    assert abs(df['a'].corr(df['c'])) < REDUNDANCY_THRESHOLD
+
+    groups = find_redundant_groups(df, ['c', 'f', 'b', 'a'])
+
+    assert [group['features'] for group in groups] == [['c', 'b', 'a']]
+    assert groups[0]['keep'] == 'c'
+
+
+def test_default_mode_keeps_features_and_frame_untouched():
+    df = _chained(1)
+    columns = list(df.columns)
+
+    assert DEFAULT_REDUNDANCY_MODE == 'keep'
+    features, groups = prune_redundant_features(df, ['a', 'b', 'd', 'e', 'f'])
+    assert features == ['a', 'b', 'd', 'e', 'f'] and len(groups) == 2
+    assert default_clustering_config(df.rename(columns={'a': 'Likes', 'b': 'Shares', 'f': 'Views'}))[0] == \
+        ['Likes', 'Shares', 'Views']
+    assert list(df.columns) == columns
+
+
+def test_drop_keeps_first_of_each_group():
+    df = _chained(2)
+    features, _ = prune_redundant_features(df, ['b', 'a', 'f', 'e', 'd'], mode='drop')
+    assert features == ['b', 'f', 'e']
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        prune_redundant_features(_chained(3), ['a', 'b'], mode='merge')
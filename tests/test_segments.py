@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import segments
+from utils.cache import set_dataset_key
+from utils.segments import SEGMENT_CLUSTER_COL, run_segmented_clustering, segment_frame
+
+FEATURES = ['Likes', 'Views']
+
+
+@pytest.fixture
+def regions():
+    """Tiga region dengan dua kelompok masing-masing, satu region kecil dan baris tanpa region"""
+    rng = np.random.default_rng(3)
+    parts = []
+    for region, n_rows, offset in (('ID', 400, 0.0), ('US', 250, 50.0), ('BR', 120, 100.0)):
+        group = rng.integers(0, 2, n_rows)
+        values = offset + group[:, None] * 20.0 + rng.normal(size=(n_rows, 2))
+        parts.append(pd.DataFrame({'Likes': values[:, 0], 'Views': values[:, 1], 'Region': region}))
+    parts.append(pd.DataFrame({'Likes': [1.0, 2.0, 3.0], 'Views': [1.0, 2.0, 3.0], 'Region': 'SG'}))
+    parts.append(pd.DataFrame({'Likes': rng.normal(size=30), 'Views': rng.normal(size=30), 'Region': None}))
+    df = pd.concat(parts, ignore_index=True).sample(frac=1.0, random_state=0).reset_index(drop=True)
+    return set_dataset_key(df, 'segments-regions')
+
+
+def test_parallel_and_serial_runs_agree(regions):
+    serial = run_segmented_clustering(regions, 'Region', 2, FEATURES, engine='kmeans', n_jobs=1)
+    parallel = run_segmented_clustering(regions, 'Region', 2, FEATURES, engine='kmeans', n_jobs=2)
+
+    np.testing.assert_array_equal(serial['labels'], parallel['labels'])
+    assert pd.DataFrame(serial['summary']).equals(pd.DataFrame(parallel['summary']))
+    assert parallel['n_jobs'] == 2
+
+
+def test_each_region_is_split_by_its_own_groups(regions):
+    result = run_segmented_clustering(regions, 'Region', 2, FEATURES, engine='kmeans', n_jobs=1)
+    labels = pd.Series(result['labels'], index=regions.index)
+
+    for region in ('ID', 'US', 'BR'):
+        rows = regions['Region'] == region
+        likes = regions.loc[rows, 'Likes']
+        high = likes > likes.min() + 10
+        # Label lokal: dua kelompok region ini persis terpisah (ID label bebas per region)
+        assert pd.crosstab(high, labels[rows]).gt(0).sum(axis=1).eq(1).all()
+
+
+def test_small_partitions_are_skipped(regions):
+    assert (regions['Region'] == 'SG').sum() < segments.MIN_PARTITION_ROWS
+
+    result = run_segmented_clustering(regions, 'Region', 2, FEATURES, engine='kmeans', n_jobs=1)
+    summary = {row['segment']: row for row in result['summary']}
+
+    assert (result['labels'][regions['Region'] == 'SG'] == -1).all()
+    assert summary['SG']['clusters'] == 0 and pd.isna(summary['SG']['silhouette'])
+    # Baris tanpa region membentuk partisinya sendiri
+    missing = next(row for segment, row in summary.items() if pd.isna(segment))
+    assert missing['rows'] == 30 and missing['clusters'] == 2
+    assert [row['rows'] for row in result['summary']] == sorted((row['rows'] for row in result['summary']),
+                                                               reverse=True)
+
+
+def test_profiles_cover_only_fitted_partitions(regions):
+    result = run_segmented_clustering(regions, 'Region', 2, FEATURES, engine='kmeans', n_jobs=1)
+    profiles = pd.DataFrame(result['profiles'])
+
+    assert 'SG' not in set(profiles['Region'])
+    assert profiles['size'].sum() == (result['labels'] >= 0).sum()
+
+
+def test_too_many_partitions_are_rejected(regions, monkeypatch):
+    monkeypatch.setattr(segments, 'MAX_PARTITIONS', 3)
+    with pytest.raises(ValueError):
+        run_segmented_clustering(regions, 'Region', 2, FEATURES)
+
+
+def test_segment_frame_labels():
+    df = pd.DataFrame({'Region': ['ID', 'US', 'SG'], 'Likes': [1, 2, 3]})
+    frame = segment_frame(df, {'segment_col': 'Region', 'labels': np.array([0, 1, -1])})
+
+    assert frame['Cluster'].tolist() == [0, 1, -1]
+    assert frame[SEGMENT_CLUSTER_COL].tolist() == ['ID / 0', 'US / 1', None]
+    assert 'Cluster' not in df.columns
@@ -0,0 +1,115 @@
+import threading
+
+import numpy as np
+import pytest
+
+from utils import service
+from utils.engines import nearest_centers
+from utils.service import AssignBatcher, ServiceError, _parse_k, _rows_to_matrix
+
+FEATURES = ['Likes', 'Views']
+
+
+def _model(result_key, centers):
+    return {
+        'result_key': result_key,
+        'features': FEATURES,
+        'medians': np.zeros(len(FEATURES)),
+        'offset': np.zeros(len(FEATURES)),
+        'scale': np.ones(len(FEATURES)),
+        'reduction': None,
+        'centers': np.asarray(centers, dtype=np.float64),
+    }
+
+
+def test_batcher_answers_every_request_with_its_own_rows():
+    models = [_model('a' * 16, [[0, 0], [10, 10]]), _model('b' * 16, [[0, 10], [10, 0], [5, 5]])]
+    rng = np.random.default_rng(0)
+    requests = [(models[i % 2], rng.uniform(0, 10, (i + 1, 2))) for i in range(12)]
+
+    # Jendela lebar supaya semua request pasti jatuh di batch yang sama
+    batcher = AssignBatcher(window=0.2)
+    try:
+        futures = [None] * len(requests)
+
+        def submit(i):
+            futures[i] = batcher.submit(*requests[i])
+
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(len(requests))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for (model, X), future in zip(requests, futures):
+            labels, distances = future.result(timeout=5)
+            expected_labels, expected_sq = nearest_centers(X, model['centers'])
+            np.testing.assert_array_equal(labels, expected_labels)
+            np.testing.assert_allclose(distances, np.sqrt(expected_sq))
+    finally:
+        batcher.close()
+
+
+def test_batcher_reports_errors_per_request():
+    batcher = AssignBatcher(window=0.01)
+    try:
+        future = batcher.submit(_model('c' * 16, [[0, 0], [1, 1]]), np.ones((3, 5)))
+        with pytest.raises(ValueError):
+            future.result(timeout=5)
+        ok = batcher.submit(_model('c' * 16, [[0, 0], [1, 1]]), np.ones((2, 2)))
+        np.testing.assert_array_equal(ok.result(timeout=5)[0], [1, 1])
+    finally:
+        batcher.close()
+
+
+@pytest.mark.parametrize('value', ['4', 4.0, True, 1, 0, 99, [3]])
+def test_parse_k_rejects_bad_values(value):
+    with pytest.raises(ServiceError) as excinfo:
+        _parse_k(value, 3)
+    assert excinfo.value.status == 400
+
+
+def test_parse_k_defaults_and_accepts_ints():
+    assert _parse_k(None, 3) == 3
+    assert _parse_k(2, 3) == 2
+
+
+def test_rows_may_mix_lists_and_objects():
+    X = _rows_to_matrix([[1, 2], {'Views': 4, 'Likes': 3}, (5, None), {'Likes': 6}], FEATURES)
+    np.testing.assert_array_equal(X[:3, 0], [1, 3, 5])
+    np.testing.assert_array_equal(X[:2, 1], [2, 4])
+    assert np.isnan(X[2, 1]) and np.isnan(X[3, 1])
+
+
+@pytest.mark.parametrize('rows', [[[1, 2], [1]], [[1, 2], 'x'], [[1, 2], {'Likes': 'banyak'}]])
+def test_bad_rows_are_client_errors(rows):
+    with pytest.raises(ServiceError) as excinfo:
+        _rows_to_matrix(rows, FEATURES)
+    assert excinfo.value.status == 400
+
+
+def test_dataset_loaded_once_per_source(monkeypatch, frame):
+    from utils import data_loader
+
+    source = ['data.csv', (('data.csv', 1, 1),), ()]
+    loads = []
+
+    def load_dataset():
+        loads.append(1)
+        return frame.copy(), 0
+
+    monkeypatch.setattr(service, '_dataset', {'source': None, 'df': None})
+    monkeypatch.setattr(data_loader, 'dataset_source', lambda: tuple(source))
+    monkeypatch.setattr(data_loader, 'load_dataset', load_dataset)
+
+    first = service._load_dataset()
+    assert service._load_dataset() is first
+    with_derived = service._dataset_with(['Likes', 'Likes_per_View'])
+    assert 'Likes_per_View' in with_derived and 'Likes_per_View' not in first
+    assert service._load_dataset() is with_derived
+    assert len(loads) == 1
+
+    # File berubah -> signature baru -> dimuat ulang
+    source[1] = (('data.csv', 2, 2),)
+    assert service._load_dataset() is not with_derived
+    assert len(loads) == 2
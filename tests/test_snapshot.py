@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from conftest import FEATURES
+from utils.clustering import perform_clustering
+from utils.snapshot import load_snapshot, save_snapshot, snapshot_path
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('TIKTOK_SNAPSHOT_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_snapshot_round_trip(frame, snapshot_dir):
+    result = perform_clustering(frame, 3, FEATURES, enable_caching=False)
+
+    key = save_snapshot(result, frame, FEATURES, 3)
+    restored = load_snapshot(key)['result']
+
+    assert (snapshot_dir / f"{key}.npz").exists()
+    np.testing.assert_array_equal(restored['clusters'], result['clusters'])
+    np.testing.assert_allclose(restored['centers_original'], result['centers_original'])
+    np.testing.assert_array_equal(restored['center_distance'], result['center_distance'])
+    assert restored['restored_from_snapshot']
+
+
+def test_missing_or_invalid_snapshot():
+    assert load_snapshot('0' * 16) is None
+    with pytest.raises(ValueError):
+        snapshot_path('../etc/passwd')
+
+
+def test_snapshot_keeps_only_payloads_of_this_result(frame):
+    from utils.cache import get_dataset_key, payload_cache
+
+    result = perform_clustering(frame, 3, FEATURES, enable_caching=False)
+    rk, dk = result['result_key'], get_dataset_key(frame)
+    other_features = tuple(FEATURES[:2])
+    entries = {
+        ('overview', rk, dk, tuple(FEATURES)): True,
+        ('categorical_cardinality', dk, 'ContentType'): True,
+        ('segments', dk, 'ContentType', tuple(FEATURES), 3, 'auto'): True,
+        ('windows', dk, 'PostDate', 'M', tuple(FEATURES), 3, 'auto'): True,
+        ('overview', 'f' * 16, dk, tuple(FEATURES)): False,
+        ('segments', dk, 'ContentType', tuple(FEATURES), 4, 'auto'): False,
+        ('windows', dk, 'PostDate', 'M', other_features, 3, 'auto'): False,
+        ('stability_scratch', dk): False,
+    }
+    for key in entries:
+        payload_cache.set(key, {'rows': 1})
+
+    key = save_snapshot(result, frame, FEATURES, 3)
+    saved = {tuple(entry) for entry, _ in load_snapshot(key)['payloads']}
+
+    assert saved & set(entries) == {key for key, expected in entries.items() if expected}
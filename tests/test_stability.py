@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from utils.stability import _aligned_share, _jaccard, run_stability
+
+
+@pytest.fixture
+def separated():
+    """Tiga kelompok yang jauh terpisah + centroid KMeans yang sudah konvergen"""
+    rng = np.random.default_rng(2)
+    centers = np.array([[0.0, 0.0], [20.0, 0.0], [0.0, 20.0]])
+    labels = np.repeat(np.arange(3), 200)
+    features = centers[labels] + rng.normal(scale=0.5, size=(len(labels), 2))
+    fitted = np.array([features[labels == k].mean(axis=0) for k in range(3)])
+    return features, labels, fitted
+
+
+def test_identical_refits_have_jaccard_one(separated):
+    stability = run_stability(*separated, n_bootstraps=5, n_jobs=1)
+
+    np.testing.assert_allclose(stability['jaccard_mean'], 1.0)
+    np.testing.assert_allclose(stability['jaccard_std'], 0.0)
+    np.testing.assert_allclose(stability['co_assignment'], np.eye(3))
+
+
+def test_jaccard_ignores_label_permutation():
+    contingency = np.array([[0, 50, 0], [0, 0, 30], [20, 0, 0]])
+    np.testing.assert_allclose(_jaccard(contingency), 1.0)
+    np.testing.assert_allclose(_aligned_share(contingency), np.eye(3))
+
+
+def test_split_cluster_scores_below_one():
+    # Cluster 0 terbelah dua rata di refit
+    contingency = np.array([[25, 25, 0], [0, 0, 40], [0, 0, 0]])
+    jaccard = _jaccard(contingency)
+    assert jaccard[0] == pytest.approx(0.5)
+    assert jaccard[1] == pytest.approx(1.0)
+
+
+def test_parallel_workers_match_serial(separated):
+    serial = run_stability(*separated, n_bootstraps=4, n_jobs=1)
+    parallel = run_stability(*separated, n_bootstraps=4, n_jobs=2)
+    np.testing.assert_allclose(parallel['jaccard_mean'], serial['jaccard_mean'])
+    np.testing.assert_allclose(parallel['co_assignment'], serial['co_assignment'])
@@ -0,0 +1,26 @@
+import json
+
+import numpy as np
+import pytest
+
+from utils import templates
+from utils.templates import DATA_SLOT, get_template, render_template
+
+
+def test_render_fills_the_single_data_slot():
+    template = get_template('overview')
+    data = {'clusters': np.arange(3), 'label': 'a</script><b>'}
+
+    html = render_template('overview', data)
+
+    assert html.startswith(template['head']) and html.endswith(template['tail'])
+    payload = html[len(template['head']):len(html) - len(template['tail'])]
+    assert '</script>' not in payload
+    assert json.loads(payload.replace('<\\/', '</')) == {'clusters': [0, 1, 2], 'label': 'a</script><b>'}
+
+
+def test_template_needs_exactly_one_slot(tmp_path, monkeypatch):
+    (tmp_path / 'twice.html').write_text(f"<script>{DATA_SLOT}{DATA_SLOT}</script>")
+    monkeypatch.setattr(templates, 'TEMPLATE_DIR', str(tmp_path))
+    with pytest.raises(ValueError):
+        get_template('twice')
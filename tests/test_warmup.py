@@ -0,0 +1,40 @@
+import threading
+
+import pytest
+
+import utils.warmup as warmup
+
+
+@pytest.fixture(autouse=True)
+def reset_thread(monkeypatch):
+    monkeypatch.setattr(warmup, '_warmup_thread', None)
+
+
+def test_start_warmup_runs_once_per_process(monkeypatch):
+    calls = []
+    release = threading.Event()
+
+    def run_warmup():
+        calls.append(1)
+        release.wait(5)
+        return {'load_data': 0.0}
+
+    monkeypatch.setattr(warmup, 'run_warmup', run_warmup)
+    first = warmup.start_warmup()
+    second = warmup.start_warmup()
+    release.set()
+    warmup.wait_for_warmup(timeout=5)
+
+    assert first is second
+    assert not first.is_alive()
+    assert calls == [1]
+
+
+def test_wait_for_warmup_without_thread_returns_immediately():
+    warmup.wait_for_warmup(timeout=0.01)
+
+
+def test_parse_flag_options():
+    flags, script_args = warmup._parse_flag_options(['--server.port', '8502', '--theme.base=dark', 'extra'])
+    assert flags == {'server_port': '8502', 'theme_base': 'dark'}
+    assert script_args == ['extra']
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cache import set_dataset_key
+from utils.windows import _align, detect_date_columns, run_windowed_clustering
+
+FEATURES = ['Likes', 'Views']
+
+
+def _monthly(seed=0, small_month=None):
+    """Tiga kelompok per bulan (Jan-Apr) yang bergeser pelan; grup asli di kolom 'group'"""
+    rng = np.random.default_rng(seed)
+    base = np.array([[0.0, 0.0], [30.0, 0.0], [0.0, 30.0]])
+    parts = []
+    for month in range(1, 5):
+        n_rows = 12 if month == small_month else 300
+        group = rng.integers(0, 3, n_rows)
+        values = base[group] + month * 1.5 + rng.normal(size=(n_rows, 2))
+        days = rng.integers(1, 28, n_rows)
+        parts.append(pd.DataFrame({
+            'Likes': values[:, 0], 'Views': values[:, 1], 'group': group,
+            'PostDate': [f'2024-{month:02d}-{day:02d}' for day in days],
+        }))
+    df = pd.concat(parts, ignore_index=True).sample(frac=1.0, random_state=seed).reset_index(drop=True)
+    return set_dataset_key(df, f'windows-{seed}-{small_month}')
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_align_recovers_a_shuffled_order(seed):
+    rng = np.random.default_rng(seed)
+    previous = rng.normal(scale=10, size=(6, 3))
+    permutation = rng.permutation(6)
+    centers = previous[permutation] + rng.normal(scale=0.1, size=(6, 3))
+
+    order = _align(previous, centers)
+
+    np.testing.assert_array_equal(permutation[order], np.arange(6))
+    np.testing.assert_allclose(centers[order], previous, atol=0.5)
+
+
+def test_cluster_ids_stay_with_their_group_across_windows():
+    df = _monthly()
+    result = run_windowed_clustering(df, 'PostDate', 3, FEATURES, engine='kmeans')
+
+    months = pd.to_datetime(df['PostDate']).dt.month
+    for group in range(3):
+        assigned = pd.Series(result['labels'][df['group'] == group]).groupby(months[df['group'] == group].values)
+        # Satu ID per grup, dan ID-nya sama di setiap bulan
+        assert assigned.nunique().eq(1).all()
+        assert assigned.first().nunique() == 1
+
+    assert [row['window'] for row in result['windows']] == ['2024-01', '2024-02', '2024-03', '2024-04']
+    assert all(row['moved'] == 0 for row in result['windows'][1:])
+    assert result['migrations'] == []
+
+
+def test_small_window_takes_nearest_previous_center():
+    df = _monthly(seed=1, small_month=3)
+    result = run_windowed_clustering(df, 'PostDate', 3, FEATURES, engine='kmeans')
+    march = result['windows'][2]
+
+    assert march['rows'] == 12 and not march['fitted'] and march['iterations'] is None
+    months = pd.to_datetime(df['PostDate']).dt.month
+    for group in range(3):
+        assert pd.Series(result['labels'][df['group'] == group]).nunique() == 1
+    assert (result['labels'][months == 3] >= 0).all()
+
+
+def test_rows_without_a_date_are_unlabelled():
+    df = _monthly(seed=2).copy()
+    df.loc[:9, 'PostDate'] = None
+    df = set_dataset_key(df, 'windows-missing-dates')
+
+    result = run_windowed_clustering(df, 'PostDate', 3, FEATURES, engine='kmeans')
+
+    assert (result['labels'][:10] == -1).all()
+    assert (result['labels'][10:] >= 0).all()
+    assert sum(row['rows'] for row in result['windows']) == len(df) - 10
+
+
+def test_date_columns_are_detected_from_text():
+    df = _monthly(seed=3)
+    df['VideoID'] = np.arange(len(df)).astype(str)
+    df['Posted'] = pd.to_datetime(df['PostDate'])
+    assert detect_date_columns(set_dataset_key(df, 'windows-detect')) == ['Posted', 'PostDate']
+
+
+def test_invalid_windows_are_rejected():
+    df = _monthly(seed=4)
+    with pytest.raises(ValueError):
+        run_windowed_clustering(df, 'PostDate', 3, FEATURES, freq='D')
+    with pytest.raises(ValueError):
+        run_windowed_clustering(set_dataset_key(df.assign(PostDate=None), 'windows-no-dates'),
+                                'PostDate', 3, FEATURES)
@@ -0,0 +1,122 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+DATASET_KEY_ATTR = 'dataset_key'
+DATASET_ROWS_ATTR = 'dataset_rows'
+
+
+def _row_fingerprint(df: pd.DataFrame) -> str:
+    """Identitas baris frame: O(1) untuk RangeIndex, hash index untuk index lain"""
+    index = df.index
+    if isinstance(index, pd.RangeIndex):
+        return f"{index.start}:{index.stop}:{index.step}"
+    digest = hashlib.sha1(pd.util.hash_pandas_object(index, index=False).values.tobytes()).hexdigest()
+    return f"{len(index)}#{digest[:12]}"
+
+
+def set_dataset_key(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Tandai DataFrame dengan identitas dataset (ikut terbawa lewat copy/pickle) plus sidik baris"""
+    df.attrs[DATASET_KEY_ATTR] = key
+    df.attrs[DATASET_ROWS_ATTR] = _row_fingerprint(df)
+    return df
+
+
+def get_dataset_key(df: pd.DataFrame) -> str:
+    """
+    Identitas dataset untuk cache per-dataset.
+
+    `load_data` sudah menandai frame dengan path + ukuran + mtime file. Untuk frame
+    lain (demo, upload) key dihitung sekali dari isi data lalu disimpan di attrs.
+
+    attrs ikut terbawa ke frame turunan (.copy, .loc/.iloc, mask boolean, sample), jadi
+    key hanya berlaku selama sidik baris sama dengan saat ditandai. Subset / sampel
+    mendapat key sendiri (key induk + sidik barisnya) supaya tidak memakai kolom dan
+    statistik cache milik dataset penuh.
+    """
+    key = df.attrs.get(DATASET_KEY_ATTR)
+    if key:
+        fingerprint = _row_fingerprint(df)
+        stamped = df.attrs.setdefault(DATASET_ROWS_ATTR, fingerprint)
+        if stamped == fingerprint:
+            return key
+        return set_dataset_key(df, f"{key}[{fingerprint}]").attrs[DATASET_KEY_ATTR]
+
+    hasher = hashlib.sha1()
+    hasher.update(repr((df.shape, list(df.columns))).encode())
+    hasher.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return set_dataset_key(df, f"frame:{hasher.hexdigest()[:16]}").attrs[DATASET_KEY_ATTR]
+
+
+def make_result_key(dataset_key: str, features_cols: list, n_clusters: int, **options) -> str:
+    """Key konfigurasi clustering (dataset, features, K, opsi lain)"""
+    parts = [dataset_key, '|'.join(features_cols), str(n_clusters)]
+    parts += [f"{name}={options[name]}" for name in sorted(options)]
+    return hashlib.sha1('\n'.join(parts).encode()).hexdigest()[:16]
+
+
+def get_result_key(result: dict) -> str:
+    """Key hasil clustering; hasil tanpa key (fallback) di-hash dari labelnya"""
+    key = result.get('result_key')
+    if not key:
+        labels = np.ascontiguousarray(result.get('clusters', []))
+        key = f"labels:{hashlib.sha1(labels.tobytes()).hexdigest()[:16]}"
+        result['result_key'] = key
+    return key
+
+
+class LRUStore:
+    """Cache LRU thread-safe sederhana (dipakai bersama oleh semua session Streamlit)"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+        value = compute()
+        self.set(key, value)
+        return value
+
+    def items(self) -> list:
+        """Salinan (key, value) saat ini, dari yang paling lama dipakai"""
+        with self._lock:
+            return list(self._data.items())
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Payload tab yang sudah disiapkan, key: (tab, result_key, ...)
+payload_cache = LRUStore(max_entries=512)
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import logging
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Di atas jumlah baris ini distinct count diestimasi dengan HyperLogLog
+EXACT_DISTINCT_LIMIT = 50_000
+HLL_PRECISION = 12
+
+# Kolom dianggap ID/teks bebas jika hampir setiap baris unik
+ID_DISTINCT_RATIO = 0.5
+ID_MIN_DISTINCT = 50
+
+DEFAULT_TOP_N = 10
+OTHER_LABEL = 'Other'
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """bit_length untuk array uint64 (dipecah 32-bit supaya exact di float64)"""
+    high = (values >> np.uint64(32)).astype('float64')
+    low = (values & np.uint64(0xFFFFFFFF)).astype('float64')
+    with np.errstate(divide='ignore'):
+        high_bits = np.where(high > 0, np.floor(np.log2(high)) + 1 + 32, 0)
+        low_bits = np.where(low > 0, np.floor(np.log2(low)) + 1, 0)
+    return np.where(high > 0, high_bits, low_bits).astype('int64')
+
+
+def hll_distinct(series: pd.Series, precision: int = HLL_PRECISION) -> float:
+    """Estimasi distinct count HyperLogLog (memori register tetap 2^precision)"""
+    values = series.dropna()
+    if len(values) == 0:
+        return 0.0
+
+    hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype='uint64')
+    m = 1 << precision
+    register_idx = (hashes >> np.uint64(64 - precision)).astype('int64')
+    remaining = hashes << np.uint64(precision)
+    # Posisi bit 1 pertama (rank) dari sisa bit hash
+    rank = np.where(remaining > 0, 64 - _bit_length(remaining) + 1, 64 - precision + 1)
+
+    registers = np.zeros(m, dtype='int64')
+    max_rank = pd.Series(rank).groupby(register_idx).max()
+    registers[max_rank.index.to_numpy()] = max_rank.to_numpy()
+
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.power(2.0, -registers))
+
+    # Koreksi range kecil (linear counting)
+    empty_registers = int((registers == 0).sum())
+    if estimate <= 2.5 * m and empty_registers > 0:
+        estimate = m * np.log(m / empty_registers)
+    return float(estimate)
+
+
+def estimate_distinct(series: pd.Series, exact_limit: int = EXACT_DISTINCT_LIMIT) -> Tuple[int, bool]:
+    """
+    Distinct count: exact untuk kolom kecil, HyperLogLog (satu scan, memori tetap)
+    untuk kolom besar. Estimasi tidak pernah melebihi jumlah nilai non-null.
+    """
+    if len(series) <= exact_limit:
+        return int(series.nunique()), True
+
+    estimate = int(round(hll_distinct(series)))
+    return min(estimate, int(series.notna().sum())), False
+
+
+def profile_cardinality(df: pd.DataFrame, columns: List[str], top_n: int = DEFAULT_TOP_N) -> Dict[str, Dict]:
+    """
+    Profil kardinalitas per kolom kategorikal: estimasi distinct, rasio unik,
+    apakah kolom mirip ID (di-skip) dan apakah perlu bucketing top-N + "Other".
+    """
+    profiles = {}
+    for col in columns:
+        n_non_null = int(df[col].notna().sum())
+        distinct, exact = estimate_distinct(df[col])
+        ratio = distinct / n_non_null if n_non_null > 0 else 0.0
+        id_like = distinct > ID_MIN_DISTINCT and ratio >= ID_DISTINCT_RATIO
+
+        profiles[col] = {
+            'distinct': distinct,
+            'exact': exact,
+            'ratio': float(min(ratio, 1.0)),
+            'id_like': id_like,
+            'bucketed': not id_like and distinct > top_n,
+        }
+        if id_like:
+            logger.info(f"Kolom {col} dilewati dari profiling kategorikal (~{distinct:,} nilai unik)")
+
+    return profiles
+
+
+def bucket_top_n(series: pd.Series, top_n: int = DEFAULT_TOP_N, other_label: str = OTHER_LABEL) -> pd.Series:
+    """Pertahankan top-N kategori terbanyak, sisanya digabung jadi other_label"""
+    top_values = series.value_counts().index[:top_n]
+    keep = series.isin(top_values) | series.isna()
+    return series.astype(object).where(keep, other_label)
@@ -1,21 +1,184 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional
-from sklearn.decomposition import PCA
-from sklearn.cluster import KMeans, MiniBatchKMeans
-from sklearn.preprocessing import StandardScaler, RobustScaler
-from sklearn.metrics import silhouette_score, davies_bouldin_score
+from typing import Dict, Any, Optional, List
 import logging
 
+from utils.cache import LRUStore, get_dataset_key, make_result_key
+from utils.engines import DEFAULT_ENGINE, assignment_scores, fit_engine
+from utils.reduction import DEFAULT_REDUCTION, reduce_features, resolve_reduction
+
 logger = logging.getLogger(__name__)
 
+# Preprocessing per kolom di-cache per (dataset, kolom) supaya mengganti
+# kombinasi features cukup menggabungkan kolom yang sudah distandarisasi
+_column_cache = LRUStore(max_entries=256)
+
+# Hasil clustering sukses per result_key (dataset, features, K); diisi juga oleh warm-up
+_result_cache = LRUStore(max_entries=32)
+
+# Membership soft (N x K float32) hanya disimpan sampai ukuran ini (~20 MB)
+MEMBERSHIP_MAX_CELLS = 5_000_000
+
+
+def _preprocess_column(values: np.ndarray) -> Dict[str, Any]:
+    """Imputasi median + statistik scaler untuk satu kolom"""
+    imputed = np.array(values, dtype='float64', copy=True)
+    n_missing = int(np.isnan(imputed).sum())
+    invalid = ~np.isfinite(imputed)
+    
+    median = float(np.median(imputed[~invalid])) if (~invalid).any() else 0.0
+    if invalid.any():
+        imputed[invalid] = median
+    
+    mean = float(imputed.mean())
+    var = float(imputed.var())
+    std = float(np.sqrt(var))
+    q1, q3 = np.percentile(imputed, [25, 75])
+    iqr = float(q3 - q1)
+    
+    # Sama seperti StandardScaler: scale 1 untuk kolom tanpa variasi
+    scale = std if std > 0 and np.isfinite(std) else 1.0
+    standardized = (imputed - mean) / scale
+    
+    imputed.flags.writeable = False
+    standardized.flags.writeable = False
+    
+    return {
+        'n_samples': len(imputed),
+        'n_missing': n_missing,
+        'n_invalid': int(invalid.sum()),
+        'median': median,
+        'mean': mean,
+        'var': var,
+        'scale': scale,
+        'iqr': iqr if iqr > 0 else 1.0,
+        'imputed': imputed,
+        'standardized': standardized,
+        'standard_ok': bool(np.isfinite(standardized).all()),
+    }
+
+
+def seed_result_cache(result: Dict[str, Any]) -> None:
+    """Masukkan hasil yang sudah jadi (mis. dari snapshot) ke cache hasil clustering"""
+    _result_cache.set(result['result_key'], result)
+
+
+def get_cached_result(result_key: str) -> Optional[Dict[str, Any]]:
+    return _result_cache.get(result_key)
+
+
+def cached_results() -> list:
+    """(result_key, hasil) yang ada di cache hasil clustering"""
+    return _result_cache.items()
+
+
+def clustering_result_key(df: pd.DataFrame, features_cols: list, n_clusters: int,
+                          engine: str = DEFAULT_ENGINE, preview: bool = False,
+                          reduction: str = DEFAULT_REDUCTION) -> str:
+    """result_key yang dipakai perform_clustering untuk konfigurasi ini"""
+    # Engine default / tanpa reduksi tidak ikut key supaya key lama (snapshot) tetap berlaku
+    options = {'engine': engine} if engine != DEFAULT_ENGINE else {}
+    reduction = resolve_reduction(reduction, len(features_cols))
+    if reduction != 'none':
+        options['reduction'] = reduction
+    if preview:
+        options['stage'] = 'preview'
+    return make_result_key(get_dataset_key(df), features_cols, n_clusters, **options)
+
+
+def get_column_stats(df: pd.DataFrame, col: str) -> Dict[str, Any]:
+    """Statistik preprocessing satu kolom (dihitung sekali per dataset)"""
+    return _column_cache.get_or_compute(
+        (get_dataset_key(df), col),
+        lambda: _preprocess_column(df[col].to_numpy())
+    )
+
+
+def _build_scaler(stats: List[Dict[str, Any]], features_cols: list, robust: bool):
+    """Bangun scaler sklearn yang sudah 'fitted' dari statistik per kolom"""
+    from sklearn.preprocessing import StandardScaler, RobustScaler
+    
+    if robust:
+        scaler = RobustScaler()
+        scaler.center_ = np.array([s['median'] for s in stats])
+        scaler.scale_ = np.array([s['iqr'] for s in stats])
+    else:
+        scaler = StandardScaler()
+        scaler.mean_ = np.array([s['mean'] for s in stats])
+        scaler.var_ = np.array([s['var'] for s in stats])
+        scaler.scale_ = np.array([s['scale'] for s in stats])
+        scaler.n_samples_seen_ = stats[0]['n_samples']
+    scaler.n_features_in_ = len(features_cols)
+    scaler.feature_names_in_ = np.asarray(features_cols, dtype=object)
+    return scaler
+
+
+def scale_features(df: pd.DataFrame, features_cols: list):
+    """
+    Susun matrix ter-standarisasi dari cache per kolom.
+    Fallback ke RobustScaler (median/IQR) jika standardisasi tidak finite.
+    """
+    stats = [get_column_stats(df, col) for col in features_cols]
+    
+    if all(s['standard_ok'] for s in stats):
+        scaled_features = np.column_stack([s['standardized'] for s in stats])
+        return _build_scaler(stats, features_cols, robust=False), scaled_features
+    
+    scaled_features = np.column_stack([
+        (s['imputed'] - s['median']) / s['iqr'] for s in stats
+    ])
+    if not np.isfinite(scaled_features).all():
+        raise ValueError("Kedua scaler gagal: nilai tidak finite setelah scaling")
+    return _build_scaler(stats, features_cols, robust=True), scaled_features
+
+def result_matrix(df: pd.DataFrame, result: Dict[str, Any], features_cols: list) -> np.ndarray:
+    """
+    Matrix tempat model di-fit (ter-scale, tereduksi jika ada reduksi); dihitung
+    ulang dari cache kolom untuk hasil tanpa scaled_features (mis. dari snapshot)
+    """
+    scaled = result.get('scaled_features')
+    if scaled is None:
+        from utils.reduction import apply_reduction
+
+        _, scaled = scale_features(df, features_cols)
+        if result.get('reduction') is not None:
+            scaled = apply_reduction(scaled, result['reduction'])
+    return scaled
+
+
+def result_centers(result: Dict[str, Any], matrix: np.ndarray) -> np.ndarray:
+    """Centroid di ruang result_matrix; fallback ke mean per cluster"""
+    if result.get('kmeans') is not None:
+        return result['kmeans'].cluster_centers_
+    if result.get('cluster_centers') is not None:
+        return np.asarray(result['cluster_centers'])
+    labels = np.asarray(result['clusters'])
+    return np.vstack([matrix[labels == c].mean(axis=0) for c in np.unique(labels)])
+
+
 def perform_clustering(df: pd.DataFrame, n_clusters: int, features_cols: list,
                       use_fast_pca: bool = True, enable_caching: bool = True,
+                      engine: str = DEFAULT_ENGINE, fit_indices: Optional[np.ndarray] = None,
+                      init_centers: Optional[np.ndarray] = None, reduction: str = DEFAULT_REDUCTION,
                       **kwargs) -> Optional[Dict[str, Any]]:
     """
     Perform K-Means clustering dengan error handling komprehensif
+
+    fit_indices: fit hanya pada baris ini lalu semua baris di-assign ke centroid
+    terdekat (hasil preview, key terpisah). init_centers: warm start dari centroid
+    yang sudah ada (mis. centroid preview). reduction: metode reduksi dimensi
+    (utils.reduction) antara scaling dan fit; centroid & metrics ada di ruang tereduksi.
     """
-    logger.info(f"Memulai clustering dengan K={n_clusters}, features={len(features_cols)}, n_samples={len(df)}")
+    preview = fit_indices is not None
+    result_key = clustering_result_key(df, features_cols, n_clusters, engine, preview=preview,
+                                       reduction=reduction)
+    if enable_caching:
+        cached = _result_cache.get(result_key)
+        if cached is not None:
+            logger.info(f"Hasil clustering diambil dari cache (K={n_clusters}, key {result_key})")
+            return cached
+    
+    logger.info(f"Memulai clustering dengan K={n_clusters}, engine={engine}, features={len(features_cols)}, n_samples={len(df)}")
     
     validation_errors = []
     validation_warnings = []
@@ -54,33 +217,21 @@ def perform_clustering(df: pd.DataFrame, n_clusters: int, features_cols: list,
             if non_numeric:
                 validation_errors.append(f"Feature non-numerik: {non_numeric}")
         
-        # Cek missing values - PERBAIKI: gunakan .isna() bukan .isnull()
-        if features_cols:
-            # Filter hanya features yang ada
-            existing_features = [col for col in features_cols if col in df.columns]
-            if existing_features:
-                missing_counts = df[existing_features].isna().sum()
-                total_missing = missing_counts.sum()
-                if total_missing > 0:
-                    missing_pct = (total_missing / (len(df) * len(existing_features))) * 100
-                    if missing_pct > 30:
-                        validation_errors.append(f"Missing values terlalu tinggi ({missing_pct:.1f}%)")
-        
-        # Cek zero variance - PERBAIKI: gunakan .var() dengan ddof=0
-        if features_cols and len(df) > 1:
-            existing_features = [col for col in features_cols if col in df.columns]
-            if existing_features:
-                variances = df[existing_features].var(ddof=0)
-                # Gunakan .tolist() untuk menghindari array boolean
-                zero_var_mask = variances == 0
-                if isinstance(zero_var_mask, pd.Series):
-                    zero_var_features = zero_var_mask[zero_var_mask].index.tolist()
-                else:
-                    # Jika variances adalah scalar
-                    zero_var_features = [] if variances != 0 else existing_features
-                
-                if zero_var_features:
-                    validation_errors.append(f"Feature zero variance: {zero_var_features}")
+        # Cek missing values & zero variance dari statistik kolom yang di-cache
+        existing_features = [col for col in features_cols if col in df.columns
+                             and pd.api.types.is_numeric_dtype(df[col])]
+        if existing_features and len(df) > 1:
+            column_stats = {col: get_column_stats(df, col) for col in existing_features}
+            
+            total_missing = sum(stats['n_missing'] for stats in column_stats.values())
+            if total_missing > 0:
+                missing_pct = (total_missing / (len(df) * len(existing_features))) * 100
+                if missing_pct > 30:
+                    validation_errors.append(f"Missing values terlalu tinggi ({missing_pct:.1f}%)")
+            
+            zero_var_features = [col for col, stats in column_stats.items() if stats['var'] == 0]
+            if zero_var_features:
+                validation_errors.append(f"Feature zero variance: {zero_var_features}")
         
         if validation_errors:
             error_msg = " | ".join(validation_errors)
@@ -88,50 +239,44 @@ def perform_clustering(df: pd.DataFrame, n_clusters: int, features_cols: list,
         
         logger.info(f"Semua validasi passed. Warnings: {validation_warnings}")
         
-        # ==================== PREPROCESSING ====================
-        features = df[features_cols].copy()
-        
-        # Handle missing values
-        if features.isnull().any().any():
-            features = features.fillna(features.median())
-        
-        # Handle infinite values
-        if not np.isfinite(features.values).all():
-            features = features.replace([np.inf, -np.inf], np.nan)
-            features = features.fillna(features.median())
+        # ==================== PREPROCESSING & STANDARDIZATION ====================
+        # Imputasi, cek infinite dan scaling sudah di-cache per kolom
+        scaler, scaled_features = scale_features(df, features_cols)
         
-        # ==================== STANDARDIZATION ====================
-        scaler = None
-        scaled_features = None
-        
-        try:
-            scaler = StandardScaler()
-            scaled_features = scaler.fit_transform(features)
-        except:
-            try:
-                scaler = RobustScaler()
-                scaled_features = scaler.fit_transform(features)
-            except Exception as e:
-                raise ValueError(f"Kedua scaler gagal: {str(e)}")
+        # ==================== REDUKSI DIMENSI (opsional) ====================
+        reducer = None
+        reduction = resolve_reduction(reduction, len(features_cols))
+        if reduction != 'none':
+            scaler_kind = 'robust' if hasattr(scaler, 'center_') else 'standard'
+            reducer, scaled_features = reduce_features(
+                (get_dataset_key(df), tuple(features_cols), scaler_kind), scaled_features, reduction
+            )
         
         # ==================== CLUSTERING ====================
-        if len(scaled_features) > 10000:
-            kmeans = MiniBatchKMeans(
-                n_clusters=n_clusters,
-                random_state=42,
-                batch_size=1000,
-                n_init=3,
-                max_iter=300
-            )
+        # sklearn di-import saat dibutuhkan: hasil dari cache tidak perlu memuatnya
+        from sklearn.decomposition import PCA
+        from sklearn.metrics import silhouette_score, davies_bouldin_score
+        
+        # Engine dari registry (utils.engines); preprocessing & metrics sama untuk semua
+        if preview:
+            kmeans, _ = fit_engine(engine, scaled_features[fit_indices], n_clusters,
+                                   random_state=42, init=init_centers)
         else:
-            kmeans = KMeans(
-                n_clusters=n_clusters,
-                random_state=42,
-                n_init=10,
-                max_iter=300
-            )
+            kmeans, clusters = fit_engine(engine, scaled_features, n_clusters,
+                                          random_state=42, init=init_centers)
         
-        clusters = kmeans.fit_predict(scaled_features)
+        # ==================== JARAK & MEMBERSHIP ====================
+        # Satu pass: jarak ke centroid, margin ke centroid kedua, membership soft
+        # (temperatur = rata-rata kuadrat jarak di baris yang di-fit). Preview
+        # sekaligus meng-assign semua baris ke centroid sampel.
+        temperature = None
+        if len(scaled_features) * n_clusters <= MEMBERSHIP_MAX_CELLS:
+            n_fit = len(fit_indices) if preview else len(scaled_features)
+            temperature = max(float(kmeans.inertia_) / n_fit, 1e-12)
+        scores = assignment_scores(scaled_features, kmeans.cluster_centers_,
+                                   labels=None if preview else clusters, temperature=temperature)
+        if preview:
+            clusters, kmeans.inertia_ = scores['labels'], scores['inertia']
         unique_clusters = np.unique(clusters)
         
         if len(unique_clusters) != n_clusters:
@@ -178,6 +323,7 @@ def perform_clustering(df: pd.DataFrame, n_clusters: int, features_cols: list,
         # ==================== PCA VISUALIZATION ====================
         pca_result = None
         pca_explained = None
+        pca = None
         
         try:
             if len(scaled_features) > 5000:
@@ -200,6 +346,13 @@ def perform_clustering(df: pd.DataFrame, n_clusters: int, features_cols: list,
             validation_warnings.append("PCA visualization unavailable")
             # validation_warnings.append("PCA menggunakan data dummy")
         
+        # Centroid dalam skala asli; dengan reduksi dimensi pakai mean per cluster
+        if reducer is None:
+            centers_original = scaler.inverse_transform(kmeans.cluster_centers_)
+        else:
+            centers_original = (df[features_cols].groupby(clusters).mean()
+                                .reindex(range(n_clusters)).to_numpy())
+        
         # ==================== RETURN RESULT ====================
         result = {
             'clusters': clusters,
@@ -208,6 +361,14 @@ def perform_clustering(df: pd.DataFrame, n_clusters: int, features_cols: list,
             'scaled_features': scaled_features,
             'pca_result': pca_result,
             'pca_explained': pca_explained,
+            # Sumbu PCA untuk memproyeksikan semua baris (pca_result hanya sampel di data besar)
+            'pca_components': pca.components_ if pca_result is not None else None,
+            'pca_mean': pca.mean_ if pca_result is not None else None,
+            'centers_original': centers_original,
+            # Per baris (float32): jarak ke centroid sendiri, selisih ke centroid terdekat kedua
+            'center_distance': scores['distance'],
+            'center_margin': scores['margin'],
+            'membership': scores['membership'],
             'metrics': metrics,
             'validation_info': {
                 'n_samples': len(df),
@@ -217,13 +378,21 @@ def perform_clustering(df: pd.DataFrame, n_clusters: int, features_cols: list,
                 'clusters_formed': len(unique_clusters),
                 'warnings': validation_warnings
             },
+            'engine': engine,
+            'reduction': reducer,
+            'stage': 'preview' if preview else 'final',
+            'fit_rows': len(fit_indices) if preview else len(df),
             'use_sample': len(df) > 10000,
             'sample_indices': None,
+            'result_key': result_key,
             'success': True
         }
         
         logger.info(f"Clustering selesai. Silhouette: {metrics.get('silhouette', 'N/A'):.3f}")
         
+        if enable_caching:
+            _result_cache.set(result_key, result)
+        
         return result
         
     except Exception as e:
@@ -2,34 +2,106 @@ import pandas as pd
 import numpy as np
 import streamlit as st
 import logging
+import os
+import hashlib
+
+from utils.cache import set_dataset_key
+from utils.ingest import read_incremental, get_ingest_stats, get_ingest_medians, column_medians, numeric_stats
+from utils.dataset_catalog import get_data_source, get_data_filters, catalog_signature, file_signature, load_catalog
 
 logger = logging.getLogger(__name__)
 
-@st.cache_data
+POSSIBLE_FILES = [
+    'tiktok_digital_marketing_data.csv',
+    'tiktok_demo_data.csv',
+    'tiktok_data.csv',
+    'data.csv'
+]
+
+def resolve_data_path():
+    """File dataset pertama yang ada di direktori kerja"""
+    for file_path in POSSIBLE_FILES:
+        if os.path.isfile(file_path):
+            return file_path
+    return None
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _prepare_data(source, signature, filters=()):
+    """
+    Baca file tunggal (incremental untuk CSV yang di-append) atau katalog multi-file,
+    lalu imputasi dan Engagement_Rate. Key cache ikut signature (path, ukuran, mtime)
+    semua file, jadi append harian atau file baru langsung terbaca. `filters` hanya
+    berlaku untuk katalog (partition pruning + filter baris).
+    """
+    if os.path.isfile(source):
+        raw = read_incremental(source)
+        stats = get_ingest_stats(source)
+        medians = get_ingest_medians(source)
+        _, size, mtime_ns = signature[0]
+        dataset_key = f"{os.path.abspath(source)}:{size}:{mtime_ns}"
+    else:
+        raw = load_catalog(source, filters)
+        stats = numeric_stats(raw)
+        medians = column_medians(raw, stats)
+        dataset_key = f"catalog:{hashlib.sha1(repr((signature, filters)).encode()).hexdigest()[:16]}"
+    
+    df = raw.copy()
+    missing_count = int(sum(col_stats['missing'] for col_stats in stats.values()))
+    if missing_count > 0:
+        logger.info(f"Mengisi {missing_count} missing values dengan median")
+        for col, median_val in medians.items():
+            df[col] = df[col].fillna(median_val)
+    
+    # Calculate engagement rate jika belum ada
+    if 'Engagement_Rate' not in df.columns:
+        # Cek apakah kolom yang dibutuhkan ada
+        required_for_er = ['Likes', 'Comments', 'Shares', 'Views']
+        if all(col in df.columns for col in required_for_er):
+            df['Engagement_Rate'] = (
+                (df['Likes'] + df['Comments'] + df['Shares']) / 
+                df['Views'].clip(lower=1)
+            )
+    
+    set_dataset_key(df, dataset_key)
+    return df, missing_count
+
+def dataset_source(source=None):
+    """
+    (source, signature, filters) dataset aktif tanpa membaca isinya, atau None.
+    Murah (hanya stat file), jadi bisa dipakai untuk cek apakah dataset berubah.
+    """
+    # Katalog multi-file (direktori/glob) dari env var, selain itu satu file default
+    source = source or get_data_source() or resolve_data_path()
+    if source is None:
+        return None
+    if os.path.isfile(source):
+        return source, (file_signature(os.path.abspath(source)),), ()
+    return source, catalog_signature(source), get_data_filters()
+
+def load_dataset():
+    """
+    Versi headless dari load_data (tanpa elemen UI), dipakai juga oleh warm-up.
+    Return (df, missing_count), atau (None, 0) jika tidak ada dataset yang bisa dibaca.
+    """
+    source = get_data_source() or resolve_data_path()
+    if source is None:
+        return None, 0
+    
+    try:
+        df, missing_count = _prepare_data(*dataset_source(source))
+        logger.info(f"Data berhasil dimuat dari {source}. Shape: {df.shape}")
+        return df, missing_count
+    except Exception as e:
+        logger.warning(f"Error membaca {source}: {str(e)}")
+        return None, 0
+
 def load_data():
     """Load dataset TikTok dengan preprocessing lengkap"""
     logger.info("Memulai loading data...")
     
     try:
         # Coba load beberapa kemungkinan file
-        possible_files = [
-            'tiktok_digital_marketing_data.csv',
-            'tiktok_demo_data.csv',
-            'tiktok_data.csv',
-            'data.csv'
-        ]
-        
-        df = None
-        for file_path in possible_files:
-            try:
-                df = pd.read_csv(file_path)
-                logger.info(f"Data berhasil dimuat dari {file_path}. Shape: {df.shape}")
-                break
-            except FileNotFoundError:
-                continue
-            except Exception as e:
-                logger.warning(f"Error membaca {file_path}: {str(e)}")
-                continue
+        df, missing_count = load_dataset()
         
         if df is None:
             logger.error("Tidak ada file dataset yang ditemukan")
@@ -42,7 +114,8 @@ def load_data():
             - tiktok_data.csv
             - data.csv
             
-            Pastikan salah satu file tersebut ada di direktori yang sama.
+            Pastikan salah satu file tersebut ada di direktori yang sama, atau set
+            `TIKTOK_DATA_SOURCE` ke direktori/glob berisi file CSV/Parquet.
             """)
             
             if st.button("Generate Data Demo"):
@@ -93,30 +166,8 @@ def load_data():
         Aplikasi akan mencoba menggunakan kolom yang tersedia.
         """)
     
-    # Handle missing values dengan aman
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
-    
-    if len(numeric_cols) > 0:
-        missing_count = df[numeric_cols].isna().sum().sum()
-        if missing_count > 0:
-            logger.info(f"Mengisi {missing_count} missing values dengan median")
-            
-            for col in numeric_cols:
-                if df[col].isna().any():
-                    median_val = df[col].median()
-                    df[col] = df[col].fillna(median_val)
-            
-            st.info(f"ℹ Mengisi {missing_count} nilai yang hilang dengan median")
-    
-    # Calculate engagement rate jika belum ada
-    if 'Engagement_Rate' not in df.columns:
-        # Cek apakah kolom yang dibutuhkan ada
-        required_for_er = ['Likes', 'Comments', 'Shares', 'Views']
-        if all(col in df.columns for col in required_for_er):
-            df['Engagement_Rate'] = (
-                (df['Likes'] + df['Comments'] + df['Shares']) / 
-                df['Views'].clip(lower=1)
-            )
+    if missing_count > 0:
+        st.info(f"ℹ Mengisi {missing_count} nilai yang hilang dengan median")
     
     # Log statistics
     logger.info(f"Data loading selesai. Final shape: {df.shape}")
@@ -0,0 +1,226 @@
+import glob
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import LRUStore
+from utils.ingest import read_incremental
+
+logger = logging.getLogger(__name__)
+
+# Direktori atau glob sumber dataset (mis. exports/ atau "exports/*_2024-*.csv")
+DATA_SOURCE_ENV = 'TIKTOK_DATA_SOURCE'
+# Filter rentang numerik untuk katalog, mis. "Views=1000:,Likes=:5000" (batas kosong = terbuka)
+DATA_FILTERS_ENV = 'TIKTOK_DATA_FILTERS'
+SUPPORTED_EXTENSIONS = ('.csv', '.parquet')
+
+# Kolom penanda file asal (satu partisi per file)
+PARTITION_COL = 'Partition'
+
+# Metadata per file (baris, kolom, dtype, min/max numerik), key: signature file
+_partition_meta = LRUStore(max_entries=1024)
+
+
+def get_data_source() -> Optional[str]:
+    return os.environ.get(DATA_SOURCE_ENV) or None
+
+
+def parse_filters(text: str) -> Tuple[Tuple[str, Optional[float], Optional[float]], ...]:
+    """'Views=1000:50000,Likes=:500' -> (('Likes', None, 500.0), ('Views', 1000.0, 50000.0))"""
+    filters = []
+    for part in filter(None, (item.strip() for item in text.split(','))):
+        try:
+            col, bounds = part.split('=', 1)
+            low, high = bounds.split(':', 1)
+            filters.append((col.strip(), float(low) if low.strip() else None, float(high) if high.strip() else None))
+        except ValueError as e:
+            raise ValueError(f"Filter tidak valid {part!r} (format: Kolom=min:max)") from e
+    return tuple(sorted(filters))
+
+
+def get_data_filters() -> Tuple[Tuple[str, Optional[float], Optional[float]], ...]:
+    """Filter katalog dari env var, dalam bentuk hashable (ikut key cache dataset)"""
+    return parse_filters(os.environ.get(DATA_FILTERS_ENV, ''))
+
+
+def discover_files(source: str) -> List[str]:
+    """Daftar file CSV/Parquet dari direktori atau pola glob"""
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)]
+    else:
+        paths = glob.glob(source)
+    return sorted(
+        os.path.abspath(path) for path in paths
+        if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS)
+    )
+
+
+def file_signature(path: str) -> Tuple[str, int, int]:
+    stat = os.stat(path)
+    return (path, stat.st_size, stat.st_mtime_ns)
+
+
+def catalog_signature(source: str) -> Tuple[Tuple[str, int, int], ...]:
+    """Signature seluruh katalog; berubah jika ada file ditambah, dihapus, atau diubah"""
+    return tuple(file_signature(path) for path in discover_files(source))
+
+
+def _parquet_meta(path: str) -> Optional[Dict[str, Any]]:
+    """Metadata dari footer Parquet (tanpa membaca data); None jika pyarrow tidak ada"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+
+    metadata = pq.ParquetFile(path).metadata
+    schema = metadata.schema.to_arrow_schema()
+    ranges = {}
+    for col_idx, name in enumerate(schema.names):
+        mins, maxs = [], []
+        for rg in range(metadata.num_row_groups):
+            stats = metadata.row_group(rg).column(col_idx).statistics
+            if stats is None or not stats.has_min_max:
+                break
+            mins.append(stats.min)
+            maxs.append(stats.max)
+        else:
+            if mins and isinstance(mins[0], (int, float)):
+                ranges[name] = (min(mins), max(maxs))
+    return {'rows': metadata.num_rows, 'columns': list(schema.names), 'ranges': ranges}
+
+
+def _frame_meta(df: pd.DataFrame) -> Dict[str, Any]:
+    numeric = df.select_dtypes(include=[np.number])
+    ranges = {
+        col: (float(numeric[col].min()), float(numeric[col].max()))
+        for col in numeric.columns if numeric[col].notna().any()
+    }
+    return {
+        'rows': len(df),
+        'columns': list(df.columns),
+        'dtypes': {col: df[col].dtype for col in df.columns},
+        'ranges': ranges,
+    }
+
+
+def get_partition_meta(path: str) -> Optional[Dict[str, Any]]:
+    """Metadata file yang sudah diketahui (dari pembacaan sebelumnya atau footer Parquet)"""
+    signature = file_signature(path)
+    meta = _partition_meta.get(signature)
+    if meta is None and path.lower().endswith('.parquet'):
+        meta = _parquet_meta(path)
+        if meta is not None:
+            _partition_meta.set(signature, meta)
+    return meta
+
+
+def _may_match(meta: Optional[Dict[str, Any]], filters) -> bool:
+    """Partition pruning: False hanya jika metadata membuktikan tidak ada baris yang lolos"""
+    if meta is None:
+        return True
+    for col, low, high in filters:
+        if col not in meta['ranges']:
+            continue
+        col_min, col_max = meta['ranges'][col]
+        if (high is not None and col_min > high) or (low is not None and col_max < low):
+            return False
+    return True
+
+
+def read_partition(path: str) -> pd.DataFrame:
+    """Baca satu file; CSV lewat ingest incremental supaya append harian tetap murah"""
+    if path.lower().endswith('.parquet'):
+        try:
+            df = pd.read_parquet(path)
+        except ImportError as e:
+            raise ImportError(f"Membaca {os.path.basename(path)} butuh pyarrow: pip install pyarrow") from e
+    else:
+        df = read_incremental(path)
+
+    _partition_meta.set(file_signature(path), _frame_meta(df))
+    return df
+
+
+def unify_dtypes(frames: List[pd.DataFrame]) -> Dict[str, Any]:
+    """
+    Dtype bersama per kolom: numerik digabung dengan np.result_type (int yang punya
+    kolom hilang di sebagian file jadi float), campuran numerik/teks jadi object.
+    """
+    columns = []
+    for frame in frames:
+        columns.extend(col for col in frame.columns if col not in columns)
+
+    target = {}
+    for col in columns:
+        dtypes = [frame[col].dtype for frame in frames if col in frame.columns]
+        missing_somewhere = len(dtypes) < len(frames)
+        if all(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype) for dtype in dtypes):
+            dtype = np.result_type(*dtypes)
+            if missing_somewhere and np.issubdtype(dtype, np.integer):
+                dtype = np.dtype('float64')
+            target[col] = dtype
+        elif len(set(map(str, dtypes))) == 1 and not missing_somewhere:
+            target[col] = dtypes[0]
+        else:
+            target[col] = object
+    return target
+
+
+def apply_filters(df: pd.DataFrame, filters) -> pd.DataFrame:
+    """Baris yang lolos semua filter rentang; kolom yang tidak ada diabaikan"""
+    mask = pd.Series(True, index=df.index)
+    for col, low, high in filters:
+        if col not in df.columns:
+            logger.warning(f"Filter {col} diabaikan: kolom tidak ada di dataset")
+            continue
+        values = pd.to_numeric(df[col], errors='coerce')
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+    return df if mask.all() else df[mask].reset_index(drop=True)
+
+
+def load_catalog(source: str, filters=(), max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Gabungkan semua file di `source` menjadi satu dataset berpartisi.
+
+    File dibaca paralel (parser CSV pandas melepas GIL), skema disatukan lewat
+    `unify_dtypes`, dan setiap baris diberi kolom `Partition` berisi nama file.
+    `filters` ((kolom, min, max), lihat `parse_filters`) melewati file yang menurut
+    metadatanya (footer Parquet, atau pembacaan sebelumnya) tidak mungkin berisi
+    baris yang cocok, lalu memfilter baris dari file yang tersisa.
+    """
+    paths = discover_files(source)
+    if not paths:
+        raise FileNotFoundError(f"Tidak ada file CSV/Parquet di {source}")
+
+    if filters:
+        kept = [path for path in paths if _may_match(get_partition_meta(path), filters)]
+        if len(kept) < len(paths):
+            logger.info(f"Partition pruning: {len(paths) - len(kept)} dari {len(paths)} file dilewati")
+        paths = kept
+        if not paths:
+            return pd.DataFrame()
+
+    workers = max_workers or min(len(paths), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        frames = list(executor.map(read_partition, paths))
+
+    target = unify_dtypes(frames)
+    aligned = []
+    for path, frame in zip(paths, frames):
+        frame = frame.reindex(columns=list(target)).astype(target)
+        frame[PARTITION_COL] = os.path.splitext(os.path.basename(path))[0]
+        aligned.append(frame)
+
+    df = pd.concat(aligned, ignore_index=True)
+    df[PARTITION_COL] = df[PARTITION_COL].astype('category')
+    if filters:
+        df = apply_filters(df, filters)
+    logger.info(f"Katalog {source}: {len(paths)} file, {len(df):,} baris, {workers} worker")
+    return df
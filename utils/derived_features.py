@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import logging
+from typing import Dict, List
+
+from utils.cache import LRUStore, get_dataset_key
+
+logger = logging.getLogger(__name__)
+
+
+def _log1p(col):
+    return lambda df: np.log1p(df[col].clip(lower=0).astype('float64'))
+
+
+def _ratio(numerator, denominator):
+    return lambda df: df[numerator].astype('float64') / df[denominator].clip(lower=1)
+
+
+# Registry fitur turunan: nama -> kolom yang dibutuhkan + fungsi vectorized
+DERIVED_FEATURES: Dict[str, Dict] = {
+    'Log_Views': {
+        'requires': ['Views'],
+        'compute': _log1p('Views'),
+        'description': 'log1p(Views)',
+    },
+    'Log_Likes': {
+        'requires': ['Likes'],
+        'compute': _log1p('Likes'),
+        'description': 'log1p(Likes)',
+    },
+    'Log_Shares': {
+        'requires': ['Shares'],
+        'compute': _log1p('Shares'),
+        'description': 'log1p(Shares)',
+    },
+    'Log_Comments': {
+        'requires': ['Comments'],
+        'compute': _log1p('Comments'),
+        'description': 'log1p(Comments)',
+    },
+    'Likes_per_View': {
+        'requires': ['Likes', 'Views'],
+        'compute': _ratio('Likes', 'Views'),
+        'description': 'Likes / Views',
+    },
+    'Shares_per_View': {
+        'requires': ['Shares', 'Views'],
+        'compute': _ratio('Shares', 'Views'),
+        'description': 'Shares / Views',
+    },
+    'Comments_per_Like': {
+        'requires': ['Comments', 'Likes'],
+        'compute': _ratio('Comments', 'Likes'),
+        'description': 'Comments / Likes',
+    },
+}
+
+# Kolom turunan di-cache per (dataset, nama fitur)
+_derived_cache = LRUStore(max_entries=64)
+
+
+def available_derived_features(df: pd.DataFrame) -> List[str]:
+    """Fitur turunan yang bisa dihitung dari kolom numerik dataset"""
+    available = []
+    for name, spec in DERIVED_FEATURES.items():
+        if name in df.columns:
+            continue
+        if all(col in df.columns and pd.api.types.is_numeric_dtype(df[col])
+               for col in spec['requires']):
+            available.append(name)
+    return available
+
+
+def compute_derived_feature(df: pd.DataFrame, name: str) -> np.ndarray:
+    """Hitung satu kolom turunan (atau ambil dari cache dataset yang sama)"""
+    spec = DERIVED_FEATURES[name]
+
+    def _compute():
+        logger.info(f"Menghitung fitur turunan {name}")
+        values = spec['compute'](df).to_numpy(dtype='float64')
+        values[~np.isfinite(values)] = np.nan
+        # Array dibagi antar session: cegah mutasi in-place
+        values.flags.writeable = False
+        return values
+
+    return _derived_cache.get_or_compute((get_dataset_key(df), name), _compute)
+
+
+def add_derived_features(df: pd.DataFrame, names: List[str]) -> pd.DataFrame:
+    """
+    Tambahkan hanya fitur turunan yang dipilih ke df (in-place).
+    Fitur yang tidak ada di registry atau sudah ada di df diabaikan.
+    """
+    for name in names:
+        if name in DERIVED_FEATURES and name not in df.columns:
+            df[name] = compute_derived_feature(df, name)
+    return df
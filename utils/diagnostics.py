@@ -3,6 +3,9 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List
 
+from utils.stability import get_stability, DEFAULT_BOOTSTRAPS, STABLE_JACCARD, DISSOLVED_JACCARD
+from utils.memory import memory_report, format_bytes, session_stages
+
 def display_clustering_diagnostics(df: pd.DataFrame, result: Dict, features_cols: list):
     """
     Tampilkan diagnostic informasi clustering
@@ -78,6 +81,14 @@ def display_clustering_diagnostics(df: pd.DataFrame, result: Dict, features_cols
                 st.metric("Clusters Formed", clusters_formed, 
                          delta=f"Requested: {clusters_requested}",
                          delta_color="off")
+            
+            # Reduksi dimensi sebelum fit
+            reduction = result.get('reduction')
+            if reduction is not None:
+                retained = reduction.get('retained_variance')
+                st.metric("Reduksi Dimensi", f"{reduction['n_input']} → {reduction['n_components']}",
+                         delta=f"{retained:.1%} varians" if retained is not None else "Proyeksi acak",
+                         delta_color="normal" if retained is None or retained >= 0.8 else "off")
         
         # Warnings section
         warnings_list = []
@@ -131,4 +142,91 @@ def display_clustering_diagnostics(df: pd.DataFrame, result: Dict, features_cols
             ]
             
             for tip in tips:
-                st.markdown(f"• {tip}")
\ No newline at end of file
+                st.markdown(f"• {tip}")
+        # Stabilitas cluster (bootstrap), dihitung hanya atas permintaan
+        if not result.get('fallback', False):
+            st.markdown("---")
+            st.markdown("#### 🔁 Stabilitas Cluster")
+            display_stability(df, result, features_cols)
+        
+        # Memori per stage pipeline, session state dan payload komponen
+        st.markdown("---")
+        st.markdown("#### 🧠 Memori")
+        display_memory()
+
+def display_stability(df: pd.DataFrame, result: Dict, features_cols: list):
+    """Jaccard per cluster dan matriks co-assignment dari refit bootstrap"""
+    stability = get_stability(df, result, features_cols, compute=False)
+    
+    if stability is None:
+        st.caption(f"{DEFAULT_BOOTSTRAPS} refit KMeans pada subsample 80%, warm start dari centroid saat ini.")
+        if st.button("Jalankan Analisis Stabilitas", key="run_stability"):
+            with st.spinner("Menghitung stabilitas cluster..."):
+                stability = get_stability(df, result, features_cols)
+    
+    if stability is None:
+        return
+    
+    # Bisa berupa list jika dipulihkan dari snapshot
+    jaccard = np.asarray(stability['jaccard_mean'])
+    labels = [f"Cluster {i}" for i in range(len(jaccard))]
+    status = np.where(jaccard >= STABLE_JACCARD, "Stabil",
+                      np.where(jaccard < DISSOLVED_JACCARD, "Tidak stabil", "Cukup"))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.dataframe(pd.DataFrame({
+            'Jaccard': jaccard.round(3),
+            'Std': np.asarray(stability['jaccard_std']).round(3),
+            'Status': status,
+        }, index=labels), use_container_width=True)
+    with col2:
+        st.dataframe(pd.DataFrame(np.asarray(stability['co_assignment']).round(3), index=labels, columns=labels),
+                     use_container_width=True)
+    
+    st.caption(
+        f"{stability['n_bootstraps']} refit x {stability['sample_size']:,} baris, "
+        f"{stability['n_jobs']} worker, {stability['elapsed']:.1f}s. "
+        "Kanan: proporsi anggota cluster (baris) yang tetap di cluster padanannya (kolom)."
+    )
+
+def display_memory():
+    """Peak/retained per stage (run terakhir); ukuran session state dan cache atas permintaan"""
+    # Menelusuri session state + semua cache mahal, jadi tidak dihitung setiap rerun
+    deep = st.button("Hitung Ukuran Cache", key="memory_deep_report")
+    report = memory_report(session_stages(st.session_state), st.session_state, deep=deep)
+    
+    if report['rss'] is not None:
+        st.metric("RSS Proses", format_bytes(report['rss']))
+    
+    if report['stages']:
+        st.dataframe(pd.DataFrame([{
+            'Stage': record['stage'],
+            'Peak (proses)': format_bytes(record['peak']),
+            'Retained (proses)': format_bytes(record['retained']),
+            'Durasi (s)': round(record['elapsed'], 2),
+            'Metode': record['method'],
+            'Waktu': record['time'],
+        } for record in report['stages']]), use_container_width=True, hide_index=True)
+    
+    st.caption(
+        "Stage tab berasal dari run sebelumnya (diagnostics dirender sebelum tab). "
+        "Peak/retained diukur untuk seluruh proses: session lain yang berjalan bersamaan "
+        "ikut terhitung. "
+        "Set TIKTOK_MEMORY_TRACE=1 untuk alokasi Python via tracemalloc; default sampling RSS."
+    )
+    if not deep:
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Session state**")
+        st.dataframe(pd.DataFrame({
+            'Ukuran': [format_bytes(size) for size in report['session_state'].values()],
+        }, index=list(report['session_state'])), use_container_width=True)
+    with col2:
+        st.markdown("**Payload cache**")
+        st.dataframe(pd.DataFrame({
+            'Entri': [entry['entries'] for entry in report['payloads'].values()],
+            'Ukuran': [format_bytes(entry['bytes']) for entry in report['payloads'].values()],
+        }, index=list(report['payloads'])), use_container_width=True)
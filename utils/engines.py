@@ -0,0 +1,208 @@
+import numpy as np
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Engine "auto" = perilaku lama: KMeans sampai batas ini, MiniBatchKMeans di atasnya
+MINIBATCH_MIN_ROWS = 10000
+
+# BIRCH: satu scan streaming per chunk, lalu KMeans berbobot di centroid leaf CF-tree
+BIRCH_CHUNK_SIZE = 20000
+BIRCH_THRESHOLD = 0.5
+BIRCH_BRANCHING_FACTOR = 50
+ASSIGN_CHUNK_SIZE = 50000
+
+
+def _kmeans_init(init: Optional[np.ndarray], n_init: int) -> Dict[str, Any]:
+    """Warm start dari centroid yang sudah ada cukup satu inisialisasi"""
+    if init is None:
+        return {'init': 'k-means++', 'n_init': n_init}
+    return {'init': init, 'n_init': 1}
+
+
+def _fit_kmeans(X: np.ndarray, n_clusters: int, random_state: int = 42,
+                init: Optional[np.ndarray] = None) -> Tuple[Any, np.ndarray]:
+    from sklearn.cluster import KMeans
+
+    model = KMeans(n_clusters=n_clusters, random_state=random_state, max_iter=300, **_kmeans_init(init, 10))
+    return model, model.fit_predict(X)
+
+
+def _fit_minibatch(X: np.ndarray, n_clusters: int, random_state: int = 42,
+                   init: Optional[np.ndarray] = None) -> Tuple[Any, np.ndarray]:
+    from sklearn.cluster import MiniBatchKMeans
+
+    model = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state,
+                            batch_size=1000, max_iter=300, **_kmeans_init(init, 3))
+    return model, model.fit_predict(X)
+
+
+def _fit_auto(X: np.ndarray, n_clusters: int, random_state: int = 42,
+              init: Optional[np.ndarray] = None) -> Tuple[Any, np.ndarray]:
+    if len(X) > MINIBATCH_MIN_ROWS:
+        return _fit_minibatch(X, n_clusters, random_state, init)
+    return _fit_kmeans(X, n_clusters, random_state, init)
+
+
+def _leaf_weights(birch: Any) -> np.ndarray:
+    """
+    Jumlah sampel per subcluster leaf langsung dari CF-tree (urutan sama dengan
+    subcluster_centers_): rantai leaf dari atribut dummy_leaf_, n_samples_ per
+    subcluster. Hitungan exact yang terkumpul selama partial_fit, tanpa pass kedua
+    atas data.
+    """
+    counts = []
+    leaf = birch.dummy_leaf_.next_leaf_
+    while leaf is not None:
+        counts.extend(subcluster.n_samples_ for subcluster in leaf.subclusters_)
+        leaf = leaf.next_leaf_
+    return np.asarray(counts, dtype=np.float64)
+
+
+def nearest_centers(X: np.ndarray, centers: np.ndarray,
+                    chunk_size: int = ASSIGN_CHUNK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """Label centroid terdekat + kuadrat jarak per baris, per chunk supaya matrix jarak tetap kecil"""
+    labels = np.empty(len(X), dtype=np.int32)
+    sq_distances = np.empty(len(X), dtype=np.float64)
+    center_norms = np.einsum('ij,ij->i', centers, centers)
+    for start in range(0, len(X), chunk_size):
+        chunk = X[start:start + chunk_size]
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2
+        distances = center_norms[None, :] - 2.0 * chunk @ centers.T
+        nearest = distances.argmin(axis=1)
+        labels[start:start + chunk_size] = nearest
+        sq_distances[start:start + chunk_size] = (distances[np.arange(len(chunk)), nearest]
+                                                  + np.einsum('ij,ij->i', chunk, chunk))
+    return labels, np.maximum(sq_distances, 0.0)
+
+
+def assign_nearest(X: np.ndarray, centers: np.ndarray, chunk_size: int = ASSIGN_CHUNK_SIZE) -> Tuple[np.ndarray, float]:
+    """Label centroid terdekat + inertia"""
+    labels, sq_distances = nearest_centers(X, centers, chunk_size)
+    return labels, float(sq_distances.sum())
+
+
+def assignment_scores(X: np.ndarray, centers: np.ndarray, labels: Optional[np.ndarray] = None,
+                      temperature: Optional[float] = None,
+                      chunk_size: int = ASSIGN_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Satu pass per chunk (matmul BLAS) atas matrix jarak chunk x K:
+    label (centroid terdekat, atau `labels` jika diberikan), jarak ke centroid
+    label, margin = jarak ke centroid terdekat berikutnya dikurangi jarak itu
+    (kecil = borderline), dan jika `temperature` diisi membership
+    softmax(-d²/temperature) per baris. Array per baris float32, inertia float64.
+    """
+    n_rows, n_centers = len(X), len(centers)
+    assigned = np.empty(n_rows, dtype=np.int32)
+    distance = np.empty(n_rows, dtype=np.float32)
+    margin = np.empty(n_rows, dtype=np.float32)
+    membership = np.empty((n_rows, n_centers), dtype=np.float32) if temperature else None
+    inertia = 0.0
+
+    center_norms = np.einsum('ij,ij->i', centers, centers)
+    for start in range(0, n_rows, chunk_size):
+        chunk = X[start:start + chunk_size]
+        rows = np.arange(len(chunk))
+        sq = center_norms[None, :] - 2.0 * chunk @ centers.T + np.einsum('ij,ij->i', chunk, chunk)[:, None]
+        np.maximum(sq, 0.0, out=sq)
+
+        own = sq.argmin(axis=1) if labels is None else np.asarray(labels[start:start + chunk_size])
+        own_sq = sq[rows, own]
+        inertia += float(own_sq.sum())
+        assigned[start:start + chunk_size] = own
+        distance[start:start + chunk_size] = np.sqrt(own_sq)
+
+        if n_centers > 1:
+            sq[rows, own] = np.inf
+            margin[start:start + chunk_size] = np.sqrt(sq.min(axis=1)) - np.sqrt(own_sq)
+            sq[rows, own] = own_sq
+        else:
+            margin[start:start + chunk_size] = np.inf
+
+        if membership is not None:
+            # Geser dengan minimum baris (bukan jarak label, yang belum tentu terdekat)
+            # supaya exp tidak overflow
+            logits = -(sq - sq.min(axis=1, keepdims=True)) / temperature
+            np.exp(logits, out=logits)
+            membership[start:start + chunk_size] = logits / logits.sum(axis=1, keepdims=True)
+
+    return {'labels': assigned, 'distance': distance, 'margin': margin,
+            'membership': membership, 'inertia': inertia}
+
+
+def _fit_birch(X: np.ndarray, n_clusters: int, random_state: int = 42,
+               init: Optional[np.ndarray] = None) -> Tuple[Any, np.ndarray]:
+    """
+    Satu scan streaming: CF-tree BIRCH di-update per chunk (partial_fit), lalu KMeans
+    berbobot (jumlah sampel per leaf) pada centroid leaf. Data tidak perlu muat
+    sekaligus di model; label akhir dari centroid terdekat.
+    """
+    from sklearn.cluster import Birch, KMeans
+
+    birch = Birch(threshold=BIRCH_THRESHOLD, branching_factor=BIRCH_BRANCHING_FACTOR, n_clusters=None)
+    for start in range(0, len(X), BIRCH_CHUNK_SIZE):
+        birch.partial_fit(X[start:start + BIRCH_CHUNK_SIZE])
+
+    leaf_centers = birch.subcluster_centers_
+    if len(leaf_centers) < n_clusters:
+        raise ValueError(f"BIRCH hanya menghasilkan {len(leaf_centers)} subcluster (< K={n_clusters}); "
+                         f"turunkan BIRCH_THRESHOLD")
+
+    model = KMeans(n_clusters=n_clusters, random_state=random_state, max_iter=300, **_kmeans_init(init, 10))
+    weights = _leaf_weights(birch)
+    if len(weights) != len(leaf_centers) or weights.sum() != len(X):
+        raise ValueError(f"Jumlah sampel CF-tree BIRCH tidak cocok ({weights.sum():.0f} dari {len(X)} baris, "
+                         f"{len(weights)} dari {len(leaf_centers)} leaf)")
+    model.fit(leaf_centers, sample_weight=weights)
+
+    labels, inertia = assign_nearest(X, model.cluster_centers_)
+    # Inertia terhadap data asli (bukan terhadap centroid leaf)
+    model.inertia_ = inertia
+    model.n_subclusters_ = len(leaf_centers)
+    logger.info(f"BIRCH: {len(leaf_centers)} subcluster leaf dari {len(X):,} baris")
+    return model, labels
+
+
+# Registry engine clustering. Setiap engine menerima matrix yang sudah di-scale (dan
+# opsional centroid awal untuk warm start) lalu mengembalikan (model, labels);
+# model minimal punya cluster_centers_ dan inertia_.
+CLUSTERING_ENGINES: Dict[str, Dict[str, Any]] = {
+    'auto': {
+        'fit': _fit_auto,
+        'label': 'Otomatis',
+        'description': f'KMeans, atau MiniBatchKMeans di atas {MINIBATCH_MIN_ROWS:,} baris',
+    },
+    'kmeans': {
+        'fit': _fit_kmeans,
+        'label': 'KMeans',
+        'description': 'KMeans penuh (n_init=10)',
+    },
+    'minibatch': {
+        'fit': _fit_minibatch,
+        'label': 'MiniBatchKMeans',
+        'description': 'KMeans mini-batch, cepat untuk data besar',
+    },
+    'birch': {
+        'fit': _fit_birch,
+        'label': 'BIRCH (streaming)',
+        'description': 'Satu scan CF-tree lalu KMeans pada centroid leaf, untuk data sangat besar',
+    },
+}
+
+DEFAULT_ENGINE = 'auto'
+
+
+def register_engine(name: str, fit: Callable, label: str, description: str = '') -> None:
+    CLUSTERING_ENGINES[name] = {'fit': fit, 'label': label, 'description': description}
+
+
+def available_engines() -> List[str]:
+    return list(CLUSTERING_ENGINES)
+
+
+def fit_engine(name: str, X: np.ndarray, n_clusters: int, random_state: int = 42,
+               init: Optional[np.ndarray] = None) -> Tuple[Any, np.ndarray]:
+    if name not in CLUSTERING_ENGINES:
+        raise ValueError(f"Engine clustering tidak dikenal: {name}")
+    return CLUSTERING_ENGINES[name]['fit'](X, n_clusters, random_state, init=init)
@@ -0,0 +1,263 @@
+"""
+Export dataset berlabel cluster langsung dari server (tanpa JSON di browser).
+
+Data ditulis per chunk: satu row group Parquet (butuh pyarrow) atau satu blok
+CSV dalam stream gzip per chunk, jadi kolom tambahan (jarak ke centroid,
+koordinat PCA) tidak pernah dibuat untuk seluruh dataset sekaligus. Dashboard
+menulis ke file sementara di disk (EXPORT_DIR) saat tombol download diklik;
+yang disimpan di memori hanya metadata file (path, ukuran, jumlah baris).
+
+Pemakaian:
+    python -m utils.export hasil.parquet [--format parquet|csv.gz] [--features A B C] [--k 4]
+                           [--engine auto] [--distances] [--pca] [--chunk-rows 100000]
+"""
+import argparse
+import gzip
+import importlib.util
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Any, BinaryIO, Dict, Iterator
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import LRUStore
+
+logger = logging.getLogger(__name__)
+
+CHUNK_ROWS = 100_000
+CSV_COMPRESSLEVEL = 6
+
+# File export di disk; hanya MAX_EXPORT_FILES terbaru yang disimpan
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), 'tiktok_exports')
+MAX_EXPORT_FILES = 4
+
+# Metadata file export per (result_key, format, opsi): path, size, rows
+_export_files = LRUStore(max_entries=MAX_EXPORT_FILES)
+
+EXPORT_FORMATS: Dict[str, Dict[str, str]] = {
+    'parquet': {
+        'label': 'Parquet (kolumnar, zstd)',
+        'extension': 'parquet',
+        'mime': 'application/vnd.apache.parquet',
+    },
+    'csv.gz': {
+        'label': 'CSV (gzip)',
+        'extension': 'csv.gz',
+        'mime': 'application/gzip',
+    },
+}
+
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def available_formats() -> list:
+    return [fmt for fmt in EXPORT_FORMATS if fmt != 'parquet' or parquet_available()]
+
+
+def iter_export_chunks(df_clustered: pd.DataFrame, result: Dict[str, Any], features_cols: list,
+                       include_distances: bool = False, include_pca: bool = False,
+                       chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Potongan df_clustered (sudah ada kolom Cluster) plus kolom opsional:
+    Distance_C<k> = jarak Euclidean ke setiap centroid di ruang fit, PC1/PC2 =
+    proyeksi ke sumbu PCA hasil clustering.
+    """
+    matrix = centers = None
+    if include_distances or include_pca:
+        from utils.clustering import result_centers, result_matrix
+
+        matrix = result_matrix(df_clustered, result, features_cols)
+        centers = result_centers(result, matrix)
+
+    pca_axes = None
+    if include_pca and result.get('pca_components') is not None:
+        pca_axes = (np.asarray(result['pca_mean']), np.asarray(result['pca_components']))
+    elif include_pca:
+        logger.warning("Komponen PCA tidak tersedia di hasil clustering, kolom PC1/PC2 dilewati")
+
+    for start in range(0, len(df_clustered), chunk_rows):
+        chunk = df_clustered.iloc[start:start + chunk_rows].copy()
+        if matrix is not None:
+            block = matrix[start:start + chunk_rows]
+            if include_distances:
+                # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2
+                sq = (np.einsum('ij,ij->i', block, block)[:, None] - 2.0 * block @ centers.T
+                      + np.einsum('ij,ij->i', centers, centers)[None, :])
+                distances = np.sqrt(np.maximum(sq, 0.0)).astype(np.float32)
+                for k in range(centers.shape[0]):
+                    chunk[f'Distance_C{k}'] = distances[:, k]
+            if pca_axes is not None:
+                coords = ((block - pca_axes[0]) @ pca_axes[1].T).astype(np.float32)
+                chunk['PC1'] = coords[:, 0]
+                chunk['PC2'] = coords[:, 1]
+        yield chunk
+
+
+def _write_parquet(chunks: Iterator[pd.DataFrame], sink) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    rows = 0
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False,
+                                         schema=writer.schema if writer is not None else None)
+            if writer is None:
+                writer = pq.ParquetWriter(sink, table.schema, compression='zstd')
+            # Satu chunk = satu row group
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _write_csv_gz(chunks: Iterator[pd.DataFrame], sink) -> int:
+    rows = 0
+    with gzip.GzipFile(fileobj=sink, mode='wb', compresslevel=CSV_COMPRESSLEVEL) as gz:
+        with io.TextIOWrapper(gz, encoding='utf-8', newline='') as text:
+            for chunk in chunks:
+                chunk.to_csv(text, index=False, header=rows == 0)
+                rows += len(chunk)
+    return rows
+
+
+def write_export(df_clustered: pd.DataFrame, result: Dict[str, Any], features_cols: list,
+                 sink: BinaryIO, fmt: str = 'parquet', include_distances: bool = False,
+                 include_pca: bool = False, chunk_rows: int = CHUNK_ROWS) -> int:
+    """Tulis export ke file/buffer biner `sink`; return jumlah baris"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format export tidak dikenal: {fmt}")
+    if fmt == 'parquet' and not parquet_available():
+        raise ImportError("Export Parquet butuh pyarrow: pip install pyarrow (atau pakai csv.gz)")
+
+    start = time.perf_counter()
+    chunks = iter_export_chunks(df_clustered, result, features_cols, include_distances, include_pca, chunk_rows)
+    writer = _write_parquet if fmt == 'parquet' else _write_csv_gz
+    rows = writer(chunks, sink)
+    logger.info(f"Export {fmt}: {rows:,} baris dalam {time.perf_counter() - start:.2f}s")
+    return rows
+
+
+def export_bytes(df_clustered: pd.DataFrame, result: Dict[str, Any], features_cols: list,
+                 fmt: str = 'parquet', **options) -> bytes:
+    """Export ke memori; hanya untuk data kecil (test, notebook), dashboard memakai export_file"""
+    buffer = io.BytesIO()
+    write_export(df_clustered, result, features_cols, buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def _prune_export_files(keep: str) -> None:
+    """Hapus file export yang metadatanya sudah tergusur dari _export_files"""
+    known = {info['path'] for _, info in _export_files.items()} | {keep}
+    for name in os.listdir(EXPORT_DIR):
+        path = os.path.join(EXPORT_DIR, name)
+        if path not in known and not name.endswith('.tmp'):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def export_file(df_clustered: pd.DataFrame, result: Dict[str, Any], features_cols: list,
+                fmt: str = 'parquet', include_distances: bool = False,
+                include_pca: bool = False) -> Dict[str, Any]:
+    """
+    Tulis export per chunk ke file di EXPORT_DIR; return {'path', 'size', 'rows'}.
+    Metadata di-cache per (result_key, format, opsi), jadi klik berikutnya memakai
+    file yang sama selama belum tergusur.
+    """
+    key = (result.get('result_key'), fmt, include_distances, include_pca)
+    cached = _export_files.get(key) if key[0] is not None else None
+    if cached is not None and os.path.exists(cached['path']):
+        return cached
+
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=EXPORT_DIR, prefix=f"{key[0] or 'hasil'}_",
+                                    suffix=f".{EXPORT_FORMATS.get(fmt, {}).get('extension', 'bin')}.tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            rows = write_export(df_clustered, result, features_cols, f, fmt,
+                                include_distances=include_distances, include_pca=include_pca)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    path = tmp_path[:-len('.tmp')]
+    os.replace(tmp_path, path)
+
+    info = {'path': path, 'size': os.path.getsize(path), 'rows': rows}
+    if key[0] is not None:
+        _export_files.set(key, info)
+    _prune_export_files(keep=path)
+    return info
+
+
+def cached_export_file(result: Dict[str, Any], fmt: str, include_distances: bool = False,
+                       include_pca: bool = False) -> Dict[str, Any]:
+    """Metadata export yang sudah ditulis dan filenya masih ada, atau None"""
+    info = _export_files.get((result.get('result_key'), fmt, include_distances, include_pca))
+    return info if info is not None and os.path.exists(info['path']) else None
+
+
+def export_filename(result: Dict[str, Any], fmt: str) -> str:
+    key = result.get('result_key') or 'hasil'
+    return f"tiktok_clusters_{key}.{EXPORT_FORMATS[fmt]['extension']}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('output')
+    parser.add_argument('--format', choices=list(EXPORT_FORMATS), default=None,
+                        help='Default dari ekstensi output (parquet jika .parquet, selain itu csv.gz)')
+    parser.add_argument('--features', nargs='+')
+    parser.add_argument('--k', type=int)
+    parser.add_argument('--engine', default=None)
+    parser.add_argument('--distances', action='store_true', help='Tambah jarak ke setiap centroid')
+    parser.add_argument('--pca', action='store_true', help='Tambah koordinat PC1/PC2')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    from utils.logging_setup import setup_logging
+    from utils.data_loader import load_dataset
+    from utils.clustering import perform_clustering
+    from utils.derived_features import add_derived_features
+    from utils.engines import DEFAULT_ENGINE
+    from utils.validators import default_clustering_config
+
+    setup_logging()
+    fmt = args.format or ('parquet' if args.output.endswith('.parquet') else 'csv.gz')
+
+    df, _ = load_dataset()
+    if df is None:
+        print("Dataset tidak ditemukan", file=sys.stderr)
+        return 1
+    default_features, default_k = default_clustering_config(df)
+    features_cols = args.features or default_features
+    add_derived_features(df, features_cols)
+    result = perform_clustering(df, args.k or default_k, features_cols, engine=args.engine or DEFAULT_ENGINE)
+    if not result.get('success', True):
+        print(f"Clustering gagal: {result.get('error')}", file=sys.stderr)
+        return 1
+
+    df_clustered = df.copy()
+    df_clustered['Cluster'] = result['clusters']
+    tmp_path = f"{args.output}.tmp"
+    with open(tmp_path, 'wb') as f:
+        rows = write_export(df_clustered, result, features_cols, f, fmt,
+                            include_distances=args.distances, include_pca=args.pca, chunk_rows=args.chunk_rows)
+    os.replace(tmp_path, args.output)
+    print(f"{rows:,} baris -> {args.output} ({os.path.getsize(args.output):,} byte)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
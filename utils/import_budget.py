@@ -0,0 +1,143 @@
+"""
+Benchmark waktu import modul dashboard terhadap budget startup.
+
+Setiap modul di-import di proses Python baru (cold import, min dari beberapa
+percobaan). Gagal jika melewati budget waktu atau memuat dependency berat yang
+seharusnya ditunda ke code path yang membutuhkannya.
+
+Budget waktu ditulis untuk mesin referensi dan otomatis dilonggarkan sebanding
+cold import pandas (lantai semua modul dashboard) di mesin yang lebih lambat,
+jadi cek yang sama bisa jalan di laptop maupun CI. Cek ini juga jalan di pytest
+(marker import_budget, tests/test_import_budget.py).
+
+Pemakaian:
+    python -m utils.import_budget            # cek semua budget, exit 1 jika ada yang lewat
+    python -m utils.import_budget --scale 2  # longgarkan lagi di atas skala otomatis
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependency berat yang hanya boleh dimuat saat benar-benar dipakai
+# (streamlit sendiri sudah memuat inti plotly, tapi tidak plotly.express)
+HEAVY_MODULES = ('sklearn', 'plotly.express', 'scipy')
+
+# Skala otomatis: cold import BASELINE_MODULE dibanding waktunya di mesin referensi
+BASELINE_MODULE = 'pandas'
+REFERENCE_BASELINE_MS = 450
+
+# modul: (budget ms di mesin referensi, modul yang tidak boleh ikut ter-import).
+# Budget sekitar 2x waktu terukur; regresi utama (dependency berat ikut ter-import)
+# ditangkap daftar modul terlarang, bukan oleh waktu.
+BUDGETS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    'utils.cache': (1000, HEAVY_MODULES + ('streamlit',)),
+    'utils.clustering': (1000, HEAVY_MODULES + ('streamlit',)),
+    'utils.warmup': (50, HEAVY_MODULES + ('streamlit', 'pandas')),
+    'utils.data_loader': (2000, HEAVY_MODULES),
+    'tabs': (50, HEAVY_MODULES + ('tabs.overview_tab', 'tabs.visualization_tab', 'tabs.data_tab')),
+    'tabs.overview_tab': (2500, HEAVY_MODULES),
+    'tabs.categorical_tab': (2500, HEAVY_MODULES),
+    'tabs.analysis_tab': (2500, HEAVY_MODULES),
+    'tabs.visualization_tab': (2500, HEAVY_MODULES),
+    'tabs.segment_tab': (2500, HEAVY_MODULES),
+    'tabs.window_tab': (2500, HEAVY_MODULES),
+}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{'ms': elapsed, 'modules': sorted(sys.modules)}}))
+"""
+
+
+def measure_import(module: str, repeats: int = 3) -> Tuple[float, List[str]]:
+    """Waktu cold import (ms, minimum dari `repeats` proses) dan daftar modul yang termuat"""
+    best_ms, modules = float('inf'), []
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module)],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        )
+        probe = json.loads(completed.stdout.strip().splitlines()[-1])
+        if probe['ms'] < best_ms:
+            best_ms, modules = probe['ms'], probe['modules']
+    return best_ms, modules
+
+
+def slowest_imports(module: str, top: int = 5) -> List[Tuple[str, int]]:
+    """Kontributor terbesar (self time, us) dari `python -X importtime`"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT_DIR, capture_output=True, text=True
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        entries.append((name.strip(), int(self_us)))
+    return sorted(entries, key=lambda entry: entry[1], reverse=True)[:top]
+
+
+def _is_loaded(prefix: str, modules: List[str]) -> bool:
+    return any(name == prefix or name.startswith(prefix + '.') for name in modules)
+
+
+def baseline_scale(repeats: int = 3) -> float:
+    """Pengali budget untuk mesin ini (minimal 1.0) dari cold import BASELINE_MODULE"""
+    baseline_ms, _ = measure_import(BASELINE_MODULE, repeats)
+    return max(1.0, baseline_ms / REFERENCE_BASELINE_MS)
+
+
+def check_module(module: str, scale: float = 1.0, repeats: int = 3) -> Tuple[float, float, List[str]]:
+    """(waktu import ms, batas ms setelah skala, modul terlarang yang ikut ter-import)"""
+    budget_ms, forbidden = BUDGETS[module]
+    elapsed_ms, modules = measure_import(module, repeats)
+    return elapsed_ms, budget_ms * scale, [name for name in forbidden if _is_loaded(name, modules)]
+
+
+def check_budgets(scale: float = 1.0, repeats: int = 3) -> List[str]:
+    """Jalankan semua budget (di atas skala otomatis mesin ini); return daftar pelanggaran (kosong = lolos)"""
+    machine_scale = baseline_scale(repeats)
+    print(f"Baseline {BASELINE_MODULE}: skala budget {machine_scale:.2f} x {scale:g}")
+    violations = []
+    for module in BUDGETS:
+        elapsed_ms, limit_ms, loaded = check_module(module, machine_scale * scale, repeats)
+        status = 'OK' if elapsed_ms <= limit_ms and not loaded else 'FAIL'
+        print(f"{status:<5} {module:<26} {elapsed_ms:8.1f} ms  (budget {limit_ms:.0f} ms)")
+
+        if elapsed_ms > limit_ms:
+            violations.append(f"{module}: {elapsed_ms:.0f} ms > {limit_ms:.0f} ms")
+            for name, self_us in slowest_imports(module):
+                print(f"{'':<6}{name:<40} {self_us / 1000:8.1f} ms")
+        if loaded:
+            violations.append(f"{module}: memuat {', '.join(loaded)}")
+    return violations
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=float(os.environ.get('IMPORT_BUDGET_SCALE', 1.0)),
+                        help='Pengali tambahan di atas skala otomatis (default: env IMPORT_BUDGET_SCALE atau 1.0)')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    violations = check_budgets(args.scale, args.repeats)
+    if violations:
+        print("\nBudget import dilanggar:")
+        for violation in violations:
+            print(f"  - {violation}")
+        return 1
+    print("\nSemua budget import terpenuhi")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,265 @@
+import hashlib
+import io
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import LRUStore
+
+logger = logging.getLogger(__name__)
+
+# Blok terakhir yang dicek ulang untuk memastikan file hanya di-append
+TAIL_BLOCK_SIZE = 64 * 1024
+
+# Median dihitung dari potongan nilai terurut per append; di atas batas ini
+# potongan digabung jadi satu
+MAX_SORTED_CHUNKS = 8
+
+# State ingest per path file (dipakai bersama oleh semua session Streamlit), hanya
+# beberapa file terakhir karena state menyimpan frame mentah. Lock per path hanya
+# dipegang saat menukar state, parsing CSV di luar lock supaya beberapa file bisa
+# di-parse paralel.
+_ingest_state = LRUStore(max_entries=4)
+_path_locks: Dict[str, threading.Lock] = {}
+_path_locks_guard = threading.Lock()
+
+
+def _path_lock(path: str) -> threading.Lock:
+    with _path_locks_guard:
+        return _path_locks.setdefault(path, threading.Lock())
+
+
+def _checksum(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _read_header(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.readline()
+
+
+def _read_block(path: str, end: int, size: int = TAIL_BLOCK_SIZE) -> bytes:
+    """Baca blok `size` byte yang berakhir di offset `end`"""
+    start = max(0, end - size)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return f.read(end - start)
+
+
+def numeric_stats(df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """Statistik running per kolom numerik: count, sum, sumsq, missing"""
+    stats = {}
+    for col in df.select_dtypes(include=[np.number]).columns:
+        values = df[col].to_numpy(dtype='float64')
+        finite = values[~np.isnan(values)]
+        stats[col] = {
+            'count': int(finite.size),
+            'sum': float(finite.sum()),
+            'sumsq': float(np.square(finite).sum()),
+            'missing': int(values.size - finite.size),
+        }
+    return stats
+
+
+def _merge_stats(base: Dict[str, Dict[str, float]], tail: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    merged = {}
+    for col in base:
+        if col not in tail:
+            # Kolom berubah tipe di tail (mis. jadi object), hitung ulang saat dibutuhkan
+            continue
+        merged[col] = {name: base[col][name] + tail[col][name] for name in base[col]}
+    return merged
+
+
+def _sorted_finite(values: np.ndarray) -> np.ndarray:
+    finite = values[~np.isnan(values)]
+    finite.sort()
+    return finite
+
+
+def _compact(chunks: List[np.ndarray]) -> List[np.ndarray]:
+    if len(chunks) <= MAX_SORTED_CHUNKS:
+        return chunks
+    merged = np.concatenate(chunks)
+    merged.sort()
+    return [merged]
+
+
+def _kth_smallest(chunks: List[np.ndarray], k: int) -> float:
+    """Nilai ke-k (0-based) dari gabungan potongan terurut, tanpa menggabungkan potongan"""
+    for chunk in chunks:
+        lo, hi = 0, len(chunk)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = chunk[mid]
+            below = sum(int(np.searchsorted(other, value, 'left')) for other in chunks)
+            upto = sum(int(np.searchsorted(other, value, 'right')) for other in chunks)
+            if upto <= k:
+                lo = mid + 1
+            elif below > k:
+                hi = mid
+            else:
+                return float(value)
+    raise IndexError(k)
+
+
+def _chunked_median(chunks: List[np.ndarray], count: int) -> float:
+    """Sama dengan np.nanmedian atas semua nilai (rata-rata dua nilai tengah jika genap)"""
+    if count == 0:
+        return float('nan')
+    upper = _kth_smallest(chunks, count // 2)
+    if count % 2:
+        return upper
+    return (_kth_smallest(chunks, count // 2 - 1) + upper) / 2
+
+
+def _full_read(path: str, size: int) -> Dict[str, Any]:
+    df = pd.read_csv(path)
+    block = _read_block(path, size)
+    state = {
+        'offset': size,
+        'rows': len(df),
+        'header_checksum': _checksum(_read_header(path)),
+        'tail_checksum': _checksum(block),
+        'ends_with_newline': block.endswith(b'\n'),
+        'frame': df,
+        'stats': numeric_stats(df),
+        'sorted': {},
+    }
+    logger.info(f"Ingest penuh {path}: {len(df):,} baris, {size:,} byte")
+    return state
+
+
+def _is_append_only(path: str, state: Dict[str, Any], size: int) -> bool:
+    """File masih prefix yang sama: header dan blok terakhir tidak berubah"""
+    if size < state['offset']:
+        return False
+    if _checksum(_read_header(path)) != state['header_checksum']:
+        return False
+    return _checksum(_read_block(path, state['offset'])) == state['tail_checksum']
+
+
+def _append_tail(path: str, state: Dict[str, Any], size: int) -> Optional[Dict[str, Any]]:
+    """Parse hanya byte baru setelah offset terakhir; None jika harus baca ulang penuh"""
+    with open(path, 'rb') as f:
+        f.seek(state['offset'])
+        tail = f.read(size - state['offset'])
+
+    if not state['ends_with_newline']:
+        # Baris terakhir sebelumnya tidak diakhiri newline: append yang sah harus mulai dengan newline
+        if not tail.startswith((b'\n', b'\r\n')):
+            return None
+        tail = tail.lstrip(b'\r\n')
+
+    base = state['frame']
+    if tail.strip():
+        # Kolom teks tetap teks supaya hasil sama dengan membaca file penuh
+        object_cols = {col: object for col in base.columns if base[col].dtype == object}
+        tail_df = pd.read_csv(io.BytesIO(tail), header=None, names=list(base.columns), dtype=object_cols)
+        frame = pd.concat([base, tail_df], ignore_index=True)
+        stats = _merge_stats(state['stats'], numeric_stats(tail_df))
+        # Nilai terurut untuk median: hanya tail yang diurutkan
+        sorted_values = {
+            col: _compact(chunks + [_sorted_finite(tail_df[col].to_numpy(dtype='float64'))])
+            for col, chunks in state['sorted'].items() if col in stats
+        }
+    else:
+        tail_df = base.iloc[0:0]
+        frame = base
+        stats = state['stats']
+        sorted_values = state['sorted']
+
+    block = _read_block(path, size)
+    logger.info(f"Ingest incremental {path}: +{len(tail_df):,} baris ({len(tail):,} byte baru)")
+    return {
+        'offset': size,
+        'rows': len(frame),
+        'header_checksum': state['header_checksum'],
+        'tail_checksum': _checksum(block),
+        'ends_with_newline': block.endswith(b'\n'),
+        'frame': frame,
+        'stats': stats,
+        'sorted': sorted_values,
+    }
+
+
+def read_incremental(path: str) -> pd.DataFrame:
+    """
+    Baca CSV append-only secara incremental.
+
+    Pemanggilan pertama membaca file penuh dan menyimpan offset, jumlah baris, serta
+    checksum header dan blok terakhir. Pemanggilan berikutnya hanya mem-parse byte yang
+    ditambahkan setelah offset itu; jika file ternyata ditulis ulang/terpotong, file
+    dibaca ulang penuh. Frame yang dikembalikan adalah data mentah (belum diimputasi)
+    dan tidak boleh dimodifikasi in place.
+    """
+    path = os.path.abspath(path)
+    size = os.stat(path).st_size
+
+    state = _ingest_state.get(path)
+    if state is not None and size == state['offset'] and _is_append_only(path, state, size):
+        return state['frame']
+
+    new_state = None
+    if state is not None and _is_append_only(path, state, size):
+        new_state = _append_tail(path, state, size)
+    if new_state is None:
+        new_state = _full_read(path, size)
+
+    with _path_lock(path):
+        current = _ingest_state.get(path)
+        # Thread lain sudah membaca file dengan ukuran yang sama lebih dulu: pakai hasilnya
+        if current is not None and current is not state and current['offset'] == size:
+            return current['frame']
+        _ingest_state.set(path, new_state)
+    return new_state['frame']
+
+
+def get_ingest_stats(path: str) -> Dict[str, Dict[str, float]]:
+    """Statistik running (count, sum, sumsq, missing) kolom numerik dari ingest terakhir"""
+    path = os.path.abspath(path)
+    state = _ingest_state.get(path)
+    if state is None:
+        return {}
+    if len(state['stats']) < len(state['frame'].select_dtypes(include=[np.number]).columns):
+        with _path_lock(path):
+            state['stats'] = numeric_stats(state['frame'])
+    return state['stats']
+
+
+def get_ingest_medians(path: str) -> Dict[str, float]:
+    """
+    Median kolom numerik yang punya missing value, dari ingest terakhir. Nilai terurut
+    per kolom disimpan per potongan (satu per append), jadi append hanya mengurutkan
+    baris baru dan median tidak menghitung ulang seluruh kolom.
+    """
+    path = os.path.abspath(path)
+    stats = get_ingest_stats(path)
+    state = _ingest_state.get(path)
+    if state is None:
+        return {}
+
+    medians = {}
+    with _path_lock(path):
+        for col, col_stats in stats.items():
+            if col_stats['missing'] == 0:
+                continue
+            chunks = state['sorted'].get(col)
+            if chunks is None:
+                chunks = [_sorted_finite(state['frame'][col].to_numpy(dtype='float64'))]
+                state['sorted'][col] = chunks
+            medians[col] = _chunked_median(chunks, col_stats['count'])
+    return medians
+
+
+def column_medians(frame: pd.DataFrame, stats: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+    """Median hanya untuk kolom yang punya missing value (yang memang perlu diimputasi)"""
+    medians = {}
+    for col, col_stats in stats.items():
+        if col_stats['missing'] > 0:
+            medians[col] = float(np.nanmedian(frame[col].to_numpy(dtype='float64')))
+    return medians
@@ -0,0 +1,133 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+LOG_FILE = 'tiktok_dashboard.log'
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Rotasi: 'size' (default, LOG_MAX_BYTES x LOG_BACKUP_COUNT) atau 'time' (harian)
+LOG_ROTATION_ENV = 'TIKTOK_LOG_ROTATION'
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# 'json' untuk satu objek JSON per baris, selain itu format teks biasa
+LOG_FORMAT_ENV = 'TIKTOK_LOG_FORMAT'
+
+# Pesan < WARNING dari call site yang sama dibatasi sekian per interval
+RATE_LIMIT_INTERVAL = 60.0
+RATE_LIMIT_BURST = 20
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Batasi log berulang per call site (logger, file, baris): maksimal `burst` record
+    per `interval` detik. Jumlah yang dilewati dilaporkan di record berikutnya yang lolos.
+    WARNING ke atas selalu lolos.
+    """
+
+    def __init__(self, interval: float = RATE_LIMIT_INTERVAL, burst: int = RATE_LIMIT_BURST):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self._windows: Dict[Tuple[str, str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.setdefault(key, [now, 0, 0])  # [mulai, jumlah lolos, jumlah dilewati]
+            if now - window[0] >= self.interval:
+                suppressed = window[2]
+                window[:] = [now, 0, 0]
+                if suppressed:
+                    record.msg = f"{record.getMessage()} ({suppressed} pesan serupa dilewati)"
+                    record.args = None
+            if window[1] >= self.burst:
+                window[2] += 1
+                return False
+            window[1] += 1
+            return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Satu objek JSON per baris (untuk log shipper / query terstruktur)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _file_handler(log_file: str) -> logging.Handler:
+    if os.environ.get(LOG_ROTATION_ENV, 'size') == 'time':
+        return logging.handlers.TimedRotatingFileHandler(
+            log_file, when='midnight', backupCount=LOG_BACKUP_COUNT, encoding='utf-8', delay=True
+        )
+    return logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8', delay=True
+    )
+
+
+def setup_logging(level: int = logging.INFO, log_file: str = LOG_FILE) -> None:
+    """
+    Pasang logging non-blocking sekali per proses: root logger hanya menaruh record
+    ke queue, dan thread listener yang menulis ke file (rotasi) dan stderr. Aman
+    dipanggil di setiap rerun Streamlit.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        if os.environ.get(LOG_FORMAT_ENV) == 'json':
+            formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter(LOG_FORMAT)
+
+        handlers = [_file_handler(log_file), logging.StreamHandler()]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(RateLimitFilter())
+
+        # Seperti basicConfig(force=True): handler root lama (sinkron) dilepas
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush record yang tersisa di queue dan hentikan listener"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
@@ -0,0 +1,289 @@
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Mapping, MutableMapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import payload_cache
+
+logger = logging.getLogger(__name__)
+
+# TIKTOK_MEMORY_TRACE=1: alokasi Python via tracemalloc (akurat, overhead ~20-30%).
+# Tanpa itu: sampling RSS proses (murah, termasuk alokasi native numpy/arrow).
+MEMORY_TRACE_ENV = 'TIKTOK_MEMORY_TRACE'
+SAMPLE_INTERVAL = 0.01
+
+# Estimasi ukuran container besar: hitung sebagian item lalu ekstrapolasi
+MAX_ITEMS_SAMPLED = 1000
+MAX_DEPTH = 6
+# memory_usage(deep=True) membaca setiap string; di atas ini kolom object disampel
+MAX_ROWS_DEEP = 100_000
+
+# Catatan stage per session disimpan di session state-nya sendiri (key ini);
+# dict global hanya untuk pemakaian di luar Streamlit (warm-up, script)
+STAGES_STATE_KEY = 'memory_stages'
+_stage_records: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_records_lock = threading.Lock()
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def tracing_enabled() -> bool:
+    """Nyalakan tracemalloc sekali jika diminta lewat environment"""
+    if os.environ.get(MEMORY_TRACE_ENV) == '1' and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return tracemalloc.is_tracing()
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size proses (byte); None jika tidak tersedia di platform ini"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # ru_maxrss = high-water mark (KB di Linux, byte di macOS)
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == 'darwin' else maxrss * 1024
+    except (ImportError, OSError):
+        return None
+
+
+class _PeakSampler(threading.Thread):
+    """
+    Catat nilai maksimum `read()` selama stage berjalan. Dipakai juga untuk
+    tracemalloc supaya peak global (tracemalloc.reset_peak) tidak direset per stage
+    dan session lain yang sedang berjalan tidak saling menimpa peak.
+    """
+
+    def __init__(self, read: Callable[[], Optional[int]], start_value: int):
+        super().__init__(name='memory-sampler', daemon=True)
+        self.read = read
+        self.peak = start_value
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(SAMPLE_INTERVAL):
+            value = self.read()
+            if value is not None and value > self.peak:
+                self.peak = value
+
+    def stop(self) -> int:
+        self._stop_event.set()
+        self.join()
+        return self.peak
+
+
+def _traced_current() -> int:
+    return tracemalloc.get_traced_memory()[0]
+
+
+def session_stages(state: MutableMapping) -> Dict[str, Dict[str, Any]]:
+    """Catatan stage milik satu session Streamlit (dibuat saat pertama dipakai)"""
+    if STAGES_STATE_KEY not in state:
+        state[STAGES_STATE_KEY] = {}
+    return state[STAGES_STATE_KEY]
+
+
+@contextmanager
+def track_stage(stage: str, records: Optional[MutableMapping] = None):
+    """
+    Ukur memori satu stage pipeline: `retained` = selisih setelah - sebelum,
+    `peak` = puncak di atas titik awal selama stage. Hasil disimpan per nama stage
+    (menimpa run sebelumnya) di `records` (lihat session_stages), atau di catatan
+    global proses jika tidak diberikan. Pengukuran (RSS maupun tracemalloc) berlaku
+    untuk seluruh proses, jadi stage yang berjalan bersamaan saling ikut terhitung.
+    """
+    traced = tracing_enabled()
+    read = _traced_current if traced else current_rss
+    before = read()
+    sampler = None
+    if before is not None:
+        sampler = _PeakSampler(read, before)
+        sampler.start()
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if sampler is not None:
+            peak = sampler.stop()
+            after = read() or before
+            peak = max(peak, after)
+        else:
+            before = after = peak = 0
+
+        record = {
+            'stage': stage,
+            'method': 'tracemalloc' if traced else 'rss',
+            'retained': after - before,
+            'peak': max(peak - before, 0),
+            'elapsed': elapsed,
+            'time': time.strftime('%H:%M:%S'),
+        }
+        if records is None:
+            with _records_lock:
+                _stage_records[stage] = record
+        else:
+            records[stage] = record
+        # Stage session sudah masuk ringkasan log_memory_report di akhir rerun;
+        # di luar Streamlit (warm-up, script) baris ini satu-satunya ringkasan
+        logger.log(logging.INFO if records is None else logging.DEBUG,
+                   f"Memori stage {stage}: {_stage_summary(record)}")
+
+
+def _stage_summary(record: Mapping) -> str:
+    return f"peak +{format_bytes(record['peak'])}, retained {format_bytes(record['retained'])}"
+
+
+def stage_records(records: Optional[Mapping] = None) -> list:
+    if records is not None:
+        return [dict(record) for record in list(records.values())]
+    with _records_lock:
+        return [dict(record) for record in _stage_records.values()]
+
+
+def _frame_size(frame: pd.DataFrame) -> int:
+    if len(frame) <= MAX_ROWS_DEEP:
+        return int(frame.memory_usage(index=True, deep=True).sum())
+    shallow = frame.memory_usage(index=True, deep=False)
+    sample = frame.sample(MAX_ROWS_DEEP, random_state=0).memory_usage(index=False, deep=True)
+    scale = len(frame) / MAX_ROWS_DEEP
+    deep_cols = [col for col in frame.columns if frame[col].dtype == object]
+    total = shallow.drop(deep_cols).sum() + sum(sample[col] * scale for col in deep_cols)
+    return int(total)
+
+
+def estimate_size(obj: Any, _seen: Optional[set] = None, _depth: int = 0) -> int:
+    """
+    Perkiraan ukuran objek (byte) termasuk isinya: nbytes untuk array,
+    memory_usage(deep=True) untuk DataFrame, rekursif untuk container dan atribut
+    objek. Objek yang sama hanya dihitung sekali.
+    """
+    if _seen is None:
+        _seen = set()
+    if obj is None or id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        # View berbagi buffer dengan base-nya
+        return obj.nbytes if obj.base is None or id(obj.base) not in _seen else 0
+    if isinstance(obj, pd.DataFrame):
+        return _frame_size(obj)
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)):
+        return sys.getsizeof(obj)
+
+    size = sys.getsizeof(obj, 0)
+    if _depth >= MAX_DEPTH:
+        return size
+
+    if isinstance(obj, Mapping):
+        items = list(obj.items())
+        children = [part for item in items[:MAX_ITEMS_SAMPLED] for part in item]
+        n_total = len(items)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = obj if isinstance(obj, (list, tuple)) else list(obj)
+        children = items[:MAX_ITEMS_SAMPLED]
+        n_total = len(items)
+    elif hasattr(obj, '__dict__'):
+        return size + estimate_size(vars(obj), _seen, _depth + 1)
+    else:
+        return size
+
+    child_size = sum(estimate_size(child, _seen, _depth + 1) for child in children)
+    sampled = min(n_total, MAX_ITEMS_SAMPLED)
+    if n_total > sampled:
+        child_size = child_size * n_total // sampled
+    return size + child_size
+
+
+def session_state_sizes(state: Mapping) -> Dict[str, int]:
+    """Ukuran tiap entri session state, terbesar dulu"""
+    sizes = {str(key): estimate_size(state[key]) for key in list(state.keys())}
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+
+def payload_sizes() -> Dict[str, Dict[str, int]]:
+    """Ukuran payload komponen di payload_cache, dikelompokkan per tab (elemen pertama key)"""
+    from utils.clustering import cached_results
+
+    groups: Dict[str, Dict[str, int]] = {}
+    seen: set = set()
+    for key, value in payload_cache.items():
+        group = key[0] if isinstance(key, tuple) and key else str(key)
+        entry = groups.setdefault(str(group), {'entries': 0, 'bytes': 0})
+        entry['entries'] += 1
+        entry['bytes'] += estimate_size(value, seen)
+    results = cached_results()
+    if results:
+        groups['hasil clustering'] = {
+            'entries': len(results),
+            'bytes': sum(estimate_size(result, seen) for _, result in results),
+        }
+    return dict(sorted(groups.items(), key=lambda item: item[1]['bytes'], reverse=True))
+
+
+def format_bytes(n_bytes: float) -> str:
+    sign = '-' if n_bytes < 0 else ''
+    value = float(abs(n_bytes))
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if value < 1024 or unit == 'GB':
+            return f"{sign}{value:.0f} {unit}" if unit == 'B' else f"{sign}{value:.1f} {unit}"
+        value /= 1024
+
+
+def memory_report(records: Optional[Mapping] = None, state: Optional[Mapping] = None,
+                  deep: bool = False) -> Dict[str, Any]:
+    """
+    RSS dan catatan stage (murah). deep=True menambah ukuran session state,
+    payload_cache dan hasil clustering yang di-cache; ini menelusuri semua objek
+    (termasuk memory_usage(deep=True) pada DataFrame), jadi hanya atas permintaan.
+    """
+    report = {'rss': current_rss(), 'stages': stage_records(records), 'session_state': {}, 'payloads': {}}
+    if deep:
+        report['session_state'] = session_state_sizes(state) if state is not None else {}
+        report['payloads'] = payload_sizes()
+    return report
+
+
+def log_memory_report(records: Optional[Mapping] = None, state: Optional[Mapping] = None) -> Dict[str, Any]:
+    """
+    Ringkasan memori ke log: satu baris INFO per rerun (RSS + peak/retained per
+    stage); dengan TIKTOK_MEMORY_TRACE=1 laporan lengkap (deep) menggantikannya.
+    Angka stage diukur untuk seluruh proses, termasuk session lain yang berjalan
+    bersamaan.
+    """
+    deep = tracing_enabled()
+    report = memory_report(records, state, deep=deep)
+    if not deep:
+        logger.info(f"Memori proses: RSS {format_bytes(report['rss'] or 0)}; " + ', '.join(
+            f"{r['stage']} {_stage_summary(r)}" for r in report['stages']
+        ))
+        return report
+
+    lines = [f"Memori proses: RSS {format_bytes(report['rss'] or 0)}"]
+    lines += [
+        f"  stage {r['stage']}: peak +{format_bytes(r['peak'])}, retained {format_bytes(r['retained'])}, "
+        f"{r['elapsed']:.2f}s ({r['method']})"
+        for r in report['stages']
+    ]
+    lines += [f"  session_state[{key}]: {format_bytes(size)}" for key, size in report['session_state'].items()]
+    lines += [
+        f"  payload {group}: {format_bytes(entry['bytes'])} ({entry['entries']} entri)"
+        for group, entry in report['payloads'].items()
+    ]
+    logger.info("\n".join(lines))
+    return report
@@ -0,0 +1,67 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# View ke shared memory di proses worker (diisi oleh initializer)
+_worker_arrays: Dict[str, np.ndarray] = {}
+_worker_handles = []
+
+
+def _share_array(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, Tuple[str, tuple, str]]:
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    view[...] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def _attach_arrays(specs: Dict[str, Tuple[str, tuple, str]]) -> None:
+    """Initializer worker: attach ke shared memory sekali per proses (tanpa pickle matrix)"""
+    for name, (shm_name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker_handles.append(shm)
+        _worker_arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _detach_arrays() -> None:
+    _worker_arrays.clear()
+    while _worker_handles:
+        _worker_handles.pop().close()
+
+
+def worker_array(name: str) -> np.ndarray:
+    """Array bersama yang dikirim lewat map_shared (dipanggil di dalam fungsi task)"""
+    return _worker_arrays[name]
+
+
+def map_shared(func: Callable[[Any], Any], tasks: Iterable[Any], arrays: Dict[str, np.ndarray],
+               n_jobs: int = 1) -> List[Any]:
+    """
+    Jalankan `func` untuk setiap task; `arrays` dibagi lewat shared memory dan dibaca
+    task dengan worker_array(name). n_jobs > 1: process pool (spawn), selain itu
+    di proses ini. `func` harus fungsi top-level supaya bisa di-pickle.
+    """
+    tasks = list(tasks)
+    shared = []
+    try:
+        specs = {}
+        for name, array in arrays.items():
+            shm, spec = _share_array(np.ascontiguousarray(array))
+            shared.append(shm)
+            specs[name] = spec
+
+        if n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=n_jobs, mp_context=get_context('spawn'),
+                                     initializer=_attach_arrays, initargs=(specs,)) as executor:
+                return list(executor.map(func, tasks))
+
+        _attach_arrays(specs)
+        try:
+            return [func(task) for task in tasks]
+        finally:
+            _detach_arrays()
+    finally:
+        for shm in shared:
+            shm.close()
+            shm.unlink()
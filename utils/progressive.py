@@ -0,0 +1,143 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.clustering import clustering_result_key, get_cached_result, perform_clustering
+from utils.engines import DEFAULT_ENGINE
+from utils.reduction import DEFAULT_REDUCTION
+
+logger = logging.getLogger(__name__)
+
+# Preview di-fit pada sampel sebesar ini; di bawah PROGRESSIVE_MIN_ROWS fit penuh
+# sudah cukup cepat sehingga preview tidak dipakai
+PREVIEW_SAMPLE_ROWS = 20_000
+PROGRESSIVE_MIN_ROWS = 50_000
+
+# Kolom kategorikal dengan distinct sebanyak ini atau kurang dipakai sebagai strata
+MAX_STRATA = 50
+# Tanpa kolom strata: kuantil fitur pertama
+QUANTILE_STRATA = 10
+
+# Status refinement per result_key final: {'state', 'started', 'elapsed', 'error'}
+_refinements: Dict[str, Dict[str, Any]] = {}
+_refinements_lock = threading.Lock()
+
+
+def _strata(df: pd.DataFrame, features_cols: list) -> pd.Series:
+    for col in df.columns:
+        if col in features_cols or col == 'Cluster':
+            continue
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(dtype):
+            n_unique = df[col].nunique(dropna=False)
+            if 2 <= n_unique <= MAX_STRATA:
+                return df[col].astype('category').cat.codes
+    values = df[features_cols[0]].rank(method='first')
+    return pd.qcut(values, QUANTILE_STRATA, labels=False, duplicates='drop').fillna(-1).astype(int)
+
+
+def stratified_sample(df: pd.DataFrame, features_cols: list, n_rows: int = PREVIEW_SAMPLE_ROWS,
+                      random_state: int = 42) -> np.ndarray:
+    """
+    Index baris sampel (terurut) dengan alokasi proporsional per strata: kolom
+    kategorikal pertama yang cocok, atau kuantil fitur pertama. Segmen kecil tetap
+    terwakili minimal satu baris.
+    """
+    if len(df) <= n_rows:
+        return np.arange(len(df))
+
+    codes = np.asarray(_strata(df, features_cols))
+    rng = np.random.default_rng(random_state)
+    fraction = n_rows / len(df)
+    order = np.argsort(codes, kind='stable')
+    boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+
+    picked = []
+    for group in np.split(order, boundaries):
+        size = max(1, int(round(len(group) * fraction)))
+        picked.append(rng.choice(group, size=min(size, len(group)), replace=False))
+    return np.sort(np.concatenate(picked))
+
+
+def _refine(final_key: str, df: pd.DataFrame, n_clusters: int, features_cols: list,
+            engine: str, init_centers: np.ndarray, reduction: str) -> None:
+    status = _refinements[final_key]
+    try:
+        result = perform_clustering(df, n_clusters, features_cols, engine=engine, init_centers=init_centers,
+                                    reduction=reduction)
+        failed = not result.get('success', True)
+        status['state'] = 'failed' if failed else 'done'
+        status['error'] = result.get('error') if failed else None
+    except Exception as e:
+        logger.error(f"Refinement clustering gagal: {e}", exc_info=True)
+        status['state'] = 'failed'
+        status['error'] = str(e)
+    status['elapsed'] = time.perf_counter() - status['started']
+    logger.info(f"Refinement {final_key}: {status['state']} dalam {status['elapsed']:.1f}s")
+
+
+def start_refinement(df: pd.DataFrame, n_clusters: int, features_cols: list, engine: str,
+                     init_centers: np.ndarray, reduction: str = DEFAULT_REDUCTION) -> str:
+    """
+    Fit penuh di thread background; hasil masuk cache hasil clustering. Dijalankan
+    ulang jika refinement sebelumnya gagal atau hasilnya sudah ter-evict dari cache.
+    """
+    final_key = clustering_result_key(df, features_cols, n_clusters, engine, reduction=reduction)
+    with _refinements_lock:
+        status = _refinements.get(final_key)
+        if status is not None and status['state'] == 'running':
+            return final_key
+        if status is not None and status['state'] == 'done' and get_cached_result(final_key) is not None:
+            return final_key
+        if status is not None:
+            logger.info(f"Refinement {final_key} dijalankan ulang (sebelumnya {status['state']}, hasil tidak di cache)")
+        _refinements[final_key] = {'state': 'running', 'started': time.perf_counter(),
+                                   'elapsed': None, 'error': None}
+    thread = threading.Thread(
+        target=_refine, args=(final_key, df, n_clusters, list(features_cols), engine, init_centers, reduction),
+        name=f"refine-{final_key}", daemon=True
+    )
+    thread.start()
+    return final_key
+
+
+def refinement_status(final_key: str) -> Optional[Dict[str, Any]]:
+    return _refinements.get(final_key)
+
+
+def progressive_clustering(df: pd.DataFrame, n_clusters: int, features_cols: list,
+                           engine: str = DEFAULT_ENGINE,
+                           reduction: str = DEFAULT_REDUCTION) -> Optional[Dict[str, Any]]:
+    """
+    Clustering progresif: untuk dataset besar, kembalikan dulu hasil preview (fit
+    pada sampel terstratifikasi, semua baris di-assign ke centroid preview) dan
+    jalankan fit penuh di background, warm start dari centroid preview. Rerun
+    berikutnya mendapat hasil final dari cache begitu refinement selesai.
+
+    Hasil preview punya result['stage'] == 'preview' dan result['final_key'].
+    """
+    final_key = clustering_result_key(df, features_cols, n_clusters, engine, reduction=reduction)
+    final = get_cached_result(final_key)
+    if final is not None or len(df) < PROGRESSIVE_MIN_ROWS:
+        return perform_clustering(df, n_clusters, features_cols, engine=engine, reduction=reduction)
+
+    status = refinement_status(final_key)
+    if status is not None and status['state'] == 'failed':
+        # Refinement sudah gagal sekali: fit penuh di foreground supaya error terlihat
+        return perform_clustering(df, n_clusters, features_cols, engine=engine, reduction=reduction)
+
+    start = time.perf_counter()
+    sample_idx = stratified_sample(df, features_cols)
+    preview = perform_clustering(df, n_clusters, features_cols, engine=engine, fit_indices=sample_idx,
+                                 reduction=reduction)
+    if not preview.get('success', True):
+        return preview
+    logger.info(f"Preview clustering dari {len(sample_idx):,} baris dalam {time.perf_counter() - start:.2f}s")
+
+    start_refinement(df, n_clusters, features_cols, engine, preview['kmeans'].cluster_centers_, reduction)
+    # Salinan dangkal: hasil preview di _result_cache dipakai bersama antar session
+    return {**preview, 'final_key': final_key}
@@ -0,0 +1,141 @@
+import logging
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+
+from utils.cache import LRUStore
+
+logger = logging.getLogger(__name__)
+
+# PCA / randomized SVD: komponen sesedikit mungkin yang mempertahankan sekian varians
+VARIANCE_TARGET = 0.90
+# Batas atas komponen randomized SVD dan dimensi random projection
+MAX_COMPONENTS = 20
+PROJECTION_COMPONENTS = 8
+# 'auto' = PCA jika features lebih banyak dari ini, selain itu tanpa reduksi
+AUTO_MIN_FEATURES = 10
+
+# Reducer per (dataset, features, metode); hasil reduksi ikut di-cache
+_reduction_cache = LRUStore(max_entries=8)
+
+
+def _reducer(method: str, mean: np.ndarray, components: np.ndarray, retained) -> Dict[str, Any]:
+    """Reducer linear: reduced = (X - mean) @ components (p x d)"""
+    return {
+        'method': method,
+        'n_input': components.shape[0],
+        'n_components': components.shape[1],
+        'retained_variance': retained,
+        'mean': mean,
+        'components': components,
+    }
+
+
+def _n_for_target(explained: np.ndarray, total: float) -> int:
+    cumulative = np.cumsum(explained) / total
+    return int(min(np.searchsorted(cumulative, VARIANCE_TARGET) + 1, len(explained)))
+
+
+def _fit_pca(X: np.ndarray) -> Dict[str, Any]:
+    """PCA exact lewat eigen-decomposition matriks kovarians p x p (satu pass O(n p^2))"""
+    mean = X.mean(axis=0)
+    centered = X - mean
+    cov = centered.T @ centered / len(X)
+    eigenvalues, eigenvectors = np.linalg.eigh(cov)
+    order = np.argsort(eigenvalues)[::-1]
+    eigenvalues = np.clip(eigenvalues[order], 0, None)
+    total = eigenvalues.sum() or 1.0
+    n = _n_for_target(eigenvalues, total)
+    return _reducer('pca', mean, eigenvectors[:, order[:n]], float(eigenvalues[:n].sum() / total))
+
+
+def _fit_randomized_svd(X: np.ndarray) -> Dict[str, Any]:
+    """Randomized SVD (Halko dkk.) hingga MAX_COMPONENTS komponen, dipotong di target varians"""
+    from sklearn.utils.extmath import randomized_svd
+
+    mean = X.mean(axis=0)
+    centered = X - mean
+    n_components = min(MAX_COMPONENTS, X.shape[1] - 1)
+    _, singular_values, vt = randomized_svd(centered, n_components, random_state=42)
+    explained = singular_values ** 2
+    total = float((centered ** 2).sum()) or 1.0
+    n = _n_for_target(explained, total)
+    return _reducer('randomized_svd', mean, vt[:n].T, float(explained[:n].sum() / total))
+
+
+def _fit_random_projection(X: np.ndarray) -> Dict[str, Any]:
+    """Sparse random projection (Achlioptas/Li): jarak antar titik kira-kira terjaga"""
+    from sklearn.random_projection import SparseRandomProjection
+
+    n_components = min(PROJECTION_COMPONENTS, X.shape[1])
+    projection = SparseRandomProjection(n_components=n_components, random_state=42).fit(X[:1])
+    components = np.asarray(projection.components_.todense()).T
+    # Bukan proyeksi ortogonal: varians yang dipertahankan tidak terdefinisi
+    return _reducer('random_projection', np.zeros(X.shape[1]), components, None)
+
+
+# Registry metode reduksi dimensi (antara scaling dan fit); 'none' dan 'auto' tanpa fit
+REDUCTION_METHODS: Dict[str, Dict[str, Any]] = {
+    'auto': {
+        'fit': None,
+        'label': 'Otomatis',
+        'description': f'PCA jika lebih dari {AUTO_MIN_FEATURES} features',
+    },
+    'none': {
+        'fit': None,
+        'label': 'Tanpa reduksi',
+        'description': 'Fit langsung pada features yang sudah di-scale',
+    },
+    'pca': {
+        'fit': _fit_pca,
+        'label': 'PCA',
+        'description': f'Komponen utama hingga {VARIANCE_TARGET:.0%} varians',
+    },
+    'randomized_svd': {
+        'fit': _fit_randomized_svd,
+        'label': 'Randomized SVD',
+        'description': f'Aproksimasi PCA cepat, maks {MAX_COMPONENTS} komponen',
+    },
+    'random_projection': {
+        'fit': _fit_random_projection,
+        'label': 'Random Projection',
+        'description': f'Proyeksi acak sparse ke {PROJECTION_COMPONENTS} dimensi',
+    },
+}
+
+DEFAULT_REDUCTION = 'auto'
+
+
+def resolve_reduction(method: str, n_features: int) -> str:
+    """Metode efektif untuk jumlah features ini ('auto' diselesaikan, reduksi tidak berguna -> 'none')"""
+    if method not in REDUCTION_METHODS:
+        raise ValueError(f"Metode reduksi tidak dikenal: {method}")
+    if method == 'auto':
+        method = 'pca' if n_features > AUTO_MIN_FEATURES else 'none'
+    if n_features < 3:
+        return 'none'
+    return method
+
+
+def apply_reduction(X: np.ndarray, reducer: Dict[str, Any]) -> np.ndarray:
+    return (X - np.asarray(reducer['mean'])) @ np.asarray(reducer['components'])
+
+
+def reduce_features(cache_key: Tuple, scaled_features: np.ndarray,
+                    method: str) -> Tuple[Dict[str, Any], np.ndarray]:
+    """
+    Fit reducer `method` pada matrix yang sudah di-scale lalu proyeksikan; cache per
+    `cache_key` (dataset, features, scaler) supaya ganti K / engine tidak fit ulang.
+    """
+    fit: Callable = REDUCTION_METHODS[method]['fit']
+
+    def compute():
+        reducer = fit(scaled_features)
+        reduced = np.ascontiguousarray(apply_reduction(scaled_features, reducer))
+        reduced.flags.writeable = False
+        retained = reducer['retained_variance']
+        logger.info(f"Reduksi {method}: {reducer['n_input']} -> {reducer['n_components']} dimensi"
+                    + (f", varians dipertahankan {retained:.1%}" if retained is not None else ""))
+        return reducer, reduced
+
+    return _reduction_cache.get_or_compute((*cache_key, method), compute)
@@ -0,0 +1,138 @@
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import get_dataset_key, payload_cache
+from utils.engines import DEFAULT_ENGINE
+from utils.parallel import map_shared, worker_array
+
+logger = logging.getLogger(__name__)
+
+# Partisi lebih kecil dari ini (atau dari K) tidak di-cluster; labelnya -1
+MIN_PARTITION_ROWS = 10
+MAX_PARTITIONS = 100
+SILHOUETTE_SAMPLE = 2000
+# Di bawah ini biaya spawn worker lebih besar dari fit semua partisi
+PARALLEL_MIN_ROWS = 20_000
+
+SEGMENT_CLUSTER_COL = 'Segment_Cluster'
+
+
+def _fit_partition(task: Tuple[int, int, int, str, int]) -> Dict[str, Any]:
+    """Fit satu partisi: baris order[start:stop] dari matrix fitur bersama"""
+    from sklearn.metrics import silhouette_score
+    from utils.engines import fit_engine
+
+    start, stop, n_clusters, engine, seed = task
+    rows = worker_array('order')[start:stop]
+    features = worker_array('features')[rows]
+
+    model, labels = fit_engine(engine, features, n_clusters, random_state=seed)
+    silhouette = None
+    if len(np.unique(labels)) >= 2:
+        rng = np.random.default_rng(seed)
+        sample = rng.choice(len(features), size=min(SILHOUETTE_SAMPLE, len(features)), replace=False)
+        silhouette = float(silhouette_score(features[sample], labels[sample]))
+
+    return {
+        'labels': np.asarray(labels, dtype=np.int32),
+        'inertia': float(getattr(model, 'inertia_', 0.0)),
+        'silhouette': silhouette,
+    }
+
+
+def run_segmented_clustering(df: pd.DataFrame, segment_col: str, n_clusters: int, features_cols: list,
+                             engine: str = DEFAULT_ENGINE, n_jobs: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Satu model clustering per nilai `segment_col`, dijalankan bersamaan di process
+    pool. Preprocessing (imputasi + scaling) memakai statistik global sehingga
+    label antar segmen dibuat di ruang fitur yang sama. Matrix fitur dibagi lewat
+    shared memory; partisi terbesar dijadwalkan dulu, jadi waktu total mendekati
+    waktu partisi terbesar.
+
+    Return: 'labels' (cluster lokal per baris, -1 = partisi dilewati), 'summary'
+    (satu record per partisi) dan 'profiles' (rata-rata fitur per segmen x cluster),
+    sebagai list record supaya bisa ikut snapshot.
+    """
+    from utils.clustering import scale_features
+
+    codes, segments = pd.factorize(df[segment_col], use_na_sentinel=False)
+    if len(segments) > MAX_PARTITIONS:
+        raise ValueError(f"Kolom {segment_col} punya {len(segments)} nilai (maks {MAX_PARTITIONS} partisi)")
+
+    _, scaled = scale_features(df, features_cols)
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes, minlength=len(segments))
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+
+    fitted = [code for code in range(len(segments)) if counts[code] >= max(MIN_PARTITION_ROWS, n_clusters)]
+    fitted.sort(key=lambda code: counts[code], reverse=True)
+    tasks = [(int(bounds[code]), int(bounds[code + 1]), n_clusters, engine, 42) for code in fitted]
+
+    if n_jobs is None:
+        n_jobs = min(len(tasks), os.cpu_count() or 1) if len(df) >= PARALLEL_MIN_ROWS else 1
+
+    start = time.perf_counter()
+    outputs = map_shared(_fit_partition, tasks, {'features': scaled, 'order': order}, max(n_jobs, 1))
+    elapsed = time.perf_counter() - start
+
+    labels = np.full(len(df), -1, dtype=np.int32)
+    summary_rows = []
+    for code, output in zip(fitted, outputs):
+        labels[order[bounds[code]:bounds[code + 1]]] = output['labels']
+        summary_rows.append({
+            'segment': segments[code],
+            'rows': int(counts[code]),
+            'clusters': int(len(np.unique(output['labels']))),
+            'inertia': output['inertia'],
+            'silhouette': output['silhouette'],
+        })
+    for code in set(range(len(segments))) - set(fitted):
+        summary_rows.append({'segment': segments[code], 'rows': int(counts[code]), 'clusters': 0,
+                             'inertia': None, 'silhouette': None})
+    summary = pd.DataFrame(summary_rows).sort_values('rows', ascending=False, ignore_index=True)
+
+    fitted_mask = labels >= 0
+    grouped = df.loc[fitted_mask, features_cols].groupby(
+        [df.loc[fitted_mask, segment_col], labels[fitted_mask]], observed=True, dropna=False
+    )
+    profiles = grouped.mean()
+    profiles.insert(0, 'size', grouped.size())
+    profiles.index = profiles.index.set_names([segment_col, 'Cluster'])
+
+    logger.info(f"Segmentasi per {segment_col}: {len(fitted)} partisi, {n_jobs} worker, {elapsed:.1f}s "
+                f"(terbesar {counts.max():,} baris)")
+    return {
+        'segment_col': segment_col,
+        'labels': labels,
+        'summary': summary.to_dict('records'),
+        'profiles': profiles.reset_index().to_dict('records'),
+        'n_jobs': n_jobs,
+        'elapsed': elapsed,
+    }
+
+
+def get_segmented_clustering(df: pd.DataFrame, segment_col: str, n_clusters: int, features_cols: list,
+                             engine: str = DEFAULT_ENGINE, compute: bool = True) -> Optional[Dict[str, Any]]:
+    """Segmentasi per kolom, di-cache per (dataset, kolom, features, K, engine); compute=False hanya membaca cache"""
+    key = ('segments', get_dataset_key(df), segment_col, tuple(features_cols), n_clusters, engine)
+    cached = payload_cache.get(key)
+    if cached is not None or not compute:
+        return cached
+    segmented = run_segmented_clustering(df, segment_col, n_clusters, features_cols, engine)
+    payload_cache.set(key, segmented)
+    return segmented
+
+
+def segment_frame(df: pd.DataFrame, segmented: Dict[str, Any]) -> pd.DataFrame:
+    """Frame gabungan: Cluster = label lokal per segmen, Segment_Cluster = '<segmen> / <cluster>'"""
+    frame = df.copy()
+    labels = np.asarray(segmented['labels'])
+    frame['Cluster'] = labels
+    segment_values = frame[segmented['segment_col']].astype(str)
+    frame[SEGMENT_CLUSTER_COL] = np.where(labels >= 0, segment_values + ' / ' + frame['Cluster'].astype(str), None)
+    return frame
@@ -0,0 +1,460 @@
+"""
+Service HTTP lokal untuk segmentasi: fit, assign, profil dan hasil cache, memakai
+core clustering yang sama dengan dashboard (tanpa session Streamlit).
+
+Endpoint (JSON):
+    GET  /health
+    GET  /results                 daftar hasil clustering di cache
+    GET  /results/<result_key>    metrics + centroid satu hasil
+    POST /fit      {"features": [...], "k": 4, "engine": "auto", "reduction": "auto"}
+    POST /assign   {"result_key": "...", "rows": [[...], ...] atau [{"Likes": 1, ...}, ...]}
+    POST /profile  {"result_key": "..."}
+
+Request /assign yang datang bersamaan digabung jadi satu batch per model (satu
+perkalian matrix), fit dijalankan di worker pool terbatas.
+
+Pemakaian:
+    python -m utils.service [--host 127.0.0.1] [--port 8765] [--workers 2] [--warmup]
+"""
+import argparse
+import json
+import logging
+import math
+import queue
+import re
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.cache import LRUStore, get_dataset_key, payload_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_FIT_WORKERS = 2
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+# Batching /assign: tunggu sebentar request lain, maksimal sekian baris per batch
+BATCH_WINDOW = 0.005
+MAX_BATCH_ROWS = 50_000
+ASSIGN_TIMEOUT = 30
+
+_RESULT_PATH = re.compile(r'^/results/([0-9a-f]{16})$')
+
+# Model siap pakai untuk assign per result_key (parameter scaler, reduksi, centroid)
+_models = LRUStore(max_entries=64)
+
+# Satu frame dataset per proses, dimuat ulang hanya jika file/katalog berubah;
+# load_dataset lewat st.cache_data menyalin seluruh frame di setiap pemanggilan
+_dataset_lock = threading.Lock()
+_dataset: Dict[str, Any] = {'source': None, 'df': None}
+
+
+class ServiceError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _clean(obj: Any) -> Any:
+    """Struktur JSON ketat: array -> list, numpy scalar -> Python, NaN/inf -> null"""
+    if isinstance(obj, dict):
+        return {str(key): _clean(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_clean(value) for value in obj]
+    if isinstance(obj, np.ndarray):
+        return _clean(obj.tolist())
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+def _load_dataset():
+    from utils.data_loader import dataset_source, load_dataset
+
+    source = dataset_source()
+    with _dataset_lock:
+        if source is None or _dataset['source'] != source:
+            df, _ = load_dataset() if source is not None else (None, 0)
+            if df is None:
+                raise ServiceError(503, "Dataset tidak ditemukan")
+            _dataset.update(source=source, df=df)
+        return _dataset['df']
+
+
+def _dataset_with(features_cols: List[str]):
+    """
+    Frame dataset proses yang sudah berisi fitur turunan `features_cols`. Kolom baru
+    ditambahkan ke salinan dangkal yang lalu menggantikan frame bersama, jadi request
+    lain yang sedang membaca frame lama tidak melihat frame setengah jadi.
+    """
+    from utils.derived_features import DERIVED_FEATURES, add_derived_features
+
+    df = _load_dataset()
+    if all(col in df.columns or col not in DERIVED_FEATURES for col in features_cols):
+        return df
+    with _dataset_lock:
+        df = _dataset['df']
+        if any(col not in df.columns and col in DERIVED_FEATURES for col in features_cols):
+            df = add_derived_features(df.copy(deep=False), features_cols)
+            _dataset['df'] = df
+    return df
+
+
+def _parse_k(value: Any, default_k: int) -> int:
+    from utils.validators import MAX_DASHBOARD_K
+
+    if value is None:
+        return default_k
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ServiceError(400, f"'k' harus bilangan bulat, bukan {value!r}")
+    if not 2 <= value <= MAX_DASHBOARD_K:
+        raise ServiceError(400, f"'k' harus antara 2 dan {MAX_DASHBOARD_K}, bukan {value}")
+    return value
+
+
+def _build_model(df, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Semua yang dibutuhkan untuk assign baris baru tanpa DataFrame"""
+    from utils.clustering import get_column_stats
+
+    features_cols = result['validation_info']['features_used']
+    scaler = result['scaler']
+    if result.get('kmeans') is not None:
+        centers = result['kmeans'].cluster_centers_
+    else:
+        centers = result['cluster_centers']
+    return {
+        'result_key': result['result_key'],
+        'features': list(features_cols),
+        'medians': np.array([get_column_stats(df, col)['median'] for col in features_cols]),
+        'offset': scaler.center_ if hasattr(scaler, 'center_') else scaler.mean_,
+        'scale': scaler.scale_,
+        'reduction': result.get('reduction'),
+        'centers': np.asarray(centers, dtype=np.float64),
+    }
+
+
+def _transform(model: Dict[str, Any], X: np.ndarray) -> np.ndarray:
+    """Imputasi median, scaling dan reduksi yang sama dengan saat fit"""
+    from utils.reduction import apply_reduction
+
+    X = np.where(np.isfinite(X), X, model['medians'])
+    scaled = (X - model['offset']) / model['scale']
+    if model['reduction'] is not None:
+        scaled = apply_reduction(scaled, model['reduction'])
+    return scaled
+
+
+def get_model(result_key: str) -> Dict[str, Any]:
+    model = _models.get(result_key)
+    if model is not None:
+        return model
+
+    from utils.clustering import get_cached_result
+
+    result = get_cached_result(result_key)
+    if result is None:
+        raise ServiceError(404, f"Hasil {result_key} tidak ada di cache; panggil /fit dulu")
+    model = _build_model(_dataset_with(result['validation_info']['features_used']), result)
+    _models.set(result_key, model)
+    return model
+
+
+class AssignBatcher:
+    """
+    Gabungkan request assign yang datang dalam BATCH_WINDOW detik: satu thread
+    mengumpulkan antrean, mengelompokkan per model, lalu satu nearest_centers per
+    model untuk semua baris sekaligus.
+    """
+
+    def __init__(self, window: float = BATCH_WINDOW, max_rows: int = MAX_BATCH_ROWS):
+        self.window = window
+        self.max_rows = max_rows
+        self._queue: "queue.Queue[Optional[Tuple[Dict[str, Any], np.ndarray, Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='assign-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, model: Dict[str, Any], X: np.ndarray) -> Future:
+        future: Future = Future()
+        self._queue.put((model, X, future))
+        return future
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first) -> Tuple[list, bool]:
+        batch, rows = [first], len(first[1])
+        deadline = time.monotonic() + self.window
+        while rows < self.max_rows:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+            rows += len(item[1])
+        return batch, False
+
+    def _run(self) -> None:
+        from utils.engines import nearest_centers
+
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stopping = self._collect(first)
+
+            groups: Dict[str, list] = {}
+            for item in batch:
+                groups.setdefault(item[0]['result_key'], []).append(item)
+            for items in groups.values():
+                model = items[0][0]
+                try:
+                    scaled = _transform(model, np.vstack([X for _, X, _ in items]))
+                    labels, sq_distances = nearest_centers(scaled, model['centers'])
+                except Exception as e:
+                    for _, _, future in items:
+                        future.set_exception(e)
+                    continue
+                offset = 0
+                for _, X, future in items:
+                    end = offset + len(X)
+                    future.set_result((labels[offset:end], np.sqrt(sq_distances[offset:end])))
+                    offset = end
+            if len(batch) > 1:
+                logger.debug(f"Batch assign: {len(batch)} request, {len(groups)} model")
+
+
+class SegmentationService:
+    """State bersama server: worker pool untuk fit dan batcher untuk assign"""
+
+    def __init__(self, fit_workers: int = DEFAULT_FIT_WORKERS):
+        self.fit_pool = ThreadPoolExecutor(max_workers=fit_workers, thread_name_prefix='service-fit')
+        self.batcher = AssignBatcher()
+
+    def close(self) -> None:
+        self.batcher.close()
+        self.fit_pool.shutdown(wait=False)
+
+    def fit(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        from utils.clustering import perform_clustering
+        from utils.engines import CLUSTERING_ENGINES, DEFAULT_ENGINE
+        from utils.reduction import REDUCTION_METHODS, DEFAULT_REDUCTION
+        from utils.validators import default_clustering_config
+
+        df = _load_dataset()
+        default_features, default_k = default_clustering_config(df)
+        features_cols = list(body.get('features') or default_features)
+        n_clusters = _parse_k(body.get('k'), default_k)
+        engine = body.get('engine', DEFAULT_ENGINE)
+        reduction = body.get('reduction', DEFAULT_REDUCTION)
+        if engine not in CLUSTERING_ENGINES:
+            raise ServiceError(400, f"Engine tidak dikenal: {engine}")
+        if reduction not in REDUCTION_METHODS:
+            raise ServiceError(400, f"Metode reduksi tidak dikenal: {reduction}")
+
+        df = _dataset_with(features_cols)
+        result = self.fit_pool.submit(
+            perform_clustering, df, n_clusters, features_cols, engine=engine, reduction=reduction
+        ).result()
+        if not result.get('success', True):
+            raise ServiceError(400, result.get('error', 'Clustering gagal'))
+
+        model = _build_model(df, result)
+        _models.set(result['result_key'], model)
+        return {**_describe(result), 'centers': model['centers']}
+
+    def assign(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        model = get_model(str(body.get('result_key', '')))
+        rows = body.get('rows')
+        if not isinstance(rows, list) or not rows:
+            raise ServiceError(400, "'rows' harus list baris (list nilai atau objek per fitur)")
+        X = _rows_to_matrix(rows, model['features'])
+        labels, distances = self.batcher.submit(model, X).result(timeout=ASSIGN_TIMEOUT)
+        return {'result_key': model['result_key'], 'labels': labels, 'distances': distances}
+
+    def profile(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        from utils.clustering import get_cached_result
+
+        result_key = str(body.get('result_key', ''))
+        result = get_cached_result(result_key)
+        if result is None:
+            raise ServiceError(404, f"Hasil {result_key} tidak ada di cache")
+        features_cols = result['validation_info']['features_used']
+        df = _dataset_with(features_cols)
+
+        def compute():
+            grouped = df[features_cols].groupby(np.asarray(result['clusters']))
+            means = grouped.mean()
+            sizes = grouped.size()
+            return [
+                {'cluster': int(cluster), 'size': int(sizes[cluster]),
+                 'percentage': float(sizes[cluster] / len(df) * 100),
+                 'means': means.loc[cluster].to_dict()}
+                for cluster in means.index
+            ]
+
+        profiles = payload_cache.get_or_compute(('service_profile', result_key, get_dataset_key(df)), compute)
+        return {'result_key': result_key, 'features': features_cols, 'clusters': profiles}
+
+    def results(self) -> Dict[str, Any]:
+        from utils.clustering import cached_results
+
+        return {'results': [_describe(result) for _, result in cached_results()]}
+
+    def result(self, result_key: str) -> Dict[str, Any]:
+        from utils.clustering import get_cached_result
+
+        result = get_cached_result(result_key)
+        if result is None:
+            raise ServiceError(404, f"Hasil {result_key} tidak ada di cache")
+        return {**_describe(result), 'centers': get_model(result_key)['centers']}
+
+
+def _describe(result: Dict[str, Any]) -> Dict[str, Any]:
+    info = result.get('validation_info', {})
+    return {
+        'result_key': result.get('result_key'),
+        'features': info.get('features_used'),
+        'k': info.get('clusters_requested'),
+        'n_samples': info.get('n_samples'),
+        'engine': result.get('engine'),
+        'stage': result.get('stage', 'final'),
+        'metrics': result.get('metrics', {}),
+    }
+
+
+def _rows_to_matrix(rows: List[Any], features_cols: List[str]) -> np.ndarray:
+    """
+    Setiap baris list (urutan features) atau objek {fitur: nilai}, boleh campur dalam
+    satu request; nilai kosong diimputasi median
+    """
+    X = np.empty((len(rows), len(features_cols)), dtype=np.float64)
+    for i, row in enumerate(rows):
+        if isinstance(row, dict):
+            values = [row.get(col) for col in features_cols]
+        elif isinstance(row, (list, tuple)):
+            values = row
+        else:
+            raise ServiceError(400, f"Baris {i} harus list nilai atau objek per fitur")
+        if len(values) != len(features_cols):
+            raise ServiceError(400, f"Baris {i}: harus berisi {len(features_cols)} nilai: {features_cols}")
+        try:
+            X[i] = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            raise ServiceError(400, f"Baris {i} tidak valid: {e}")
+    return X
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    server_version = 'TikTokSegmentation/1.0'
+    service: SegmentationService = None
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(_clean(payload)).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, action) -> None:
+        start = time.perf_counter()
+        try:
+            payload = action()
+            payload['elapsed_ms'] = (time.perf_counter() - start) * 1000
+            self._send(200, payload)
+        except ServiceError as e:
+            self._send(e.status, {'error': str(e)})
+        except Exception as e:
+            logger.error(f"Error service {self.command} {self.path}: {e}", exc_info=True)
+            self._send(500, {'error': str(e)})
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise ServiceError(413, f"Body terlalu besar (maks {MAX_BODY_BYTES:,} byte)")
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError as e:
+            raise ServiceError(400, f"JSON tidak valid: {e}")
+        if not isinstance(body, dict):
+            raise ServiceError(400, "Body harus objek JSON")
+        return body
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        match = _RESULT_PATH.match(path)
+        if path == '/health':
+            self._handle(lambda: {'status': 'ok'})
+        elif path == '/results':
+            self._handle(self.service.results)
+        elif match:
+            self._handle(lambda: self.service.result(match.group(1)))
+        else:
+            self._send(404, {'error': f"Endpoint tidak dikenal: {path}"})
+
+    def do_POST(self):
+        routes = {'/fit': self.service.fit, '/assign': self.service.assign, '/profile': self.service.profile}
+        action = routes.get(self.path.split('?', 1)[0])
+        if action is None:
+            self._send(404, {'error': f"Endpoint tidak dikenal: {self.path}"})
+            return
+        self._handle(lambda: action(self._read_json()))
+
+
+def create_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                  fit_workers: int = DEFAULT_FIT_WORKERS) -> ThreadingHTTPServer:
+    """Server siap serve_forever(); service bersama tersedia di server.service"""
+    service = SegmentationService(fit_workers)
+    handler = type('BoundServiceHandler', (ServiceHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=DEFAULT_FIT_WORKERS, help='Jumlah fit bersamaan')
+    parser.add_argument('--warmup', action='store_true', help='Fit konfigurasi default sebelum menerima request')
+    args = parser.parse_args(argv)
+
+    from utils.logging_setup import setup_logging
+
+    setup_logging()
+    server = create_server(args.host, args.port, args.workers)
+    if args.warmup:
+        server.service.fit({})
+    logger.info(f"Service segmentasi berjalan di http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,251 @@
+import io
+import json
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import LRUStore, get_dataset_key, get_result_key, payload_cache
+from utils.engines import DEFAULT_ENGINE
+from utils.templates import json_safe
+
+logger = logging.getLogger(__name__)
+
+# Direktori snapshot; satu file .npz per result_key (dataset, features, K)
+SNAPSHOT_DIR_ENV = 'TIKTOK_SNAPSHOT_DIR'
+DEFAULT_SNAPSHOT_DIR = '.snapshots'
+SNAPSHOT_VERSION = 1
+QUERY_PARAM = 'snapshot'
+
+_KEY_PATTERN = re.compile(r'^[0-9a-f]{16}$')
+
+# Payload per dataset (key[1] = dataset_key) yang ikut snapshot: metadata dataset
+# apa pun konfigurasinya, dan hasil segmen/window hanya untuk (features, K, engine)
+# yang sama dengan hasil yang di-snapshot. Letak config di key per jenis payload.
+DATASET_PAYLOADS = ('categorical_cardinality', 'date_columns')
+CONFIG_PAYLOADS = {'segments': 3, 'windows': 4}
+
+# Snapshot yang sudah dibaca, key: (path, mtime_ns)
+_loaded_snapshots = LRUStore(max_entries=16)
+
+
+def get_snapshot_dir() -> str:
+    return os.environ.get(SNAPSHOT_DIR_ENV, DEFAULT_SNAPSHOT_DIR)
+
+
+def snapshot_path(result_key: str) -> str:
+    if not _KEY_PATTERN.match(result_key or ''):
+        raise ValueError(f"Key snapshot tidak valid: {result_key!r}")
+    return os.path.join(get_snapshot_dir(), f"{result_key}.npz")
+
+
+def _json_bytes(obj: Any) -> np.ndarray:
+    return np.frombuffer(json.dumps(obj, default=json_safe).encode('utf-8'), dtype=np.uint8)
+
+
+def _from_json_bytes(array: np.ndarray) -> Any:
+    return json.loads(array.tobytes().decode('utf-8'))
+
+
+def _as_tuple(value):
+    """Key cache di-JSON-kan sebagai list bersarang; kembalikan ke tuple"""
+    if isinstance(value, list):
+        return tuple(_as_tuple(item) for item in value)
+    return value
+
+
+def _scaler_arrays(scaler) -> Dict[str, np.ndarray]:
+    if scaler is None:
+        return {}
+    if hasattr(scaler, 'center_'):
+        return {'scaler_center': scaler.center_, 'scaler_scale': scaler.scale_}
+    return {'scaler_mean': scaler.mean_, 'scaler_var': scaler.var_, 'scaler_scale': scaler.scale_}
+
+
+def _reduction_arrays(reducer) -> Dict[str, np.ndarray]:
+    if reducer is None:
+        return {}
+    return {'reduction_mean': np.asarray(reducer['mean']), 'reduction_components': np.asarray(reducer['components'])}
+
+
+def _restore_reduction(arrays, meta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    info = meta.get('reduction')
+    if info is None or 'reduction_components' not in arrays:
+        return None
+    return {**info, 'mean': arrays['reduction_mean'], 'components': arrays['reduction_components']}
+
+
+def _restore_scaler(arrays, features_cols: list):
+    from sklearn.preprocessing import StandardScaler, RobustScaler
+
+    if 'scaler_center' in arrays:
+        scaler = RobustScaler()
+        scaler.center_ = arrays['scaler_center']
+        scaler.scale_ = arrays['scaler_scale']
+    elif 'scaler_mean' in arrays:
+        scaler = StandardScaler()
+        scaler.mean_ = arrays['scaler_mean']
+        scaler.var_ = arrays['scaler_var']
+        scaler.scale_ = arrays['scaler_scale']
+    else:
+        return None
+    scaler.n_features_in_ = len(features_cols)
+    scaler.feature_names_in_ = np.asarray(features_cols, dtype=object)
+    return scaler
+
+
+def _belongs_to_snapshot(key: Any, result_key: str, dataset_key: str, config: tuple) -> bool:
+    if not isinstance(key, tuple) or len(key) < 2:
+        return False
+    if key[1] == result_key:
+        return True
+    if key[1] != dataset_key:
+        return False
+    if key[0] in DATASET_PAYLOADS:
+        return True
+    if key[0] in CONFIG_PAYLOADS:
+        return tuple(key[CONFIG_PAYLOADS[key[0]]:]) == config
+    return False
+
+
+def save_snapshot(result: Dict[str, Any], df: pd.DataFrame, features_cols: list, k_value: int) -> str:
+    """
+    Simpan hasil clustering + semua payload tab yang sudah disiapkan ke satu file
+    .npz (label, centroid, parameter scaler, PCA; payload sebagai JSON). Return key
+    snapshot (= result_key) untuk query parameter `?snapshot=`.
+    """
+    result_key = get_result_key(result)
+    dataset_key = get_dataset_key(df)
+
+    config = (tuple(features_cols), int(k_value), result.get('engine') or DEFAULT_ENGINE)
+    payloads = [
+        [list(key), value] for key, value in payload_cache.items()
+        if _belongs_to_snapshot(key, result_key, dataset_key, config)
+    ]
+    meta = {
+        'version': SNAPSHOT_VERSION,
+        'result_key': result_key,
+        'dataset_key': dataset_key,
+        'features_cols': list(features_cols),
+        'k_value': int(k_value),
+        'engine': result.get('engine'),
+        'reduction': (
+            {name: value for name, value in result['reduction'].items() if name not in ('mean', 'components')}
+            if result.get('reduction') is not None else None
+        ),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'metrics': result.get('metrics', {}),
+        'validation_info': result.get('validation_info', {}),
+        'use_sample': bool(result.get('use_sample', False)),
+    }
+
+    arrays = {
+        'labels': np.asarray(result['clusters'], dtype=np.int32),
+        'meta': _json_bytes(meta),
+        'payloads': _json_bytes(payloads),
+        **_scaler_arrays(result.get('scaler')),
+        **_reduction_arrays(result.get('reduction')),
+    }
+    if result.get('kmeans') is not None:
+        arrays['centers'] = np.asarray(result['kmeans'].cluster_centers_, dtype=np.float64)
+    if result.get('pca_result') is not None:
+        arrays['pca_result'] = np.asarray(result['pca_result'], dtype=np.float32)
+        arrays['pca_explained'] = np.asarray(result['pca_explained'], dtype=np.float64)
+    for name in ('center_distance', 'center_margin'):
+        if result.get(name) is not None:
+            arrays[name] = np.asarray(result[name], dtype=np.float32)
+    if result.get('centers_original') is not None:
+        arrays['centers_original'] = np.asarray(result['centers_original'], dtype=np.float64)
+    if result.get('pca_components') is not None:
+        arrays['pca_components'] = np.asarray(result['pca_components'], dtype=np.float64)
+        arrays['pca_mean'] = np.asarray(result['pca_mean'], dtype=np.float64)
+
+    path = snapshot_path(result_key)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(buffer.getvalue())
+    os.replace(tmp_path, path)
+
+    logger.info(f"Snapshot {result_key} disimpan ({len(payloads)} payload, {os.path.getsize(path):,} byte)")
+    return result_key
+
+
+def load_snapshot(result_key: str) -> Optional[Dict[str, Any]]:
+    """Baca snapshot: {'meta', 'result', 'payloads'}; None jika tidak ada"""
+    try:
+        path = snapshot_path(result_key)
+        mtime_ns = os.stat(path).st_mtime_ns
+    except (ValueError, OSError) as e:
+        logger.warning(f"Snapshot {result_key!r} tidak bisa dibuka: {e}")
+        return None
+
+    def read():
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+
+        meta = _from_json_bytes(arrays['meta'])
+        metrics = dict(meta['metrics'])
+        if 'cluster_sizes' in metrics:
+            metrics['cluster_sizes'] = np.asarray(metrics['cluster_sizes'])
+
+        labels = arrays['labels'].astype(np.int64)
+        labels.setflags(write=False)
+        result = {
+            'clusters': labels,
+            'kmeans': None,
+            'scaler': _restore_scaler(arrays, meta['features_cols']),
+            'scaled_features': None,
+            'cluster_centers': arrays.get('centers'),
+            'pca_result': arrays.get('pca_result'),
+            'pca_explained': arrays.get('pca_explained'),
+            'pca_components': arrays.get('pca_components'),
+            'pca_mean': arrays.get('pca_mean'),
+            'centers_original': arrays.get('centers_original'),
+            'center_distance': arrays.get('center_distance'),
+            'center_margin': arrays.get('center_margin'),
+            'membership': None,
+            'metrics': metrics,
+            'validation_info': meta['validation_info'],
+            'engine': meta.get('engine'),
+            'reduction': _restore_reduction(arrays, meta),
+            'use_sample': meta['use_sample'],
+            'sample_indices': None,
+            'result_key': meta['result_key'],
+            'success': True,
+            'restored_from_snapshot': True,
+        }
+        payloads = [(_as_tuple(key), value) for key, value in _from_json_bytes(arrays['payloads'])]
+        return {'meta': meta, 'result': result, 'payloads': payloads}
+
+    return _loaded_snapshots.get_or_compute((path, mtime_ns), read)
+
+
+def restore_snapshot(result_key: str, dataset_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Muat snapshot dan isi cache hasil clustering + payload tab supaya rerun dengan
+    konfigurasi yang sama tidak menghitung apa pun. Cache hanya diisi jika snapshot
+    dibuat dari versi dataset yang sama; meta (features, K) tetap dikembalikan.
+    """
+    from utils.clustering import seed_result_cache
+
+    snapshot = load_snapshot(result_key)
+    if snapshot is None:
+        return None
+
+    meta = snapshot['meta']
+    if meta['dataset_key'] != dataset_key:
+        logger.info(f"Snapshot {result_key} dibuat dari dataset lain, hanya konfigurasi yang dipakai")
+        return {**meta, 'matched': False}
+
+    seed_result_cache(snapshot['result'])
+    for key, value in snapshot['payloads']:
+        if key not in payload_cache:
+            payload_cache.set(key, value)
+    return {**meta, 'matched': True}
@@ -0,0 +1,128 @@
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import get_result_key, payload_cache
+from utils.parallel import map_shared, worker_array
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BOOTSTRAPS = 20
+SUBSAMPLE_FRACTION = 0.8
+# Refit di data besar cukup pakai subsample sebesar ini
+MAX_SUBSAMPLE_ROWS = 50_000
+MAX_REFIT_ITER = 100
+# Di bawah ini biaya spawn worker (import sklearn) lebih besar dari refit-nya
+PARALLEL_MIN_ROWS = 20_000
+
+# Ambang interpretasi Jaccard (Hennig, 2007)
+STABLE_JACCARD = 0.75
+DISSOLVED_JACCARD = 0.5
+
+
+def _refit(task: Tuple[int, int, np.ndarray]) -> np.ndarray:
+    """Satu refit subsample, warm start dari centroid utama; return contingency K x K"""
+    from sklearn.cluster import KMeans
+
+    seed, sample_size, init_centers = task
+    features = worker_array('features')
+    reference = worker_array('labels')
+    k = init_centers.shape[0]
+
+    rng = np.random.default_rng(seed)
+    idx = np.sort(rng.choice(len(features), size=sample_size, replace=False))
+    sample = features[idx]
+
+    model = KMeans(n_clusters=k, init=init_centers, n_init=1, max_iter=MAX_REFIT_ITER, random_state=seed)
+    boot_labels = model.fit_predict(sample)
+
+    # Baris = cluster referensi, kolom = cluster hasil refit
+    return np.bincount(reference[idx] * k + boot_labels, minlength=k * k).reshape(k, k)
+
+
+def _jaccard(contingency: np.ndarray) -> np.ndarray:
+    """Jaccard terbaik tiap cluster referensi terhadap cluster refit mana pun"""
+    ref_sizes = contingency.sum(axis=1, keepdims=True)
+    boot_sizes = contingency.sum(axis=0, keepdims=True)
+    union = ref_sizes + boot_sizes - contingency
+    with np.errstate(divide='ignore', invalid='ignore'):
+        jaccard = np.where(union > 0, contingency / union, 0.0)
+    return jaccard.max(axis=1)
+
+
+def _aligned_share(contingency: np.ndarray) -> np.ndarray:
+    """Contingency dipasangkan (Hungarian) lalu dinormalisasi per baris -> matriks co-assignment"""
+    from scipy.optimize import linear_sum_assignment
+
+    _, assignment = linear_sum_assignment(-contingency)
+    aligned = contingency[:, assignment]
+    row_sums = aligned.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(row_sums > 0, aligned / row_sums, 0.0)
+
+
+def run_stability(scaled_features: np.ndarray, labels: np.ndarray, centers: np.ndarray,
+                  n_bootstraps: int = DEFAULT_BOOTSTRAPS, fraction: float = SUBSAMPLE_FRACTION,
+                  n_jobs: Optional[int] = None, random_state: int = 42) -> Dict[str, Any]:
+    """
+    Stabilitas cluster dari `n_bootstraps` refit KMeans pada subsample (tanpa
+    pengembalian) di process pool. Matrix fitur dan label dibagi lewat shared
+    memory; worker hanya mengembalikan contingency K x K.
+
+    Return per cluster: rata-rata Jaccard terbaik (stabil >= 0.75, larut < 0.5), dan
+    matriks co-assignment K x K: rata-rata proporsi anggota cluster referensi (baris)
+    yang jatuh ke cluster padanannya (kolom) setelah refit.
+    """
+    features = np.ascontiguousarray(scaled_features, dtype=np.float64)
+    reference = np.ascontiguousarray(labels, dtype=np.int64)
+    centers = np.asarray(centers, dtype=np.float64)
+    k = centers.shape[0]
+    sample_size = min(int(len(features) * fraction), MAX_SUBSAMPLE_ROWS)
+    if sample_size < k:
+        raise ValueError(f"Subsample ({sample_size}) lebih kecil dari K ({k})")
+
+    seeds = np.random.SeedSequence(random_state).generate_state(n_bootstraps)
+    tasks = [(int(seed), sample_size, centers) for seed in seeds]
+    if n_jobs is None:
+        n_jobs = min(n_bootstraps, os.cpu_count() or 1) if sample_size >= PARALLEL_MIN_ROWS else 1
+
+    start = time.perf_counter()
+    contingencies = map_shared(_refit, tasks, {'features': features, 'labels': reference}, n_jobs)
+
+    jaccard = np.array([_jaccard(c) for c in contingencies])
+    co_assignment = np.mean([_aligned_share(c) for c in contingencies], axis=0)
+    elapsed = time.perf_counter() - start
+    logger.info(f"Stabilitas: {n_bootstraps} refit x {sample_size:,} baris, {n_jobs} worker, {elapsed:.1f}s")
+
+    return {
+        'jaccard_mean': jaccard.mean(axis=0),
+        'jaccard_std': jaccard.std(axis=0),
+        'co_assignment': co_assignment,
+        'n_bootstraps': n_bootstraps,
+        'sample_size': sample_size,
+        'n_jobs': n_jobs,
+        'elapsed': elapsed,
+    }
+
+
+def get_stability(df: pd.DataFrame, result: Dict[str, Any], features_cols: list,
+                  n_bootstraps: int = DEFAULT_BOOTSTRAPS, compute: bool = True) -> Optional[Dict[str, Any]]:
+    """Stabilitas untuk hasil clustering, di-cache per result_key; compute=False hanya membaca cache"""
+    key = ('stability', get_result_key(result), n_bootstraps, SUBSAMPLE_FRACTION)
+    cached = payload_cache.get(key)
+    if cached is not None or not compute:
+        return cached
+
+    from utils.clustering import result_centers, result_matrix
+
+    # Ruang yang sama dengan centroid (termasuk reduksi dimensi jika dipakai)
+    scaled = result_matrix(df, result, features_cols)
+    centers = result_centers(result, scaled)
+
+    stability = run_stability(scaled, result['clusters'], centers, n_bootstraps)
+    payload_cache.set(key, stability)
+    return stability
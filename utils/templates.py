@@ -0,0 +1,96 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'html_templates')
+
+# Satu-satunya bagian dinamis di template: blob JSON payload
+DATA_SLOT = '__DASHBOARD_DATA__'
+
+_templates: Dict[str, Dict[str, Any]] = {}
+
+
+def json_safe(obj):
+    if isinstance(obj, (np.integer,)):
+        return int(obj)
+    elif isinstance(obj, (np.floating,)):
+        return float(obj)
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, (np.bool_,)):
+        return bool(obj)
+    elif isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    return obj
+
+
+def _compile_template(name: str) -> Dict[str, Any]:
+    """Baca template sekali dan pecah di slot data"""
+    path = os.path.join(TEMPLATE_DIR, f"{name}.html")
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+
+    if source.count(DATA_SLOT) != 1:
+        raise ValueError(f"Template {name} harus punya tepat satu slot {DATA_SLOT}")
+
+    head, tail = source.split(DATA_SLOT)
+    return {
+        'name': name,
+        'head': head,
+        'tail': tail,
+        'hash': hashlib.sha256(source.encode('utf-8')).hexdigest()[:12],
+    }
+
+
+def load_templates() -> Dict[str, Dict[str, Any]]:
+    """Pre-compile semua template yang punya slot data (dipanggil saat import)"""
+    for filename in sorted(os.listdir(TEMPLATE_DIR)):
+        name, ext = os.path.splitext(filename)
+        if ext != '.html':
+            continue
+        path = os.path.join(TEMPLATE_DIR, filename)
+        with open(path, encoding='utf-8') as f:
+            if DATA_SLOT not in f.read():
+                continue
+        _templates[name] = _compile_template(name)
+        logger.info(f"Template {name} dimuat (hash {_templates[name]['hash']})")
+    return _templates
+
+
+def get_template(name: str) -> Dict[str, Any]:
+    if name not in _templates:
+        _templates[name] = _compile_template(name)
+    return _templates[name]
+
+
+def serialize_payload(data: Any) -> str:
+    """JSON ringkas yang aman disisipkan di dalam <script>"""
+    payload = json.dumps(data, default=json_safe, separators=(',', ':'))
+    return payload.replace('</', '<\\/')
+
+
+def render_template(name: str, data: Any) -> str:
+    """
+    Gabungkan template yang sudah di-compile dengan payload data. Tidak di-cache:
+    satu konkatenasi lebih murah dari hashing payload, dan cache akan menyimpan
+    salinan dokumen HTML yang besar.
+    """
+    template = get_template(name)
+    return template['head'] + serialize_payload(data) + template['tail']
+
+
+def render_component(name: str, data: Any, height: int, scrolling: bool = True):
+    """Render template sebagai komponen HTML Streamlit"""
+    import streamlit.components.v1 as components
+
+    components.html(render_template(name, data), height=height, scrolling=scrolling)
+
+
+load_templates()
@@ -1,7 +1,26 @@
 import pandas as pd
 import numpy as np
+import logging
 from typing import Tuple, List, Dict
 
+from utils.cache import LRUStore, get_dataset_key
+
+logger = logging.getLogger(__name__)
+
+# Fitur dengan |korelasi| di atas ambang ini dianggap duplikat
+REDUNDANCY_THRESHOLD = 0.95
+
+# Penanganan grup fitur redundan sebelum scaling. Default 'keep': fitur hanya dibuang
+# jika user memilihnya di sidebar (CLI, service dan warm-up memakai default ini)
+REDUNDANCY_MODES = {
+    'keep': 'Biarkan',
+    'drop': 'Buang duplikat (simpan satu per grup)',
+}
+DEFAULT_REDUNDANCY_MODE = 'keep'
+
+# Grup redundan per (dataset, features, ambang)
+_redundancy_cache = LRUStore(max_entries=64)
+
 def validate_data_for_clustering(df: pd.DataFrame, features_cols: list) -> Tuple[bool, str, List[str]]:
     
     warnings = []
@@ -76,25 +95,13 @@ def validate_data_for_clustering(df: pd.DataFrame, features_cols: list) -> Tuple
     if extreme_outlier_cols:
         warnings.append(f"Extreme outliers detected in: {', '.join(extreme_outlier_cols[:3])}")
     
-    # 8. Cek korelasi sangat tinggi antar features
+    # 8. Cek korelasi sangat tinggi antar features (grup redundan)
     if len(existing_features) > 1:
-        # Gunakan hanya data numerik
-        numeric_df = df[existing_features].select_dtypes(include=[np.number])
-        if len(numeric_df.columns) > 1:
-            corr_matrix = numeric_df.corr().abs()
-            np.fill_diagonal(corr_matrix.values, 0)
-            
-            high_corr_pairs = []
-            features = corr_matrix.columns.tolist()
-            
-            for i in range(len(features)):
-                for j in range(i+1, len(features)):
-                    corr_value = corr_matrix.iloc[i, j]
-                    if corr_value > 0.95:
-                        high_corr_pairs.append(f"{features[i]}-{features[j]}: {corr_value:.2f}")
-            
-            if high_corr_pairs:
-                warnings.append(f"High correlation (>0.95): {', '.join(high_corr_pairs[:3])}")
+        redundant_groups = find_redundant_groups(df, existing_features)
+        if redundant_groups:
+            described = [f"{', '.join(group['features'])} (min |r| {group['min_corr']:.2f})"
+                         for group in redundant_groups[:3]]
+            warnings.append(f"High correlation (>{REDUNDANCY_THRESHOLD}): {'; '.join(described)}")
     
     message = "✅ Data valid untuk clustering"
     if warnings:
@@ -102,6 +109,77 @@ def validate_data_for_clustering(df: pd.DataFrame, features_cols: list) -> Tuple
     
     return True, message, warnings
 
+def find_redundant_groups(df: pd.DataFrame, features_cols: list,
+                          threshold: float = REDUNDANCY_THRESHOLD) -> List[Dict]:
+    """
+    Grup fitur yang saling berkorelasi |r| > threshold: pasangan dari upper triangle
+    matriks korelasi, lalu connected components (A~B dan B~C -> satu grup A, B, C).
+    Urutan fitur dalam grup mengikuti urutan pilihan user; 'keep' = fitur pertama.
+    """
+    numeric = [col for col in features_cols
+               if col in df.columns and pd.api.types.is_numeric_dtype(df[col])]
+    if len(numeric) < 2:
+        return []
+
+    def compute():
+        corr = np.nan_to_num(df[numeric].corr().to_numpy())
+        strong = np.triu(np.abs(corr) > threshold, k=1)
+        if not strong.any():
+            return []
+
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        _, labels = connected_components(csr_matrix(strong), directed=False)
+        groups = []
+        for component in np.flatnonzero(np.bincount(labels) > 1):
+            idx = np.flatnonzero(labels == component)
+            sub = np.abs(corr[np.ix_(idx, idx)])
+            groups.append({
+                'features': [numeric[i] for i in idx],
+                'keep': numeric[idx[0]],
+                'min_corr': float(sub[np.triu_indices(len(idx), k=1)].min()),
+            })
+        return groups
+
+    key = (get_dataset_key(df), tuple(numeric), threshold)
+    return _redundancy_cache.get_or_compute(key, compute)
+
+
+def prune_redundant_features(df: pd.DataFrame, features_cols: list,
+                             mode: str = DEFAULT_REDUNDANCY_MODE,
+                             threshold: float = REDUNDANCY_THRESHOLD) -> Tuple[List[str], List[Dict]]:
+    """
+    Tahap reduksi fitur sebelum scaling. mode 'drop': simpan satu fitur per grup
+    redundan; 'keep': tidak diubah. df tidak dimodifikasi. Return (features hasil,
+    grup redundan yang ditemukan).
+    """
+    if mode not in REDUNDANCY_MODES:
+        raise ValueError(f"Mode redundansi tidak dikenal: {mode}")
+
+    groups = find_redundant_groups(df, features_cols, threshold)
+    if mode == 'keep' or not groups:
+        return list(features_cols), groups
+
+    replacement = {}
+    for group in groups:
+        for feature in group['features']:
+            replacement[feature] = group['keep']
+
+    pruned = []
+    for feature in features_cols:
+        kept = replacement.get(feature, feature)
+        if kept not in pruned:
+            pruned.append(kept)
+
+    if len(pruned) < 2:
+        logger.info(f"Reduksi fitur menyisakan {len(pruned)} fitur, features dipakai apa adanya")
+        return list(features_cols), groups
+
+    logger.info(f"Reduksi fitur ({mode}): {len(features_cols)} -> {len(pruned)} fitur")
+    return pruned, groups
+
+
 def suggest_optimal_clusters(df: pd.DataFrame, features_cols: list, max_k: int = 10) -> Dict:
     """
     Berikan saran jumlah cluster optimal
@@ -137,6 +215,22 @@ def suggest_optimal_clusters(df: pd.DataFrame, features_cols: list, max_k: int =
     
     return suggestions
 
+# Features & batas K default yang dipilih dashboard saat pertama dibuka
+DEFAULT_FEATURES = ['Likes', 'Shares', 'Comments', 'Views', 'TimeSpentOnContent', 'Engagement_Rate']
+MAX_DASHBOARD_K = 5
+
+def default_clustering_config(df: pd.DataFrame) -> Tuple[List[str], int]:
+    """
+    Konfigurasi default dashboard: 4 default features pertama yang ada dan numerik
+    (setelah reduksi fitur redundan default), dengan K = rekomendasi suggest_optimal_clusters (maks MAX_DASHBOARD_K)
+    """
+    available = [col for col in DEFAULT_FEATURES
+                 if col in df.columns and pd.api.types.is_numeric_dtype(df[col])]
+    # Reduksi fitur sama seperti default di app supaya result_key warm-up cocok
+    features_cols, _ = prune_redundant_features(df, available[:4])
+    suggestions = suggest_optimal_clusters(df, features_cols)
+    return features_cols, min(suggestions.get('recommended', 4), MAX_DASHBOARD_K)
+
 def get_user_friendly_error(error_type: str, details: str = "") -> str:
     """
     Convert technical errors to user-friendly messages
@@ -0,0 +1,152 @@
+"""
+Warm-up cache dashboard: load data, clustering konfigurasi default, dan payload tab.
+
+Dashboard memulai warm-up sendiri di session pertama (`streamlit run app.py`);
+`serve` memulainya sebelum server menerima koneksi.
+
+Pemakaian:
+    python -m utils.warmup              # jalankan warm-up sekali dan tampilkan durasinya
+    python -m utils.warmup serve [--server.port 8501 ...]
+        # warm-up di background lalu jalankan server Streamlit; opsi config
+        # `--section.option value` diteruskan ke Streamlit
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+# Batas tunggu session pertama jika warm-up masih berjalan
+WARMUP_WAIT_TIMEOUT = 120
+
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_lock = threading.Lock()
+_warmup_timings: Dict[str, float] = {}
+
+
+def run_warmup() -> Dict[str, float]:
+    """Isi cache data, hasil clustering default dan payload tab; return durasi per tahap"""
+    # Import di sini supaya `python -m utils.warmup serve` tidak memuat semuanya dua kali
+    from utils.data_loader import load_dataset
+    from utils.clustering import perform_clustering
+    from utils.validators import default_clustering_config
+    from tabs import overview_tab, categorical_tab, analysis_tab
+
+    timings = {}
+    start = time.perf_counter()
+    df, _ = load_dataset()
+    timings['load_data'] = time.perf_counter() - start
+    if df is None:
+        logger.warning("Warm-up dilewati: dataset tidak ditemukan")
+        return timings
+
+    start = time.perf_counter()
+    features_cols, k_value = default_clustering_config(df)
+    if len(features_cols) < 2:
+        logger.warning("Warm-up dilewati: default features tidak tersedia")
+        return timings
+    result = perform_clustering(df, k_value, features_cols)
+    timings['clustering'] = time.perf_counter() - start
+    if not result.get('success', True):
+        logger.warning(f"Warm-up clustering gagal: {result.get('error')}")
+        return timings
+
+    start = time.perf_counter()
+    df_clustered = df.copy()
+    df_clustered['Cluster'] = result['clusters']
+    overview_tab.get_payload(df_clustered, result, features_cols)
+    categorical_tab.warm_cache(df_clustered, result)
+    analysis_tab.get_payload(df_clustered, result, features_cols)
+    timings['payloads'] = time.perf_counter() - start
+
+    logger.info("Warm-up selesai: " + ', '.join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()))
+    return timings
+
+
+def _wait_for_runtime(timeout: float = 30) -> None:
+    """Tunggu runtime Streamlit siap supaya st.cache_data memakai storage milik server"""
+    from streamlit import runtime
+
+    deadline = time.monotonic() + timeout
+    while not runtime.exists() and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+
+def _run_safely(wait_for_runtime: bool):
+    try:
+        if wait_for_runtime:
+            _wait_for_runtime()
+        _warmup_timings.update(run_warmup())
+    except Exception as e:
+        logger.error(f"Warm-up gagal: {str(e)}", exc_info=True)
+
+
+def start_warmup(wait_for_runtime: bool = False) -> threading.Thread:
+    """Mulai warm-up di background thread (sekali per proses; panggilan berikutnya no-op)"""
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_run_safely, args=(wait_for_runtime,),
+                                              name='dashboard-warmup', daemon=True)
+            _warmup_thread.start()
+        return _warmup_thread
+
+
+def wait_for_warmup(timeout: float = WARMUP_WAIT_TIMEOUT) -> None:
+    """Tunggu warm-up yang sedang berjalan supaya session pertama tidak menghitung ulang"""
+    thread = _warmup_thread
+    if thread is not None and thread.is_alive():
+        thread.join(timeout)
+
+
+def _parse_flag_options(args):
+    """`--server.port 8501` / `--server.port=8501` -> {'server_port': '8501'}, sisanya argumen script"""
+    flag_options, script_args = {}, []
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg.startswith('--') and '.' in arg:
+            name, _, value = arg[2:].partition('=')
+            if not value and args:
+                value = args.pop(0)
+            flag_options[name.replace('.', '_')] = value
+        else:
+            script_args.append(arg)
+    return flag_options, script_args
+
+
+def serve(streamlit_args) -> None:
+    """Jalankan server Streamlit di proses ini dengan warm-up di background"""
+    from streamlit.web import bootstrap
+
+    flag_options, script_args = _parse_flag_options(streamlit_args)
+    start_warmup(wait_for_runtime=True)
+    bootstrap.load_config_options(flag_options=flag_options)
+    bootstrap.run(APP_SCRIPT, False, script_args, flag_options)
+
+
+def main(argv=None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    from utils.logging_setup import setup_logging
+
+    setup_logging()
+
+    if argv and argv[0] == 'serve':
+        serve(argv[1:])
+        return 0
+
+    timings = run_warmup()
+    for name, seconds in timings.items():
+        print(f"{name:<12} {seconds:8.2f}s")
+    return 0 if 'payloads' in timings else 1
+
+
+if __name__ == '__main__':
+    # Pakai instance modul `utils.warmup` (bukan __main__) supaya app.py melihat thread yang sama
+    from utils.warmup import main as _main
+    sys.exit(_main())
@@ -0,0 +1,189 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import get_dataset_key, payload_cache
+from utils.engines import DEFAULT_ENGINE
+
+logger = logging.getLogger(__name__)
+
+# Window lebih kecil dari ini (atau dari K) tidak di-fit; barisnya diberi label
+# centroid window sebelumnya yang terdekat
+MIN_WINDOW_ROWS = 30
+MAX_WINDOWS = 200
+# Kolom object dianggap tanggal jika sebagian besar sampelnya bisa di-parse
+DATE_SAMPLE_ROWS = 200
+DATE_PARSE_RATIO = 0.9
+
+WINDOW_FREQS: Dict[str, str] = {
+    'W': 'Mingguan',
+    'M': 'Bulanan',
+    'Q': 'Kuartalan',
+}
+DEFAULT_WINDOW_FREQ = 'M'
+
+WINDOW_COL = 'Window'
+
+
+def _looks_like_dates(values: pd.Series) -> bool:
+    sample = values.dropna()
+    sample = sample.sample(min(DATE_SAMPLE_ROWS, len(sample)), random_state=0) if len(sample) else sample
+    if sample.empty or pd.to_numeric(sample, errors='coerce').notna().mean() > 0.5:
+        return False
+    parsed = pd.to_datetime(sample, errors='coerce', format='mixed')
+    return parsed.notna().mean() >= DATE_PARSE_RATIO
+
+
+def detect_date_columns(df: pd.DataFrame) -> List[str]:
+    """Kolom datetime, atau kolom teks yang isinya tanggal (mis. PostDate dari CSV); di-cache per dataset"""
+    def detect():
+        date_cols = df.select_dtypes(include=['datetime', 'datetimetz']).columns.tolist()
+        for col in df.select_dtypes(include=['object']).columns:
+            if _looks_like_dates(df[col]):
+                date_cols.append(col)
+        return date_cols
+
+    return payload_cache.get_or_compute(('date_columns', get_dataset_key(df)), detect)
+
+
+def _align(previous: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """
+    Permutasi `order` (Hungarian, total kuadrat jarak minimum) sehingga cluster baru
+    order[j] meneruskan ID j dari window sebelumnya
+    """
+    from scipy.optimize import linear_sum_assignment
+
+    cost = ((previous[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+    _, order = linear_sum_assignment(cost)
+    return order
+
+
+def run_windowed_clustering(df: pd.DataFrame, date_col: str, n_clusters: int, features_cols: list,
+                            engine: str = DEFAULT_ENGINE, freq: str = DEFAULT_WINDOW_FREQ) -> Dict[str, Any]:
+    """
+    Clustering per window waktu (`freq`: W/M/Q) atas kolom tanggal. Window pertama
+    di-fit penuh; window berikutnya warm start dari centroid window sebelumnya
+    (n_init=1, biasanya konvergen dalam beberapa iterasi) lalu ID cluster
+    disejajarkan dengan Hungarian matching, jadi Cluster 0 di Januari = Cluster 0
+    di Februari. Scaling memakai statistik global supaya centroid antar window
+    bisa dibandingkan.
+
+    Per window dilaporkan drift centroid (jarak Euclidean di ruang ter-scale ke
+    centroid window sebelumnya) dan migrasi: baris window ini yang labelnya
+    berbeda antara centroid lama dan centroid baru (dari -> ke).
+
+    Return: 'labels' (ID cluster selaras per baris, -1 = tanggal kosong) plus
+    'windows', 'centers', 'migrations' sebagai list record supaya bisa ikut snapshot.
+    """
+    from utils.clustering import scale_features
+    from utils.engines import fit_engine, nearest_centers
+
+    if freq not in WINDOW_FREQS:
+        raise ValueError(f"Frekuensi window tidak dikenal: {freq}")
+
+    dates = pd.to_datetime(df[date_col], errors='coerce', format='mixed')
+    if getattr(dates.dt, 'tz', None) is not None:
+        dates = dates.dt.tz_localize(None)
+    periods = dates.dt.to_period(freq)
+    codes, windows = pd.factorize(periods, sort=True)
+    if len(windows) > MAX_WINDOWS:
+        raise ValueError(f"{len(windows)} window {WINDOW_FREQS[freq].lower()} (maks {MAX_WINDOWS}); "
+                         f"pilih frekuensi yang lebih kasar")
+    if len(windows) == 0:
+        raise ValueError(f"Kolom {date_col} tidak berisi tanggal yang valid")
+
+    scaler, scaled = scale_features(df, features_cols)
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes[codes >= 0], minlength=len(windows))
+    bounds = np.concatenate([[np.sum(codes < 0)], np.sum(codes < 0) + np.cumsum(counts)])
+
+    start = time.perf_counter()
+    labels = np.full(len(df), -1, dtype=np.int32)
+    centers = None
+    window_rows, center_rows, migration_rows = [], [], []
+    for code, window in enumerate(windows):
+        rows = order[bounds[code]:bounds[code + 1]]
+        X = scaled[rows]
+        previous = centers
+        fitted = len(rows) >= max(MIN_WINDOW_ROWS, n_clusters)
+
+        if fitted:
+            model, window_labels = fit_engine(engine, X, n_clusters, random_state=42, init=previous)
+            centers = model.cluster_centers_
+            inertia = float(model.inertia_)
+            if previous is not None:
+                permutation = _align(previous, centers)
+                centers = centers[permutation]
+                window_labels = np.argsort(permutation)[window_labels]
+            window_labels = np.asarray(window_labels, dtype=np.int32)
+        elif previous is not None:
+            window_labels, sq_distances = nearest_centers(X, previous)
+            inertia = float(sq_distances.sum())
+        else:
+            # Belum ada centroid sama sekali: window awal yang kecil dilewati
+            window_rows.append({'window': str(window), 'rows': int(len(rows)), 'fitted': False,
+                                'iterations': None, 'inertia': None, 'mean_drift': None, 'moved': None})
+            continue
+        labels[rows] = window_labels
+
+        drift = np.linalg.norm(centers - previous, axis=1) if previous is not None else np.zeros(n_clusters)
+        moved = None
+        if previous is not None and fitted:
+            before, _ = nearest_centers(X, previous)
+            transitions = pd.crosstab(before, window_labels)
+            moved = int(len(rows) - np.trace(transitions.reindex(index=range(n_clusters), columns=range(n_clusters),
+                                                                  fill_value=0).values))
+            for (src, dst), count in transitions.stack().items():
+                if src != dst and count > 0:
+                    migration_rows.append({'window': str(window), 'from': int(src), 'to': int(dst),
+                                           'count': int(count)})
+
+        window_rows.append({
+            'window': str(window),
+            'rows': int(len(rows)),
+            'fitted': fitted,
+            'iterations': int(getattr(model, 'n_iter_', 0)) if fitted else None,
+            'inertia': inertia,
+            'mean_drift': float(drift.mean()) if previous is not None else None,
+            'moved': moved,
+        })
+
+        sizes = np.bincount(window_labels, minlength=n_clusters)
+        original = scaler.inverse_transform(centers)
+        for cluster in range(n_clusters):
+            center_rows.append({
+                'window': str(window), 'Cluster': cluster, 'size': int(sizes[cluster]),
+                'share': float(sizes[cluster] / len(rows)),
+                'drift': float(drift[cluster]) if previous is not None else None,
+                **{col: float(value) for col, value in zip(features_cols, original[cluster])},
+            })
+    elapsed = time.perf_counter() - start
+
+    fitted_windows = sum(1 for row in window_rows if row['fitted'])
+    logger.info(f"Segmentasi window {WINDOW_FREQS[freq].lower()} per {date_col}: {fitted_windows}/{len(windows)} "
+                f"window di-fit dalam {elapsed:.1f}s")
+    return {
+        'date_col': date_col,
+        'freq': freq,
+        'labels': labels,
+        'windows': window_rows,
+        'centers': center_rows,
+        'migrations': migration_rows,
+        'elapsed': elapsed,
+    }
+
+
+def get_windowed_clustering(df: pd.DataFrame, date_col: str, n_clusters: int, features_cols: list,
+                            engine: str = DEFAULT_ENGINE, freq: str = DEFAULT_WINDOW_FREQ,
+                            compute: bool = True) -> Optional[Dict[str, Any]]:
+    """Segmentasi per window, di-cache per (dataset, kolom, frekuensi, features, K, engine); compute=False hanya membaca cache"""
+    key = ('windows', get_dataset_key(df), date_col, freq, tuple(features_cols), n_clusters, engine)
+    cached = payload_cache.get(key)
+    if cached is not None or not compute:
+        return cached
+    windowed = run_windowed_clustering(df, date_col, n_clusters, features_cols, engine, freq)
+    payload_cache.set(key, windowed)
+    return windowed